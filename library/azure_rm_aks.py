@@ -89,6 +89,13 @@ options:
                 description:
                     - The secret password associated with the service principal.
                 required: true
+    return_kube_config:
+        description:
+            - Return the kubeconfig of the cluster user in C(kube_config).
+            - The kubeconfig takes an additional request, so it is only retrieved when set.
+        type: bool
+        default: no
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -119,6 +126,7 @@ EXAMPLES = '''
             vm_size: Standard_D2_v2
         tags:
           Environment: Production
+        return_kube_config: yes
 
     - name: Remove a managed Azure Container Services (AKS) instance
       azure_rm_aks:
@@ -145,7 +153,7 @@ state:
         changed: false
         dns_prefix: aks9860bdcd89
         id: "/subscriptions/XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX/resourcegroups/yuwzhoaks/providers/Microsoft.ContainerService/managedClusters/aks9860bdc"
-        kube_config: "......"
+        kube_config: "......"  # only with return_kube_config
         kubernetes_version: 1.7.7
         linux_profile:
            admin_username: azureuser
@@ -248,7 +256,7 @@ def create_aks_dict(aks):
         agent_pool_profiles=create_agent_pool_profiles_dict(
             aks.agent_pool_profiles),
         type=aks.type,
-        kube_config=aks.kube_config
+        kube_config=getattr(aks, 'kube_config', None)
     )
 
 
@@ -360,6 +368,10 @@ class AzureRMManagedCluster(AzureRMModuleBase):
             service_principal=dict(
                 type='dict',
                 options=service_principal_spec
+            ),
+            return_kube_config=dict(
+                type='bool',
+                default=False
             )
         )
 
@@ -373,6 +385,8 @@ class AzureRMManagedCluster(AzureRMModuleBase):
         self.linux_profile = None
         self.agent_pool_profiles = None
         self.service_principal = None
+        self.return_kube_config = None
+        self.aks_instance = None
 
         required_if = [
             ('state', 'present', [
@@ -394,6 +408,7 @@ class AzureRMManagedCluster(AzureRMModuleBase):
 
         resource_group = None
         to_be_updated = False
+        to_be_scaled = False
 
         resource_group = self.get_resource_group(self.resource_group)
         if not self.location:
@@ -460,8 +475,11 @@ class AzureRMManagedCluster(AzureRMModuleBase):
                         for profile_self in self.agent_pool_profiles:
                             if profile_result['name'] == profile_self['name']:
                                 matched = True
-                                if profile_result['count'] != profile_self['count'] \
-                                        or profile_result['vm_size'] != profile_self['vm_size'] \
+                                if profile_result['count'] != profile_self['count']:
+                                    self.log("Agent Profile {0} count diff, Was {1} / Now {2}".format(
+                                        profile_self['name'], profile_result['count'], profile_self['count']))
+                                    to_be_scaled = True
+                                if profile_result['vm_size'] != profile_self['vm_size'] \
                                         or profile_result['os_disk_size_gb'] != profile_self['os_disk_size_gb'] \
                                         or profile_result['dns_prefix'] != profile_self['dns_prefix'] \
                                         or profile_result['vnet_subnet_id'] != profile_self.get('vnet_subnet_id') \
@@ -483,6 +501,19 @@ class AzureRMManagedCluster(AzureRMModuleBase):
                 self.results['changed'] = True
                 return self.results
 
+            if to_be_scaled:
+                self.log("Need to scale the AKS instance")
+
+                if not self.check_mode:
+                    self.results = self.scale_aks()
+                    self.log("Scale done")
+
+                self.results['changed'] = True
+                return self.results
+
+            if response and self.return_kube_config:
+                self.results['kube_config'] = self.get_aks_kubeconfig()
+
         elif self.state == 'absent' and response:
             self.log("Need to Delete the AKS instance")
             self.results['changed'] = True
@@ -532,12 +563,39 @@ class AzureRMManagedCluster(AzureRMModuleBase):
         try:
             poller = self.containerservice_client.managed_clusters.create_or_update(self.resource_group, self.name, parameters)
             response = self.get_poller_result(poller)
-            response.kube_config = self.get_aks_kubeconfig()
+            if self.return_kube_config:
+                response.kube_config = self.get_aks_kubeconfig()
             return create_aks_dict(response)
         except CloudError as exc:
             self.log('Error attempting to create the AKS instance.')
             self.fail("Error creating the AKS instance: {0}".format(exc.message))
 
+    def scale_aks(self):
+        '''
+        Changes only the agent counts, sending back the managed cluster as read by get_aks.
+
+        :return: deserialized AKS instance state dictionary
+        '''
+        self.log("Scaling the AKS instance {0}".format(self.name))
+
+        counts = dict((profile['name'], profile['count']) for profile in self.agent_pool_profiles)
+        parameters = self.aks_instance
+        for profile in parameters.agent_pool_profiles:
+            profile.count = counts.get(profile.name, profile.count)
+        # the service principal secret is not returned by the service, leave both profiles out so they are kept as they are
+        parameters.service_principal_profile = None
+        parameters.aad_profile = None
+
+        try:
+            poller = self.containerservice_client.managed_clusters.create_or_update(self.resource_group, self.name, parameters)
+            response = self.get_poller_result(poller)
+            if self.return_kube_config:
+                response.kube_config = self.get_aks_kubeconfig()
+            return create_aks_dict(response)
+        except CloudError as exc:
+            self.log('Error attempting to scale the AKS instance.')
+            self.fail("Error scaling the AKS instance: {0}".format(exc.message))
+
     def delete_aks(self):
         '''
         Deletes the specified managed container service (AKS) in the specified subscription and resource group.
@@ -568,7 +626,7 @@ class AzureRMManagedCluster(AzureRMModuleBase):
                 self.resource_group, self.name)
             self.log("Response : {0}".format(response))
             self.log("AKS instance : {0} found".format(response.name))
-            response.kube_config = self.get_aks_kubeconfig()
+            self.aks_instance = response
             return create_aks_dict(response)
         except CloudError:
             self.log('Did not find the AKS instance.')
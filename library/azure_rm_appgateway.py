@@ -355,6 +355,33 @@ options:
             redirect_configuration:
                 description:
                     - Redirect configuration resource of the application gateway
+    backend_address_pool_members:
+        description:
+            - Add or remove backend addresses of existing backend address pools, leaving the rest of the gateway as it is.
+            - The gateway is read once and all the pool changes are applied with a single update. Other gateway options
+              are ignored and need not be given.
+        suboptions:
+            name:
+                description:
+                    - Name of the backend address pool.
+                required: True
+            backend_addresses:
+                description:
+                    - List of backend addresses, each with I(ip_address) or I(fqdn).
+                required: True
+            state:
+                description:
+                    - Whether the addresses should be in the pool or not.
+                default: present
+                choices:
+                    - absent
+                    - present
+            purge:
+                description:
+                    - With I(state=present), also remove the addresses of the pool which are not listed.
+                type: bool
+                default: no
+        version_added: "2.8"
     state:
         description:
             - Assert the state of the Public IP. Use 'present' to create or update a and
@@ -412,6 +439,20 @@ EXAMPLES = '''
         backend_http_settings: sample_appgateway_http_settings
         http_listener: sample_http_listener
         name: rule1
+
+- name: Add two web servers to a backend pool and remove an old one, in a single gateway update
+  azure_rm_appgateway:
+    resource_group: myresourcegroup
+    name: myappgateway
+    backend_address_pool_members:
+      - name: test_backend_address_pool
+        backend_addresses:
+          - ip_address: 10.0.0.5
+          - ip_address: 10.0.0.6
+      - name: test_backend_address_pool
+        state: absent
+        backend_addresses:
+          - ip_address: 10.0.0.4
 '''
 
 RETURN = '''
@@ -421,6 +462,12 @@ id:
     returned: always
     type: str
     sample: id
+duration:
+    description:
+        - Time in seconds taken by the gateway update.
+    returned: when the gateway was created or updated
+    type: float
+    sample: 723.41
 '''
 
 import time
@@ -475,6 +522,14 @@ redirect_configuration_spec = dict(
 )
 
 
+backend_address_pool_members_spec = dict(
+    name=dict(type='str', required=True),
+    backend_addresses=dict(type='list', required=True),
+    state=dict(type='str', choices=['present', 'absent'], default='present'),
+    purge=dict(type='bool', default=False)
+)
+
+
 class AzureRMApplicationGateways(AzureRMModuleBase):
     """Configuration class for an Azure RM Application Gateway resource"""
 
@@ -535,6 +590,11 @@ class AzureRMApplicationGateways(AzureRMModuleBase):
             request_routing_rules=dict(
                 type='list'
             ),
+            backend_address_pool_members=dict(
+                type='list',
+                elements='dict',
+                options=backend_address_pool_members_spec
+            ),
             state=dict(
                 type='str',
                 default='present',
@@ -544,6 +604,7 @@ class AzureRMApplicationGateways(AzureRMModuleBase):
 
         self.resource_group = None
         self.name = None
+        self.backend_address_pool_members = None
         self.parameters = dict()
 
         self.results = dict(changed=False)
@@ -752,6 +813,9 @@ class AzureRMApplicationGateways(AzureRMModuleBase):
 
         old_response = self.get_applicationgateway()
 
+        if self.backend_address_pool_members is not None and self.state == 'present':
+            return self.update_backend_address_pool_members(old_response)
+
         if not old_response:
             self.log("Application Gateway instance doesn't exist")
             if self.state == 'absent':
@@ -811,8 +875,10 @@ class AzureRMApplicationGateways(AzureRMModuleBase):
             self.delete_applicationgateway()
             # make sure instance is actually deleted, for some Azure resources, instance is hanging around
             # for some time after deletion -- this should be really fixed in Azure
+            delay = 5
             while self.get_applicationgateway():
-                time.sleep(20)
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
         else:
             self.log("Application Gateway instance unchanged")
             self.results['changed'] = False
@@ -823,6 +889,54 @@ class AzureRMApplicationGateways(AzureRMModuleBase):
 
         return self.results
 
+    def update_backend_address_pool_members(self, old_response):
+        '''
+        Apply all the backend address pool membership changes to the gateway as read, with a single update.
+
+        :return: module results
+        '''
+        if not old_response:
+            self.fail("Application Gateway {0} not found, it must exist to update its backend address pool members".format(self.name))
+
+        pools = deepcopy(old_response.get('backend_address_pools') or [])
+        pools_index = dict((pool['name'], pool) for pool in pools)
+        changed = False
+        for change in self.backend_address_pool_members:
+            pool = pools_index.get(change['name'])
+            if pool is None:
+                self.fail("Backend address pool {0} not found in Application Gateway {1}".format(change['name'], self.name))
+            addresses = pool.get('backend_addresses') or []
+            requested = [dict((k, v) for k, v in address.items() if k in ('ip_address', 'fqdn') and v) for address in change['backend_addresses']]
+            requested_keys = set(backend_address_key(address) for address in requested)
+            if change['state'] == 'absent':
+                kept = [address for address in addresses if backend_address_key(address) not in requested_keys]
+            elif change['purge']:
+                kept = [address for address in addresses if backend_address_key(address) in requested_keys]
+            else:
+                kept = addresses
+            kept_keys = set(backend_address_key(address) for address in kept)
+            added = [address for address in requested if backend_address_key(address) not in kept_keys] if change['state'] == 'present' else []
+            if len(kept) != len(addresses) or added:
+                changed = True
+                # several changes to the same pool build on each other
+                pool['backend_addresses'] = kept + added
+
+        # compare_arrays extends the lists of the old gateway in place, so membership is compared on address keys
+        if not changed:
+            self.log("Application Gateway backend address pools unchanged")
+            self.results['id'] = old_response['id']
+            return self.results
+
+        self.results['changed'] = True
+        self.results['id'] = old_response['id']
+        if self.check_mode:
+            return self.results
+
+        self.parameters = old_response
+        self.parameters['backend_address_pools'] = pools
+        self.create_update_applicationgateway()
+        return self.results
+
     def create_update_applicationgateway(self):
         '''
         Creates or updates Application Gateway with the specified configuration.
@@ -831,12 +945,14 @@ class AzureRMApplicationGateways(AzureRMModuleBase):
         '''
         self.log("Creating / Updating the Application Gateway instance {0}".format(self.name))
 
+        start = time.time()
         try:
             response = self.mgmt_client.application_gateways.create_or_update(resource_group_name=self.resource_group,
                                                                               application_gateway_name=self.name,
                                                                               parameters=self.parameters)
             if isinstance(response, LROPoller):
                 response = self.get_poller_result(response)
+            self.results['duration'] = round(time.time() - start, 2)
 
         except CloudError as exc:
             self.log('Error attempting to create the Application Gateway instance.')
@@ -853,6 +969,8 @@ class AzureRMApplicationGateways(AzureRMModuleBase):
         try:
             response = self.mgmt_client.application_gateways.delete(resource_group_name=self.resource_group,
                                                                     application_gateway_name=self.name)
+            if isinstance(response, LROPoller):
+                self.get_poller_result(response)
         except CloudError as e:
             self.log('Error attempting to delete the Application Gateway instance.')
             self.fail("Error deleting the Application Gateway instance: {0}".format(str(e)))
@@ -970,6 +1088,11 @@ def http_listener_id(subscription_id, resource_group_name, appgateway_name, name
     )
 
 
+def backend_address_key(address):
+    """Identify a backend address by its IP address or FQDN"""
+    return (address.get('ip_address'), address.get('fqdn'))
+
+
 def compare_arrays(old_params, new_params, param_name):
     old = old_params.get(param_name) or []
     new = new_params.get(param_name) or []
@@ -112,7 +112,7 @@ class AzureRMRoutesFacts(AzureRMModuleBase):
         self.resource_group = None
         self.route_table_name = None
         self.route_name = None
-        super(AzureRMRoutesFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMRoutesFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
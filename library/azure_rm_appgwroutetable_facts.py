@@ -130,7 +130,7 @@ class AzureRMRouteTablesFacts(AzureRMModuleBase):
         self.resource_group = None
         self.route_table_name = None
         self.expand = None
-        super(AzureRMRouteTablesFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMRouteTablesFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
@@ -224,7 +224,7 @@ class AzureRMAutoScaleFacts(AzureRMModuleBase):
         self.resource_group = None
         self.name = None
         self.tags = None
-        super(AzureRMAutoScaleFacts, self).__init__(self.module_arg_spec, supports_tags=False)
+        super(AzureRMAutoScaleFacts, self).__init__(self.module_arg_spec, supports_tags=False, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in list(self.module_arg_spec):
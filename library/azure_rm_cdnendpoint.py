@@ -27,7 +27,7 @@ options:
     name:
         description:
             - Name of the Azure CDN endpoint.
-        required: true
+            - Mutually exclusive with I(endpoints), one of them is required.
     state:
         description:
             - Assert the state of the Azure CDN endpoint. Use C(present) to create or update a Azure CDN endpoint and C(absent) to delete it.
@@ -49,11 +49,27 @@ options:
     purge_content_paths:
         description:
             - Use with state 'present' and purge 'true' to specify content paths to be purged.
-        type: bool
+            - Duplicate paths and paths covered by a wildcard path like C(/images/*) are dropped. The remaining
+              paths are sent in chunks of 100 paths, at most I(max_concurrency) chunks at a time.
+        type: list
         default: ['/']
+    load_content:
+        description:
+            - Use with state 'present' to preload content paths on the endpoint, after the purge when I(purge) is set.
+            - Only full paths are accepted, wildcards are not.
+        type: list
+        version_added: "2.8"
+    max_concurrency:
+        description:
+            - Maximum number of purge or load requests in flight at once.
+            - Keep it within the CDN limit of concurrent purge requests per profile.
+        type: int
+        default: 10
+        version_added: "2.8"
     profile_name:
         description:
             - Name of the CDN profile in which the endpoint exists or to be created.
+            - Required with I(name). With I(endpoints), the default profile of the listed endpoints.
         type: str
     origin:
         description:
@@ -114,6 +130,18 @@ options:
             - UseQueryString
             - NotSet
         default: IgnoreQueryString
+    endpoints:
+        description:
+            - List of Azure CDN endpoints to create, update or delete in a single task, across profiles.
+            - The endpoints of each profile are listed once and compared in memory, and only the endpoints with
+              different settings are created, updated or deleted, at most I(max_concurrency) at a time.
+            - Each endpoint accepts the I(name), I(profile_name), I(location), I(origin), I(origin_host_header),
+              I(origin_path), I(content_types_to_compress), I(is_compression_enabled), I(is_http_allowed),
+              I(is_https_allowed) and I(query_string_caching_behavior) options of a single endpoint. Options not set on
+              an endpoint default to the options of the module, and I(tags) apply to every endpoint.
+            - Mutually exclusive with I(started), I(purge) and I(load_content).
+        type: list
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -136,6 +164,35 @@ EXAMPLES = '''
               testing: testing
               delete: on-exit
               foo: bar
+    - name: Apply the caching settings of a release to endpoints of two profiles
+      azure_rm_cdnendpoint:
+          resource_group: TestRg
+          profile_name: TestProfile
+          is_compression_enabled: true
+          query_string_caching_behavior: UseQueryString
+          endpoints:
+            - name: TestEndpoint
+              origin:
+                name: TestOrig
+                host_name: "www.example.com"
+            - name: TestEndpoint2
+              profile_name: TestProfile2
+              origin:
+                name: TestOrig
+                host_name: "www.example.com"
+              origin_path: /static
+    - name: Purge a release and preload its hot assets
+      azure_rm_cdnendpoint:
+          resource_group: TestRg
+          name: TestEndpoint
+          profile_name: TestProfile
+          purge: yes
+          purge_content_paths:
+            - /static/*
+            - /index.html
+          load_content:
+            - /index.html
+            - /static/app.js
     - name: Delete a Azure CDN endpoint
       azure_rm_cdnendpoint:
           resource_group: TestRg
@@ -179,7 +236,58 @@ state:
             "testing": "testing"
         }
         "type": "Microsoft.Cdn/profiles/endpoints"
+purged_content_paths:
+    description: Content paths purged, after dropping the duplicate and wildcard covered paths.
+    returned: when purged
+    type: list
+    example: ["/static/*", "/index.html"]
+loaded_content_paths:
+    description: Content paths preloaded.
+    returned: when loaded
+    type: list
+    example: ["/index.html", "/static/app.js"]
+duration:
+    description: Time in seconds taken by the purge and load requests, or by the changes of I(endpoints).
+    returned: when purged or loaded, or when I(endpoints) is set
+    type: float
+    example: 94.1
+endpoints:
+    description: Result for each endpoint of I(endpoints).
+    returned: when I(endpoints) is set
+    type: complex
+    contains:
+        name:
+            description: Name of the Azure CDN endpoint.
+            returned: always
+            type: str
+            example: TestEndpoint
+        profile_name:
+            description: Name of the CDN profile of the endpoint.
+            returned: always
+            type: str
+            example: TestProfile
+        action:
+            description: Change made to the endpoint.
+            returned: always
+            type: str
+            example: updated
+            choices:
+                - created
+                - updated
+                - deleted
+                - unchanged
+        state:
+            description: Current state of the Azure CDN endpoint, in the format of I(state).
+            returned: when the endpoint exists
+            type: dict
+        msg:
+            description: Error message when the change failed.
+            returned: on failure
+            type: str
 '''
+import copy
+import time
+
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
 
 try:
@@ -242,6 +350,37 @@ def default_content_types():
             "application/xml"]
 
 
+# Azure CDN accepts up to 100 content paths in a single purge or load request
+CDN_CONTENT_PATHS_PER_REQUEST = 100
+
+
+def dedupe_content_paths(paths):
+    '''
+    Drop duplicate paths and paths covered by a wildcard path like /images/*, keeping the order of paths.
+    '''
+    prefixes = set(path[:-1] for path in paths if path.endswith('/*'))
+    seen = set()
+    result = []
+    for path in paths:
+        if path in seen:
+            continue
+        seen.add(path)
+        if not is_content_path_covered(path, prefixes):
+            result.append(path)
+    return result
+
+
+def is_content_path_covered(path, prefixes):
+    # walk the parent directories of path, a wildcard on any of them other than path itself covers it
+    index = path.find('/')
+    while index != -1:
+        parent = path[:index + 1]
+        if parent in prefixes and path != parent + '*':
+            return True
+        index = path.find('/', index + 1)
+    return False
+
+
 origin_spec = dict(
     name=dict(
         type='str',
@@ -260,6 +399,21 @@ origin_spec = dict(
 )
 
 
+endpoint_spec = dict(
+    name=dict(type='str', required=True),
+    profile_name=dict(type='str'),
+    location=dict(type='str'),
+    origin=dict(type='dict', options=origin_spec),
+    origin_host_header=dict(type='str'),
+    origin_path=dict(type='str'),
+    content_types_to_compress=dict(type='list', elements='str'),
+    is_compression_enabled=dict(type='bool'),
+    is_http_allowed=dict(type='bool'),
+    is_https_allowed=dict(type='bool'),
+    query_string_caching_behavior=dict(type='str', choices=['IgnoreQueryString', 'BypassCaching', 'UseQueryString', 'NotSet'])
+)
+
+
 class AzureRMCdnendpoint(AzureRMModuleBase):
 
     def __init__(self):
@@ -269,8 +423,7 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
                 required=True
             ),
             name=dict(
-                type='str',
-                required=True
+                type='str'
             ),
             location=dict(
                 type='str'
@@ -291,9 +444,16 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
                 elements='str',
                 default=['/']
             ),
+            load_content=dict(
+                type='list',
+                elements='str'
+            ),
+            max_concurrency=dict(
+                type='int',
+                default=10
+            ),
             profile_name=dict(
-                type='str',
-                required=True
+                type='str'
             ),
             origin=dict(
                 type='dict',
@@ -331,6 +491,11 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
                 ],
                 default='IgnoreQueryString'
             ),
+            endpoints=dict(
+                type='list',
+                elements='dict',
+                options=endpoint_spec
+            ),
         )
 
         self.resource_group = None
@@ -339,6 +504,8 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
         self.started = None
         self.purge = None
         self.purge_content_paths = None
+        self.load_content = None
+        self.max_concurrency = None
         self.location = None
         self.profile_name = None
         self.origin = None
@@ -350,6 +517,7 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
         self.is_http_allowed = None
         self.is_https_allowed = None
         self.query_string_caching_behavior = None
+        self.endpoints = None
 
         self.cdn_client = None
 
@@ -357,7 +525,10 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
 
         super(AzureRMCdnendpoint, self).__init__(derived_arg_spec=self.module_arg_spec,
                                                  supports_check_mode=True,
-                                                 supports_tags=True)
+                                                 supports_tags=True,
+                                                 mutually_exclusive=[['name', 'endpoints'], ['endpoints', 'started'],
+                                                                     ['endpoints', 'purge'], ['endpoints', 'load_content']],
+                                                 required_one_of=[['name', 'endpoints']])
 
     def exec_module(self, **kwargs):
         """Main module execution method"""
@@ -368,6 +539,12 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
         self.cdn_client = self.get_cdn_client()
         to_be_updated = False
 
+        if self.endpoints is not None:
+            return self.exec_endpoints()
+
+        if not self.profile_name:
+            self.fail("Parameter error: profile_name required with name.")
+
         resource_group = self.get_resource_group(self.resource_group)
         if not self.location:
             self.location = resource_group.location
@@ -428,11 +605,11 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
                         self.results['changed'] = False
                         return self.results
 
-                    if self.purge:
-                        self.log("Need to purge endpoint")
+                    if self.purge or self.load_content:
+                        self.log("Need to purge or load endpoint content")
 
                         if not self.check_mode:
-                            self.results = self.purge_cdnendpoint()
+                            self.results = self.purge_cdnendpoint(response)
                             self.log("Endpoint purged")
 
                         self.results['changed'] = True
@@ -465,6 +642,87 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
 
         return self.results
 
+    def exec_endpoints(self):
+        '''
+        Reconcile the endpoints in endpoints, listing the endpoints of each profile once and sharing one client.
+
+        :return: module results with one item per endpoint
+        '''
+        members = []
+        location = None
+        for endpoint in self.endpoints:
+            member = copy.copy(self)
+            for key, value in endpoint.items():
+                if value is not None:
+                    setattr(member, key, value)
+            if not member.profile_name:
+                self.fail("Parameter error: profile_name required for endpoint {0}.".format(member.name))
+            if not member.location:
+                if not location:
+                    location = self.get_resource_group(self.resource_group).location
+                member.location = location
+            members.append(member)
+
+        def get_lister(profile_name):
+            def list_endpoints():
+                try:
+                    return dict((endpoint.name.lower(), cdnendpoint_to_dict(endpoint))
+                                for endpoint in self.cdn_client.endpoints.list_by_profile(self.resource_group, profile_name))
+                except ErrorResponseException as exc:
+                    self.fail("Error listing the endpoints of Azure CDN profile {0}: {1}".format(profile_name, exc.message))
+            return list_endpoints
+
+        profiles = set(member.profile_name for member in members)
+        existing, errors = self.run_in_parallel(dict((profile_name, get_lister(profile_name)) for profile_name in profiles),
+                                                max_workers=self.max_concurrency)
+        if errors:
+            self.fail('; '.join(errors[profile_name] for profile_name in sorted(errors)))
+
+        start = time.time()
+        items = []
+        changes = dict()
+        for member in members:
+            old = existing[member.profile_name].get(member.name.lower())
+            item = dict(name=member.name, profile_name=member.profile_name, action='unchanged')
+            if old:
+                item['state'] = old
+            key = '{0}/{1}'.format(member.profile_name, member.name)
+            if self.state == 'absent':
+                if old:
+                    item['action'] = 'deleted'
+                    changes[key] = member.delete_cdnendpoint
+            elif not old:
+                if member.origin is None:
+                    self.fail("Origin is not provided when trying to create endpoint {0}".format(member.name))
+                item['action'] = 'created'
+                changes[key] = member.create_cdnendpoint
+            else:
+                update_tags, old_tags = member.update_tags(old['tags'])
+                member.tags = old_tags
+                if update_tags or member.check_update(dict(old, tags=old_tags)):
+                    item['action'] = 'updated'
+                    changes[key] = member.update_cdnendpoint
+            items.append(item)
+
+        self.results['endpoints'] = items
+        self.results['changed'] = bool(changes)
+        if self.check_mode or not changes:
+            return self.results
+
+        results, errors = self.run_in_parallel(changes, max_workers=self.max_concurrency)
+        for item in items:
+            key = '{0}/{1}'.format(item['profile_name'], item['name'])
+            if key in errors:
+                item['msg'] = errors[key]
+            elif item['action'] == 'deleted':
+                item.pop('state', None)
+            elif key in results:
+                item['state'] = results[key]
+        self.results['duration'] = round(time.time() - start, 2)
+        if errors:
+            self.fail("Error updating the Azure CDN endpoints {0}".format(', '.join(sorted(errors))), **self.results)
+        return self.results
+
     def create_cdnendpoint(self):
         '''
         Creates a Azure CDN endpoint.
@@ -583,23 +841,50 @@ class AzureRMCdnendpoint(AzureRMModuleBase):
             self.log('Fail to start the Azure CDN endpoint.')
             return False
 
-    def purge_cdnendpoint(self):
+    def purge_cdnendpoint(self, response):
         '''
-        Purges an existing Azure CDN endpoint.
+        Purges an existing Azure CDN endpoint, then preloads load_content.
 
+        :param response: deserialized Azure CDN endpoint state dictionary, from before the purge
         :return: deserialized Azure CDN endpoint state dictionary
         '''
-        self.log(
-            "Purging the Azure CDN endpoint {0}".format(self.name))
-        try:
-            poller = self.cdn_client.endpoints.purge_content(self.resource_group, self.profile_name, self.name,
-                                                                        content_paths=self.purge_content_paths)
-            response = self.get_poller_result(poller)
-            self.log("Response : {0}".format(response))
-            return self.get_cdnendpoint()
-        except ErrorResponseException as e:
-            self.log('Fail to purge the Azure CDN endpoint.')
-            return False
+        start = time.time()
+        if self.purge:
+            self.log(
+                "Purging the Azure CDN endpoint {0}".format(self.name))
+            response['purged_content_paths'] = dedupe_content_paths(self.purge_content_paths)
+            self.send_content_paths(self.cdn_client.endpoints.purge_content, response['purged_content_paths'], 'purge')
+        if self.load_content:
+            if any('*' in path for path in self.load_content):
+                self.fail("Parameter error: load_content does not accept wildcard paths.")
+            self.log(
+                "Loading content on the Azure CDN endpoint {0}".format(self.name))
+            response['loaded_content_paths'] = dedupe_content_paths(self.load_content)
+            self.send_content_paths(self.cdn_client.endpoints.load_content, response['loaded_content_paths'], 'load')
+        response['duration'] = round(time.time() - start, 2)
+        return response
+
+    def send_content_paths(self, operation, paths, verb):
+        '''
+        Send content paths in API sized chunks, at most max_concurrency chunks at a time, then wait for all the
+        long running operations together.
+
+        :param operation: endpoints.purge_content or endpoints.load_content
+        :param paths: list of content paths
+        :param verb: name of the operation for error messages
+        '''
+        chunks = [paths[i:i + CDN_CONTENT_PATHS_PER_REQUEST] for i in range(0, len(paths), CDN_CONTENT_PATHS_PER_REQUEST)]
+
+        def get_operation(chunk):
+            def start():
+                return operation(self.resource_group, self.profile_name, self.name, content_paths=chunk)
+            return start
+
+        results, errors = self.run_operations_in_parallel(dict((index, get_operation(chunk)) for index, chunk in enumerate(chunks)),
+                                                          max_workers=self.max_concurrency)
+        if errors:
+            self.fail("Failed to {0} {1} of {2} content path chunks of the Azure CDN endpoint {3} - {4}".format(
+                verb, len(errors), len(chunks), self.name, '; '.join(errors[index] for index in sorted(errors))))
 
     def stop_cdnendpoint(self):
         '''
@@ -29,7 +29,7 @@ options:
     name:
         description:
             - The name of the container group.
-        required: true
+            - Mutually exclusive with I(groups), one of them is required.
     os_type:
         description:
             - The OS type of containers.
@@ -69,6 +69,7 @@ options:
     containers:
         description:
             - List of containers.
+            - Required to create a container group. With I(groups), the default containers of the listed groups.
         suboptions:
             name:
                 description:
@@ -89,11 +90,83 @@ options:
             ports:
                 description:
                     - List of ports exposed within the container group.
+            command:
+                description:
+                    - The commands to execute within the container instance, in exec form.
+                type: list
+                version_added: "2.8"
+            environment_variables:
+                description:
+                    - Dictionary of environment variables to set in the container instance.
+                type: dict
+                version_added: "2.8"
+    restart_policy:
+        description:
+            - Restart policy for all containers within the container group.
+        choices:
+            - always
+            - on_failure
+            - never
+        version_added: "2.8"
     force_update:
         description:
             - Force update of existing container instance. Any update will result in deletion and recreation of existing containers.
         type: bool
         default: 'no'
+    wait_for:
+        description:
+            - With C(provisioned), return as soon as the container group is provisioned.
+            - With C(running), also wait until every container is running, polling the instance view with a growing
+              delay. The module fails when a container terminates, the container group fails or I(wait_timeout) is
+              reached, and returns the tail of the logs of the containers.
+        choices:
+            - provisioned
+            - running
+        default: provisioned
+        version_added: "2.8"
+    wait_timeout:
+        description:
+            - Time in seconds to wait for the containers to run, when I(wait_for=running).
+        type: int
+        default: 600
+        version_added: "2.8"
+    groups:
+        description:
+            - List of container groups to create or delete in a single task, with the options of the module.
+            - The container groups of the resource group are listed once. The groups to create are then created at most
+              I(max_concurrency) at a time, each one waited for as set by I(wait_for).
+        type: list
+        version_added: "2.8"
+        suboptions:
+            name:
+                description:
+                    - The name of the container group.
+                required: true
+            containers:
+                description:
+                    - List of containers of the group, in the format of I(containers). Defaults to I(containers).
+                type: list
+            command:
+                description:
+                    - The commands to execute within the containers of the group that do not set their own.
+                type: list
+            environment_variables:
+                description:
+                    - Dictionary of environment variables to add to the containers of the group.
+                type: dict
+    delete_finished:
+        description:
+            - With I(groups) and I(state=absent), only delete the listed container groups which finished, that is which
+              are no longer running or pending.
+        type: bool
+        default: no
+        version_added: "2.8"
+    max_concurrency:
+        description:
+            - Maximum number of container groups created or deleted at the same time when I(groups) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -120,6 +193,32 @@ EXAMPLES = '''
           memory: 1.5
           ports:
             - 80
+
+  - name: Start the nightly batch
+    azure_rm_containerinstance:
+      resource_group: testrg
+      os_type: linux
+      restart_policy: never
+      containers:
+        - name: worker
+          image: myregistry.azurecr.io/batch:latest
+      groups:
+        - name: batch-0
+          environment_variables:
+            SHARD: "0"
+        - name: batch-1
+          environment_variables:
+            SHARD: "1"
+      max_concurrency: 20
+
+  - name: Delete the batch container groups which finished
+    azure_rm_containerinstance:
+      resource_group: testrg
+      groups:
+        - name: batch-0
+        - name: batch-1
+      delete_finished: yes
+      state: absent
 '''
 RETURN = '''
 id:
@@ -140,9 +239,77 @@ ip_address:
     returned: if address is public
     type: str
     sample: 175.12.233.11
+time_to_ready:
+    description:
+        - Time in seconds from the start of the module until every container was running.
+    returned: when I(wait_for=running) and the containers run
+    type: float
+    sample: 41.7
+containers:
+    description:
+        - Containers of the container group, with their instance view.
+    returned: when I(wait_for=running)
+    type: list
+    sample: [{"name": "mycontainer", "image": "httpd", "memory": 1.5, "cpu": 1, "instance_current_state": "Running"}]
+logs:
+    description:
+        - Tail of the logs of each container, keyed by container name.
+    returned: when waiting for the containers to run failed
+    type: dict
+    sample: {"mycontainer": "AH00558: httpd: Could not reliably determine the server's fully qualified domain name"}
+groups:
+    description:
+        - Result for each container group of I(groups).
+    returned: when I(groups) is set
+    type: complex
+    contains:
+        name:
+            description:
+                - Name of the container group.
+            returned: always
+            type: str
+            sample: batch-0
+        action:
+            description:
+                - Change made to the container group.
+            returned: always
+            type: str
+            sample: created
+            choices:
+                - created
+                - recreated
+                - deleted
+                - unchanged
+        id:
+            description:
+                - Resource ID of the container group.
+            returned: when created
+            type: str
+        provisioning_state:
+            description:
+                - Provisioning state of the container group.
+            returned: when created
+            type: str
+            sample: Succeeded
+        duration:
+            description:
+                - Time in seconds taken by the change.
+            returned: when changed
+            type: float
+            sample: 35.2
+        msg:
+            description:
+                - Error message when the change failed.
+            returned: on failure
+            type: str
 '''
 
+import copy
+
+import time
+
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
+from ansible.module_utils.common.dict_transformations import _snake_to_camel
 
 try:
     from msrestazure.azure_exceptions import CloudError
@@ -153,6 +320,10 @@ except ImportError:
     pass
 
 
+# Number of log lines returned for each container when the containers do not run
+CONTAINER_LOG_TAIL = 50
+
+
 def create_container_dict_from_obj(container):
     '''
     Create a dict from an instance of a Container.
@@ -201,8 +372,7 @@ class AzureRMContainerInstance(AzureRMModuleBase):
                 required=True
             ),
             name=dict(
-                type='str',
-                required=True
+                type='str'
             ),
             os_type=dict(
                 type='str',
@@ -240,13 +410,43 @@ class AzureRMContainerInstance(AzureRMModuleBase):
                 no_log=True
             ),
             containers=dict(
-                type='list',
-                required=True
+                type='list'
+            ),
+            restart_policy=dict(
+                type='str',
+                choices=['always', 'on_failure', 'never']
             ),
             force_update=dict(
                 type='bool',
                 default=False
             ),
+            wait_for=dict(
+                type='str',
+                default='provisioned',
+                choices=['provisioned', 'running']
+            ),
+            wait_timeout=dict(
+                type='int',
+                default=600
+            ),
+            groups=dict(
+                type='list',
+                elements='dict',
+                options=dict(
+                    name=dict(type='str', required=True),
+                    containers=dict(type='list'),
+                    command=dict(type='list'),
+                    environment_variables=dict(type='dict')
+                )
+            ),
+            delete_finished=dict(
+                type='bool',
+                default=False
+            ),
+            max_concurrency=dict(
+                type='int',
+                default=10
+            ),
         )
 
         self.resource_group = None
@@ -256,6 +456,12 @@ class AzureRMContainerInstance(AzureRMModuleBase):
         self.ip_address = None
 
         self.containers = None
+        self.wait_for = None
+        self.wait_timeout = None
+        self.restart_policy = None
+        self.groups = None
+        self.delete_finished = None
+        self.max_concurrency = None
 
         self.tags = None
 
@@ -264,7 +470,9 @@ class AzureRMContainerInstance(AzureRMModuleBase):
 
         super(AzureRMContainerInstance, self).__init__(derived_arg_spec=self.module_arg_spec,
                                                        supports_check_mode=True,
-                                                       supports_tags=True)
+                                                       supports_tags=True,
+                                                       mutually_exclusive=[['name', 'groups']],
+                                                       required_one_of=[['name', 'groups']])
 
     def exec_module(self, **kwargs):
         """Main module execution method"""
@@ -275,6 +483,7 @@ class AzureRMContainerInstance(AzureRMModuleBase):
         resource_group = None
         response = None
         results = dict()
+        start = time.time()
 
         # since this client hasn't been upgraded to expose models directly off the OperationClass, fish them out
         self.cgmodels = self.containerinstance_client.container_groups.models
@@ -284,6 +493,12 @@ class AzureRMContainerInstance(AzureRMModuleBase):
         if not self.location:
             self.location = resource_group.location
 
+        if self.groups is not None:
+            return self.exec_groups(start)
+
+        if self.state == 'present' and not self.containers:
+            self.fail("Parameter error: containers required to create or update container group {0}.".format(self.name))
+
         response = self.get_containerinstance()
 
         if not response:
@@ -328,8 +543,109 @@ class AzureRMContainerInstance(AzureRMModuleBase):
 
             self.log("Creation / Update done")
 
+            if self.wait_for == 'running' and not self.check_mode:
+                self.wait_for_running(start)
+
+        return self.results
+
+    def exec_groups(self, start):
+        '''
+        Create or delete the container groups in groups, listing the container groups of the resource group once.
+
+        :param start: time the module started, to report the time to ready
+        :return: module results with one item per container group
+        '''
+        try:
+            existing = set(group.name.lower() for group in
+                           self.containerinstance_client.container_groups.list_by_resource_group(self.resource_group))
+        except CloudError as exc:
+            self.fail("Error listing the container instances of resource group {0} - {1}".format(self.resource_group, str(exc)))
+
+        items = []
+        tasks = dict()
+        for group in self.groups:
+            member = copy.copy(self)
+            member.name = group['name']
+            member.results = dict()
+            item = dict(name=group['name'], action='unchanged')
+            exists = group['name'].lower() in existing
+            if self.state == 'absent':
+                if exists:
+                    # with delete_finished, whether the group finished is only known from its instance view, read by the worker,
+                    # in check mode too
+                    item['action'] = 'deleted'
+                    tasks[member.name] = self.get_group_deleter(member, item)
+            elif not exists or self.force_update:
+                member.containers = self.get_group_containers(group)
+                item['action'] = 'recreated' if exists else 'created'
+                tasks[member.name] = self.get_group_creator(member, item, exists, start)
+            items.append(item)
+
+        self.results['groups'] = items
+        self.results['changed'] = bool(tasks)
+        # in check mode, the deleters of delete_finished still run to read the instance views, without deleting
+        if not tasks or (self.check_mode and not (self.state == 'absent' and self.delete_finished)):
+            return self.results
+
+        results, errors = self.run_in_parallel(tasks, max_workers=self.max_concurrency)
+        for item in items:
+            if item['name'] in errors:
+                item['msg'] = errors[item['name']]
+        self.results['changed'] = any(item['action'] != 'unchanged' for item in items)
+        if errors:
+            self.fail("Error creating or deleting container instances {0}".format(', '.join(sorted(errors))), **self.results)
         return self.results
 
+    def get_group_containers(self, group):
+        '''
+        Containers of a container group of groups, with the command and environment variables of the group applied.
+        '''
+        containers = []
+        for container_def in group['containers'] or self.containers or []:
+            container_def = dict(container_def)
+            if group['command'] and not container_def.get('command'):
+                container_def['command'] = group['command']
+            if group['environment_variables']:
+                environment_variables = dict(container_def.get('environment_variables') or dict())
+                environment_variables.update(group['environment_variables'])
+                container_def['environment_variables'] = environment_variables
+            containers.append(container_def)
+        if not containers:
+            self.fail("Parameter error: containers required to create container group {0}.".format(group['name']))
+        return containers
+
+    def get_group_creator(self, member, item, exists, start):
+        def create():
+            task_start = time.time()
+            try:
+                if exists:
+                    member.delete_containerinstance()
+                response = member.create_update_containerinstance()
+                item['id'] = response['id']
+                item['provisioning_state'] = response['provisioning_state']
+                if self.wait_for == 'running':
+                    member.wait_for_running(start)
+            finally:
+                item['duration'] = round(time.time() - task_start, 2)
+        return create
+
+    def get_group_deleter(self, member, item):
+        def delete():
+            task_start = time.time()
+            try:
+                if self.delete_finished:
+                    group = member.containerinstance_client.container_groups.get(resource_group_name=self.resource_group,
+                                                                                 container_group_name=member.name)
+                    if group.instance_view and group.instance_view.state in ('Running', 'Pending'):
+                        item['action'] = 'unchanged'
+                        return
+                if self.check_mode:
+                    return
+                member.delete_containerinstance()
+            finally:
+                item['duration'] = round(time.time() - task_start, 2)
+        return delete
+
     def create_update_containerinstance(self):
         '''
         Creates or updates a container service with the specified configuration of orchestrator, masters, and agents.
@@ -369,17 +685,24 @@ class AzureRMContainerInstance(AzureRMModuleBase):
                 for port in port_list:
                     ports.append(self.cgmodels.ContainerPort(port=port))
 
+            environment_variables = None
+            if container_def.get("environment_variables"):
+                environment_variables = [self.cgmodels.EnvironmentVariable(name=key, value=str(value))
+                                         for key, value in container_def["environment_variables"].items()]
+
             containers.append(self.cgmodels.Container(name=name,
                                                       image=image,
+                                                      command=container_def.get("command"),
                                                       resources=self.cgmodels.ResourceRequirements(
                                                           requests=self.cgmodels.ResourceRequests(memory_in_gb=memory, cpu=cpu)
                                                       ),
-                                                      ports=ports))
+                                                      ports=ports,
+                                                      environment_variables=environment_variables))
 
         parameters = self.cgmodels.ContainerGroup(location=self.location,
                                                   containers=containers,
                                                   image_registry_credentials=registry_credentials,
-                                                  restart_policy=None,
+                                                  restart_policy=_snake_to_camel(self.restart_policy, capitalize_first=True) if self.restart_policy else None,
                                                   ip_address=ip_address,
                                                   os_type=self.os_type,
                                                   volumes=None,
@@ -394,6 +717,62 @@ class AzureRMContainerInstance(AzureRMModuleBase):
 
         return response.as_dict()
 
+    def wait_for_running(self, start):
+        '''
+        Poll the instance view of the container group with a growing delay until every container is running.
+        Fails with the tail of the container logs when a container terminates, the group fails or the wait times out.
+
+        :param start: time the module started, to report the time to ready
+        '''
+        deadline = start + self.wait_timeout
+        delay = 2
+        while True:
+            try:
+                group = self.containerinstance_client.container_groups.get(resource_group_name=self.resource_group,
+                                                                           container_group_name=self.name)
+            except CloudError as exc:
+                self.fail("Error getting the container instance {0} - {1}".format(self.name, str(exc)))
+
+            self.results['containers'] = [create_container_dict_from_obj(container) for container in group.containers]
+            states = [container.get('instance_current_state') for container in self.results['containers']]
+            group_state = group.instance_view.state if group.instance_view else None
+
+            if all(state == 'Running' for state in states):
+                self.results['time_to_ready'] = round(time.time() - start, 2)
+                return
+
+            if group_state in ('Failed', 'Stopped') or 'Terminated' in states:
+                reason = "container group is {0}".format(group_state) if group_state in ('Failed', 'Stopped') else "a container terminated"
+                break
+
+            if time.time() + delay > deadline:
+                reason = "timed out after {0} seconds".format(self.wait_timeout)
+                break
+
+            self.log("Waiting {0} sec for containers of {1} to run: {2}".format(delay, self.name, states))
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+        self.results['logs'] = self.get_container_logs(group.containers)
+        self.fail("Containers of container instance {0} are not running, {1}".format(self.name, reason), **self.results)
+
+    def get_container_logs(self, containers):
+        '''
+        Get the tail of the logs of each container, once.
+
+        :return: dict of container name to log tail
+        '''
+        logs = dict()
+        for container in containers:
+            try:
+                logs[container.name] = self.containerinstance_client.container_logs.list(resource_group_name=self.resource_group,
+                                                                                         container_group_name=self.name,
+                                                                                         container_name=container.name,
+                                                                                         tail=CONTAINER_LOG_TAIL).content
+            except CloudError as exc:
+                self.log("Could not get the logs of container {0} - {1}".format(container.name, str(exc)))
+        return logs
+
     def delete_containerinstance(self):
         '''
         Deletes the specified container group instance in the specified subscription and resource group.
@@ -180,7 +180,7 @@ class AzureRMContainerInstanceFacts(AzureRMModuleBase):
         )
         self.resource_group = None
         self.name = None
-        super(AzureRMContainerInstanceFacts, self).__init__(self.module_arg_spec, supports_tags=False)
+        super(AzureRMContainerInstanceFacts, self).__init__(self.module_arg_spec, supports_tags=False, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
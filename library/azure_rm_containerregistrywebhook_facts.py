@@ -146,7 +146,7 @@ class AzureRMWebhooksFacts(AzureRMModuleBase):
         self.resource_group = None
         self.registry_name = None
         self.webhook_name = None
-        super(AzureRMWebhooksFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMWebhooksFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
@@ -130,7 +130,7 @@ class AzureRMRecordSetFacts(AzureRMModuleBase):
         self.record_type = None
         self.top = None
 
-        super(AzureRMRecordSetFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMRecordSetFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
 
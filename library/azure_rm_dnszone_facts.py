@@ -108,7 +108,7 @@ class AzureRMDNSZoneFacts(AzureRMModuleBase):
         self.resource_group = None
         self.tags = None
 
-        super(AzureRMDNSZoneFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMDNSZoneFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
 
@@ -44,6 +44,20 @@ options:
     app_settings:
         description:
             - Dictionary containing application settings
+    package:
+        description:
+            - Local path of a zip package of the functions to deploy with zip deploy.
+            - The package is streamed to the SCM site with the publishing credentials of the Function App, retrying
+              transient failures, and the module waits for the deployment to complete.
+            - The package is not deployed again while it is the latest successful deployment.
+        type: path
+        version_added: "2.8"
+    package_timeout:
+        description:
+            - Time in seconds to wait for the deployment of I(package), upload included.
+        type: int
+        default: 900
+        version_added: "2.8"
     state:
         description:
             - Assert the state of the Function App. Use 'present' to create or update a Function App and
@@ -75,6 +89,13 @@ EXAMPLES = '''
           setting1: value1
           setting2: value2
 
+- name: deploy the functions of a function app
+  azure_rm_functionapp:
+      resource_group: ansible-rg
+      name: myfunctionapp
+      storage_account: myfunctionstorage
+      package: /tmp/functions.zip
+
 - name: delete a function app
   azure_rm_functionapp:
       name: myfunctionapp
@@ -121,6 +142,14 @@ state:
         daily_memory_time_quota: 0
         resource_group: ansible-rg
         default_host_name: myfunctionapp.azurewebsites.net
+deployment:
+    description: Zip deployment of I(package), with its C(id), C(message) recording the sha256 digest of the package, and C(duration).
+    returned: when I(package) is set
+    type: dict
+    example:
+        id: 5e4d7a1f0a9b4f6c9a8e8d1f2c3b4a59
+        message: "Ansible zip deployment sha256:bb056b9b7eb0b06bf860c0f7570b012e7cde43ec3c887eca693d2e12f67f8fcf"
+        duration: 42.17
 '''  # NOQA
 
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
@@ -147,7 +176,9 @@ class AzureRMFunctionApp(AzureRMModuleBase):
                 type='str',
                 aliases=['storage', 'storage_account_name']
             ),
-            app_settings=dict(type='dict')
+            app_settings=dict(type='dict'),
+            package=dict(type='path'),
+            package_timeout=dict(type='int', default=900)
         )
 
         self.results = dict(
@@ -161,6 +192,8 @@ class AzureRMFunctionApp(AzureRMModuleBase):
         self.location = None
         self.storage_account = None
         self.app_settings = None
+        self.package = None
+        self.package_timeout = None
 
         required_if = [('state', 'present', ['storage_account'])]
 
@@ -235,6 +268,12 @@ class AzureRMFunctionApp(AzureRMModuleBase):
                 except CloudError as exc:
                     self.fail('Error creating or updating web app: {}'.format(exc))
 
+            # a function app created in check mode has nothing to compare the package with
+            if self.package and (exists or not self.check_mode):
+                changed, self.results['deployment'] = self.deploy_zip_package(self.resource_group, self.name, self.package,
+                                                                              timeout=self.package_timeout)
+                self.results['changed'] = self.results['changed'] or changed
+
         return self.results
 
     def update(self, source_function_app):
@@ -296,10 +335,7 @@ class AzureRMFunctionApp(AzureRMModuleBase):
     def storage_key(self):
         """Retrieve the storage account key"""
 
-        return self.storage_client.storage_accounts.list_keys(
-            resource_group_name=self.resource_group,
-            account_name=self.storage_account
-        ).keys[0].value
+        return self.get_storage_account_key(self.resource_group, self.storage_account)
 
 
 def main():
@@ -29,13 +29,14 @@ options:
     vault_name:
         description:
             - Name of the vault
-        required: True
+            - Required unless I(vaults) is set.
     location:
         description:
             - Resource location. If not set, location from the resource group will be used as default.
     vault_tenant:
         description:
             - The Azure Active Directory tenant ID that should be used for authenticating requests to the key vault.
+            - Required when I(vault_name) is set and I(state=present).
     sku:
         description:
             - SKU details
@@ -55,6 +56,8 @@ options:
         description:
             - "An array of 0 to 16 identities that have access to the key vault. All identities in the array must use the same tenant ID as the key vault's
                tenant ID."
+            - The access policies of an existing vault are compared per principal. When nothing else changes, only the added, changed and
+              removed principals are sent, with the access policy update operations instead of a full update of the vault.
         suboptions:
             tenant_id:
                 description:
@@ -142,6 +145,34 @@ options:
         description:
             - Create vault in recovery mode.
         type: bool
+    purge_access_policies:
+        description:
+            - Remove the access policies of the principals which are not in I(access_policies).
+            - Set to C(no) to only add or update the principals in I(access_policies).
+        type: bool
+        default: yes
+        version_added: "2.8"
+    vaults:
+        description:
+            - List of existing vaults to apply I(access_policies) to, instead of managing a single vault.
+            - Only the access policies of these vaults are reconciled, at most I(max_concurrency) vaults at a time.
+            - An access policy without I(tenant_id) gets the tenant ID of each vault.
+        type: list
+        version_added: "2.8"
+        suboptions:
+            vault_name:
+                description:
+                    - Name of the vault.
+                required: True
+            resource_group:
+                description:
+                    - Resource group of the vault. Defaults to I(resource_group).
+    max_concurrency:
+        description:
+            - Maximum number of vaults of I(vaults) read or updated at the same time.
+        type: int
+        default: 10
+        version_added: "2.8"
     state:
         description:
             - Assert the state of the KeyVault. Use 'present' to create or update an KeyVault and 'absent' to delete it.
@@ -186,6 +217,7 @@ id:
 '''
 
 import collections
+import copy
 import time
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
 
@@ -200,7 +232,40 @@ except ImportError:
 
 
 class Actions:
-    NoAction, Create, Update, Delete = range(4)
+    NoAction, Create, Update, UpdateAccessPolicies, Delete = range(5)
+
+
+ACCESS_POLICY_PERMISSIONS = ['keys', 'secrets', 'certificates', 'storage']
+
+
+def access_policy_key(policy):
+    return tuple((policy.get(key) or '').lower() for key in ['tenant_id', 'object_id', 'application_id'])
+
+
+def access_policy_permissions(policy):
+    permissions = policy.get('permissions') or dict()
+    return dict((kind, sorted(set(p.lower() for p in permissions.get(kind) or []))) for kind in ACCESS_POLICY_PERMISSIONS)
+
+
+def diff_access_policies(new_policies, old_policies, purge):
+    '''
+    Compare access policies per principal.
+
+    :return: dict of the policies to send with each access policy update operation
+    '''
+    old = dict((access_policy_key(policy), policy) for policy in old_policies)
+    new_keys = set()
+    diff = dict(add=[], replace=[], remove=[])
+    for policy in new_policies:
+        key = access_policy_key(policy)
+        new_keys.add(key)
+        if key not in old:
+            diff['add'].append(policy)
+        elif access_policy_permissions(policy) != access_policy_permissions(old[key]):
+            diff['replace'].append(policy)
+    if purge:
+        diff['remove'] = [policy for policy in old_policies if access_policy_key(policy) not in new_keys]
+    return diff
 
 
 class AzureRMVaults(AzureRMModuleBase):
@@ -213,8 +278,7 @@ class AzureRMVaults(AzureRMModuleBase):
                 required=True
             ),
             vault_name=dict(
-                type='str',
-                required=True
+                type='str'
             ),
             location=dict(
                 type='str'
@@ -254,6 +318,22 @@ class AzureRMVaults(AzureRMModuleBase):
             recover_mode=dict(
                 type='bool'
             ),
+            purge_access_policies=dict(
+                type='bool',
+                default=True
+            ),
+            vaults=dict(
+                type='list',
+                elements='dict',
+                options=dict(
+                    vault_name=dict(type='str', required=True),
+                    resource_group=dict(type='str')
+                )
+            ),
+            max_concurrency=dict(
+                type='int',
+                default=10
+            ),
             state=dict(
                 type='str',
                 default='present',
@@ -261,10 +341,11 @@ class AzureRMVaults(AzureRMModuleBase):
             )
         )
 
-        self.module_required_if = [['state', 'present', ['vault_tenant']]]
-
         self.resource_group = None
         self.vault_name = None
+        self.purge_access_policies = None
+        self.vaults = None
+        self.max_concurrency = None
         self.parameters = dict()
         self.tags = None
 
@@ -276,7 +357,8 @@ class AzureRMVaults(AzureRMModuleBase):
         super(AzureRMVaults, self).__init__(derived_arg_spec=self.module_arg_spec,
                                             supports_check_mode=True,
                                             supports_tags=True,
-                                            required_if=self.module_required_if)
+                                            mutually_exclusive=[['vault_name', 'vaults']],
+                                            required_one_of=[['vault_name', 'vaults']])
 
     def exec_module(self, **kwargs):
         """Main module execution method"""
@@ -324,10 +406,17 @@ class AzureRMVaults(AzureRMModuleBase):
 
         old_response = None
         response = None
+        policy_diff = None
 
         self.mgmt_client = self.get_mgmt_svc_client(KeyVaultManagementClient,
                                                     base_url=self._cloud_environment.endpoints.resource_manager)
 
+        if self.vaults is not None:
+            return self.exec_vaults()
+
+        if self.state == 'present' and not self.parameters.get('properties', dict()).get('tenant_id'):
+            self.fail("Parameter error: vault_tenant required when state is present.")
+
         resource_group = self.get_resource_group(self.resource_group)
 
         if "location" not in self.parameters:
@@ -363,35 +452,15 @@ class AzureRMVaults(AzureRMModuleBase):
                     self.to_do = Actions.Update
                 elif ('create_mode' in self.parameters) and (self.parameters['create_mode'] != old_response['create_mode']):
                     self.to_do = Actions.Update
-                elif 'access_policies' in self.parameters['properties']:
-                    if len(self.parameters['properties']['access_policies']) != len(old_response['properties']['access_policies']):
-                        self.to_do = Actions.Update
-                    else:
-                        # FUTURE: this list isn't really order-dependent- we should be set-ifying the rules list for order-independent comparison
-                        for i in range(len(old_response['properties']['access_policies'])):
-                            n = self.parameters['properties']['access_policies'][i]
-                            o = old_response['properties']['access_policies'][i]
-                            if n.get('tenant_id', False) != o.get('tenant_id', False):
-                                self.to_do = Actions.Update
-                                break
-                            if n.get('object_id', None) != o.get('object_id', None):
-                                self.to_do = Actions.Update
-                                break
-                            if n.get('application_id', None) != o.get('application_id', None):
-                                self.to_do = Actions.Update
-                                break
-                            if sorted(n.get('keys', [])) != sorted(o.get('keys', [])):
-                                self.to_do = Actions.Update
-                                break
-                            if sorted(n.get('secrets', [])) != sorted(o.get('secrets', [])):
-                                self.to_do = Actions.Update
-                                break
-                            if sorted(n.get('certificates', [])) != sorted(o.get('certificates', [])):
-                                self.to_do = Actions.Update
-                                break
-                            if sorted(n.get('storage', [])) != sorted(o.get('storage', [])):
-                                self.to_do = Actions.Update
-                                break
+
+                access_policies = self.parameters.get('properties', dict()).get('access_policies')
+                if access_policies is not None:
+                    old_policies = old_response['properties'].get('access_policies') or []
+                    policy_diff = diff_access_policies(access_policies, old_policies, self.purge_access_policies)
+                    if not self.purge_access_policies:
+                        # a full update of the vault must keep the principals which are not listed
+                        listed = set(access_policy_key(policy) for policy in access_policies)
+                        access_policies.extend(policy for policy in old_policies if access_policy_key(policy) not in listed)
 
                 update_tags, newtags = self.update_tags(old_response.get('tags', dict()))
 
@@ -399,6 +468,9 @@ class AzureRMVaults(AzureRMModuleBase):
                     self.to_do = Actions.Update
                     self.tags = newtags
 
+                if self.to_do == Actions.NoAction and policy_diff and any(policy_diff.values()):
+                    self.to_do = Actions.UpdateAccessPolicies
+
         if (self.to_do == Actions.Create) or (self.to_do == Actions.Update):
             self.log("Need to Create / Update the Key Vault instance")
 
@@ -415,6 +487,15 @@ class AzureRMVaults(AzureRMModuleBase):
             else:
                 self.results['changed'] = old_response.__ne__(response)
             self.log("Creation / Update done")
+        elif self.to_do == Actions.UpdateAccessPolicies:
+            self.log("Need to update the access policies of the Key Vault instance")
+            self.results['changed'] = True
+
+            if self.check_mode:
+                return self.results
+
+            self.update_access_policies(self.resource_group, self.vault_name, policy_diff)
+            response = old_response
         elif self.to_do == Actions.Delete:
             self.log("Key Vault instance deleted")
             self.results['changed'] = True
@@ -425,8 +506,10 @@ class AzureRMVaults(AzureRMModuleBase):
             self.delete_keyvault()
             # make sure instance is actually deleted, for some Azure resources, instance is hanging around
             # for some time after deletion -- this should be really fixed in Azure
+            delay = 5
             while self.get_keyvault():
-                time.sleep(20)
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
         else:
             self.log("Key Vault instance unchanged")
             self.results['changed'] = False
@@ -437,6 +520,83 @@ class AzureRMVaults(AzureRMModuleBase):
 
         return self.results
 
+    def exec_vaults(self):
+        '''
+        Reconciles the access policies of the vaults in vaults concurrently.
+
+        :return: module results with one item per vault
+        '''
+        access_policies = self.parameters.get('properties', dict()).get('access_policies')
+        if access_policies is None:
+            self.fail("Parameter error: access_policies required with vaults.")
+        if self.state == 'absent':
+            self.fail("Parameter error: vaults can only be used with state present.")
+
+        items = []
+        for vault in self.vaults:
+            items.append(dict(vault_name=vault['vault_name'],
+                              resource_group=vault['resource_group'] or self.resource_group,
+                              changed=False,
+                              added=[],
+                              updated=[],
+                              removed=[]))
+
+        tasks = dict((index, self.get_access_policies_updater(item, access_policies)) for index, item in enumerate(items))
+        results, errors = self.run_in_parallel(tasks, max_workers=self.max_concurrency)
+        for index in errors:
+            items[index]['msg'] = errors[index]
+
+        self.results['vaults'] = items
+        self.results['changed'] = any(item['changed'] for item in items)
+        if errors:
+            self.fail("Error updating the access policies of Key Vault instances {0}".format(
+                ', '.join(sorted(items[index]['vault_name'] for index in errors))), **self.results)
+        return self.results
+
+    def get_access_policies_updater(self, item, access_policies):
+        def update():
+            try:
+                vault = self.mgmt_client.vaults.get(resource_group_name=item['resource_group'],
+                                                    vault_name=item['vault_name']).as_dict()
+            except CloudError as exc:
+                self.fail("Error getting the Key Vault instance {0}: {1}".format(item['vault_name'], str(exc)))
+
+            policies = []
+            for policy in access_policies:
+                policy = copy.deepcopy(policy)
+                policy['tenant_id'] = policy.get('tenant_id') or vault['properties']['tenant_id']
+                policies.append(policy)
+
+            policy_diff = diff_access_policies(policies, vault['properties'].get('access_policies') or [], self.purge_access_policies)
+            item['added'] = [policy['object_id'] for policy in policy_diff['add']]
+            item['updated'] = [policy['object_id'] for policy in policy_diff['replace']]
+            item['removed'] = [policy['object_id'] for policy in policy_diff['remove']]
+            item['changed'] = any(policy_diff.values())
+            if item['changed'] and not self.check_mode:
+                self.update_access_policies(item['resource_group'], item['vault_name'], policy_diff)
+        return update
+
+    def update_access_policies(self, resource_group, vault_name, policy_diff):
+        '''
+        Sends the access policy changes of a Key Vault, with one update operation per kind of change.
+
+        :return: True
+        '''
+        for operation_kind in ['remove', 'replace', 'add']:
+            if not policy_diff[operation_kind]:
+                continue
+            self.log("Sending {0} access policies of the Key Vault instance {1} with operation {2}".format(
+                len(policy_diff[operation_kind]), vault_name, operation_kind))
+            try:
+                self.mgmt_client.vaults.update_access_policy(resource_group_name=resource_group,
+                                                             vault_name=vault_name,
+                                                             operation_kind=operation_kind,
+                                                             properties=dict(access_policies=policy_diff[operation_kind]))
+            except CloudError as exc:
+                self.log('Error attempting to update the access policies of the Key Vault instance.')
+                self.fail("Error updating the access policies of the Key Vault instance {0}: {1}".format(vault_name, str(exc)))
+        return True
+
     def create_update_keyvault(self):
         '''
         Creates or updates Key Vault with the specified configuration.
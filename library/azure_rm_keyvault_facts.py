@@ -107,7 +107,7 @@ class AzureRMVaultsFacts(AzureRMModuleBase):
         self.resource_group = None
         self.vault_name = None
         self.top = None
-        super(AzureRMVaultsFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMVaultsFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
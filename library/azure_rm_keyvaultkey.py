@@ -23,11 +23,11 @@ options:
     keyvault_uri:
             description:
                 - URI of the keyvault endpoint.
-            required: true
+                - Required with I(key_name). With I(keys), the default vault of the listed keys.
     key_name:
         description:
             - Name of the keyvault key.
-        required: true
+            - Mutually exclusive with I(keys), one of them is required.
     byok_file:
         description:
             - BYOK file.
@@ -45,6 +45,33 @@ options:
         choices:
             - absent
             - present
+    rotate:
+        description:
+            - With I(state=present), create a new version of the keys which already exist.
+        type: bool
+        default: no
+        version_added: "2.8"
+    keys:
+        description:
+            - List of keys to create, rotate or delete in a single task, possibly across vaults.
+            - The keys of each vault are listed once, then the keys are created or deleted at most I(max_concurrency)
+              at a time, with one client sharing a cached vault token.
+        type: list
+        version_added: "2.8"
+        suboptions:
+            name:
+                description:
+                    - Name of the keyvault key.
+                required: true
+            keyvault_uri:
+                description:
+                    - URI of the keyvault endpoint. Defaults to I(keyvault_uri).
+    max_concurrency:
+        description:
+            - Maximum number of keys created or deleted at the same time when I(keys) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -61,6 +88,16 @@ EXAMPLES = '''
         key_name: MyKey
         keyvault_uri: https://contoso.vault.azure.net/
 
+    - name: Rotate the keys of two vaults
+      azure_rm_keyvaultkey:
+        keyvault_uri: https://contoso.vault.azure.net/
+        keys:
+          - name: MyKey
+          - name: MyOtherKey
+          - name: MyKey
+            keyvault_uri: https://fabrikam.vault.azure.net/
+        rotate: yes
+
     - name: Delete a key
       azure_rm_keyvaultkey:
         key_name: MyKey
@@ -78,6 +115,40 @@ state:
           description: key resource path.
           type: str
           example: https://contoso.vault.azure.net/keys/hello/e924f053839f4431b35bc54393f98423
+keys:
+    description: Result for each key of I(keys).
+    returned: when I(keys) is set
+    type: complex
+    contains:
+        name:
+            description: Name of the key.
+            returned: always
+            type: str
+            example: MyKey
+        keyvault_uri:
+            description: URI of the keyvault endpoint of the key.
+            returned: always
+            type: str
+            example: https://contoso.vault.azure.net/
+        action:
+            description: Change made to the key.
+            returned: always
+            type: str
+            example: created
+            choices:
+                - created
+                - rotated
+                - deleted
+                - unchanged
+        key_id:
+            description: Key resource path.
+            returned: when changed
+            type: str
+            example: https://contoso.vault.azure.net/keys/MyKey/e924f053839f4431b35bc54393f98423
+        msg:
+            description: Error message when the change failed.
+            returned: on failure
+            type: str
 '''
 
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
@@ -87,7 +158,6 @@ try:
     import codecs
     from azure.keyvault import KeyVaultClient, KeyVaultId, KeyVaultAuthentication
     from azure.keyvault.models import KeyAttributes, JsonWebKey
-    from azure.common.credentials import ServicePrincipalCredentials
     from azure.keyvault.models.key_vault_error import KeyVaultErrorException
     from OpenSSL import crypto
 except ImportError:
@@ -101,12 +171,18 @@ class AzureRMKeyVaultKey(AzureRMModuleBase):
     def __init__(self):
 
         self.module_arg_spec = dict(
-            key_name=dict(type='str', required=True),
-            keyvault_uri=dict(type='str', required=True),
+            key_name=dict(type='str'),
+            keyvault_uri=dict(type='str'),
             pem_file=dict(type='str'),
             pem_password=dict(type='str'),
             byok_file=dict(type='str'),
-            state=dict(type='str', default='present', choices=['present', 'absent'])
+            state=dict(type='str', default='present', choices=['present', 'absent']),
+            rotate=dict(type='bool', default=False),
+            keys=dict(type='list', elements='dict', options=dict(
+                name=dict(type='str', required=True),
+                keyvault_uri=dict(type='str')
+            )),
+            max_concurrency=dict(type='int', default=10)
         )
 
         self.results = dict(
@@ -121,6 +197,9 @@ class AzureRMKeyVaultKey(AzureRMModuleBase):
         self.state = None
         self.client = None
         self.tags = None
+        self.rotate = None
+        self.keys = None
+        self.max_concurrency = None
 
         required_if = [
             ('pem_password', 'present', ['pem_file'])
@@ -129,6 +208,8 @@ class AzureRMKeyVaultKey(AzureRMModuleBase):
         super(AzureRMKeyVaultKey, self).__init__(self.module_arg_spec,
                                                  supports_check_mode=True,
                                                  required_if=required_if,
+                                                 mutually_exclusive=[['key_name', 'keys']],
+                                                 required_one_of=[['key_name', 'keys']],
                                                  supports_tags=True)
 
     def exec_module(self, **kwargs):
@@ -136,25 +217,14 @@ class AzureRMKeyVaultKey(AzureRMModuleBase):
         for key in list(self.module_arg_spec.keys()) + ['tags']:
             setattr(self, key, kwargs[key])
 
-        # Create KeyVaultClient
-        def auth_callback(server, resource, scope):
-            if self.credentials['client_id'] is None or self.credentials['secret'] is None:
-                self.fail('Please specify client_id, secret and tenant to access azure Key Vault.')
+        # Create KeyVaultClient, with an auth_callback caching its token
+        self.client = KeyVaultClient(KeyVaultAuthentication(self.get_keyvault_auth_callback()))
 
-            tenant = self.credentials.get('tenant')
-            if not self.credentials['tenant']:
-                tenant = "common"
+        if self.keys is not None:
+            return self.exec_keys()
 
-            authcredential = ServicePrincipalCredentials(
-                client_id=self.credentials['client_id'],
-                secret=self.credentials['secret'],
-                tenant=tenant,
-                resource="https://vault.azure.net")
-
-            token = authcredential.token
-            return token['token_type'], token['access_token']
-
-        self.client = KeyVaultClient(KeyVaultAuthentication(auth_callback))
+        if not self.keyvault_uri:
+            self.fail("Parameter error: keyvault_uri required with key_name.")
 
         results = dict()
         changed = False
@@ -162,8 +232,8 @@ class AzureRMKeyVaultKey(AzureRMModuleBase):
         try:
             results['key_id'] = self.get_key(self.key_name)
 
-            # Key exists and will be deleted
-            if self.state == 'absent':
+            # Key exists and will be deleted, or rotated
+            if self.state == 'absent' or self.rotate:
                 changed = True
 
         except KeyVaultErrorException:
@@ -194,6 +264,63 @@ class AzureRMKeyVaultKey(AzureRMModuleBase):
 
         return self.results
 
+    def exec_keys(self):
+        '''
+        Create, rotate or delete the keys in keys, listing the keys of each vault once.
+
+        :return: module results with one item per key
+        '''
+        items = []
+        for key in self.keys:
+            keyvault_uri = key['keyvault_uri'] or self.keyvault_uri
+            if not keyvault_uri:
+                self.fail("Parameter error: keyvault_uri required for key {0}.".format(key['name']))
+            items.append(dict(name=key['name'], keyvault_uri=keyvault_uri, action='unchanged'))
+
+        def get_lister(keyvault_uri):
+            def list_keys():
+                return set(KeyVaultId.parse_key_id(item.kid).name.lower() for item in self.client.get_keys(keyvault_uri))
+            return list_keys
+
+        vaults = set(item['keyvault_uri'] for item in items)
+        existing, errors = self.run_in_parallel(dict((keyvault_uri, get_lister(keyvault_uri)) for keyvault_uri in vaults),
+                                                max_workers=self.max_concurrency)
+        if errors:
+            self.fail("Error listing the keys of {0}".format('; '.join('{0} - {1}'.format(uri, errors[uri]) for uri in sorted(errors))))
+
+        tasks = dict()
+        for index, item in enumerate(items):
+            exists = item['name'].lower() in existing[item['keyvault_uri']]
+            if self.state == 'absent':
+                if exists:
+                    item['action'] = 'deleted'
+                    tasks[index] = self.get_key_operation(item)
+            elif not exists or self.rotate:
+                item['action'] = 'rotated' if exists else 'created'
+                tasks[index] = self.get_key_operation(item)
+
+        self.results['keys'] = items
+        self.results['changed'] = bool(tasks)
+        if self.check_mode or not tasks:
+            return self.results
+
+        key_ids, errors = self.run_in_parallel(tasks, max_workers=self.max_concurrency)
+        for index in tasks:
+            if index in errors:
+                items[index]['msg'] = errors[index]
+            else:
+                items[index]['key_id'] = key_ids[index]
+        if errors:
+            self.fail("Error changing keys {0}".format(', '.join(sorted(items[index]['name'] for index in errors))), **self.results)
+        return self.results
+
+    def get_key_operation(self, item):
+        def run():
+            if self.state == 'absent':
+                return self.delete_key(item['name'], keyvault_uri=item['keyvault_uri'])
+            return self.create_key(item['name'], self.tags, keyvault_uri=item['keyvault_uri'])
+        return run
+
     def get_key(self, name, version=''):
         ''' Gets an existing key '''
         key_bundle = self.client.get_key(self.keyvault_uri, name, version)
@@ -201,15 +328,15 @@ class AzureRMKeyVaultKey(AzureRMModuleBase):
             key_id = KeyVaultId.parse_key_id(key_bundle.key.kid)
         return key_id.id
 
-    def create_key(self, name, tags, kty='RSA'):
+    def create_key(self, name, tags, kty='RSA', keyvault_uri=None):
         ''' Creates a key '''
-        key_bundle = self.client.create_key(vault_base_url=self.keyvault_uri, key_name=name, kty=kty, tags=tags)
+        key_bundle = self.client.create_key(vault_base_url=keyvault_uri or self.keyvault_uri, key_name=name, kty=kty, tags=tags)
         key_id = KeyVaultId.parse_key_id(key_bundle.key.kid)
         return key_id.id
 
-    def delete_key(self, name):
+    def delete_key(self, name, keyvault_uri=None):
         ''' Deletes a key '''
-        deleted_key = self.client.delete_key(self.keyvault_uri, name)
+        deleted_key = self.client.delete_key(keyvault_uri or self.keyvault_uri, name)
         key_id = KeyVaultId.parse_key_id(deleted_key.key.kid)
         return key_id.id
 
@@ -27,10 +27,26 @@ options:
     secret_name:
         description:
             - Name of the keyvault secret.
-        required: true
+            - Mutually exclusive with I(secrets), one of them is required.
     secret_value:
         description:
             - Secret to be secured by keyvault.
+            - Required with I(secret_name) when I(state=present).
+    secrets:
+        description:
+            - Dictionary of secret names to secret values, to create, update or delete many secrets in a single task.
+            - The secrets of the vault are listed once. Only the existing secrets have their value read, and only the
+              missing secrets and the secrets with a different value or tags are set, at most I(max_concurrency)
+              at a time.
+            - With I(state=absent), the values are ignored and the listed secrets are deleted.
+        type: dict
+        version_added: "2.8"
+    max_concurrency:
+        description:
+            - Maximum number of secrets read or set at the same time when I(secrets) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
     state:
         description:
             - Assert the state of the subnet. Use 'present' to create or update a secret and
@@ -59,6 +75,13 @@ EXAMPLES = '''
             testing: testing
             delete: never
 
+    - name: Seed a vault with secrets
+      azure_rm_keyvaultsecret:
+        keyvault_uri: https://contoso.vault.azure.net/
+        secrets:
+          DbPassword: "{{ db_password }}"
+          ApiKey: "{{ api_key }}"
+
     - name: Delete a secret
       azure_rm_keyvaultsecret:
         secret_name: MySecret
@@ -76,13 +99,42 @@ state:
           description: Secret resource path.
           type: str
           example: https://contoso.vault.azure.net/secrets/hello/e924f053839f4431b35bc54393f98423
+secrets:
+    description: Result for each secret of I(secrets). Secret values are never returned.
+    returned: when I(secrets) is set
+    type: complex
+    contains:
+        name:
+            description: Name of the secret.
+            returned: always
+            type: str
+            example: DbPassword
+        action:
+            description: Change made to the secret.
+            returned: always
+            type: str
+            example: updated
+            choices:
+                - created
+                - updated
+                - deleted
+                - unchanged
+        secret_id:
+            description: Secret resource path.
+            returned: when the secret exists
+            type: str
+            example: https://contoso.vault.azure.net/secrets/DbPassword/e924f053839f4431b35bc54393f98423
+        msg:
+            description: Error message when the change failed.
+            returned: on failure
+            type: str
 '''
 
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
+from ansible.module_utils._text import to_text
 
 try:
     from azure.keyvault import KeyVaultClient, KeyVaultAuthentication, KeyVaultId
-    from azure.common.credentials import ServicePrincipalCredentials
     from azure.keyvault.models.key_vault_error import KeyVaultErrorException
 except ImportError:
     # This is handled in azure_rm_common
@@ -95,16 +147,14 @@ class AzureRMKeyVaultSecret(AzureRMModuleBase):
     def __init__(self):
 
         self.module_arg_spec = dict(
-            secret_name=dict(type='str', required=True),
+            secret_name=dict(type='str'),
             secret_value=dict(type='str', no_log=True),
             keyvault_uri=dict(type='str', required=True),
-            state=dict(type='str', default='present', choices=['present', 'absent'])
+            state=dict(type='str', default='present', choices=['present', 'absent']),
+            secrets=dict(type='dict', no_log=True),
+            max_concurrency=dict(type='int', default=10)
         )
 
-        required_if = [
-            ('state', 'present', ['secret_value'])
-        ]
-
         self.results = dict(
             changed=False,
             state=dict()
@@ -117,10 +167,13 @@ class AzureRMKeyVaultSecret(AzureRMModuleBase):
         self.data_creds = None
         self.client = None
         self.tags = None
+        self.secrets = None
+        self.max_concurrency = None
 
         super(AzureRMKeyVaultSecret, self).__init__(self.module_arg_spec,
                                                     supports_check_mode=True,
-                                                    required_if=required_if,
+                                                    mutually_exclusive=[['secret_name', 'secrets']],
+                                                    required_one_of=[['secret_name', 'secrets']],
                                                     supports_tags=True)
 
     def exec_module(self, **kwargs):
@@ -128,25 +181,14 @@ class AzureRMKeyVaultSecret(AzureRMModuleBase):
         for key in list(self.module_arg_spec.keys()) + ['tags']:
             setattr(self, key, kwargs[key])
 
-        # Create KeyVault Client using KeyVault auth class and auth_callback
-        def auth_callback(server, resource, scope):
-            if self.credentials['client_id'] is None or self.credentials['secret'] is None:
-                self.fail('Please specify client_id, secret and tenant to access azure Key Vault.')
-
-            tenant = self.credentials.get('tenant')
-            if not self.credentials['tenant']:
-                tenant = "common"
+        # Create KeyVault Client using KeyVault auth class and an auth_callback caching its token
+        self.client = KeyVaultClient(KeyVaultAuthentication(self.get_keyvault_auth_callback()))
 
-            authcredential = ServicePrincipalCredentials(
-                client_id=self.credentials['client_id'],
-                secret=self.credentials['secret'],
-                tenant=tenant,
-                resource="https://vault.azure.net")
+        if self.secrets is not None:
+            return self.exec_secrets()
 
-            token = authcredential.token
-            return token['token_type'], token['access_token']
-
-        self.client = KeyVaultClient(KeyVaultAuthentication(auth_callback))
+        if self.state == 'present' and self.secret_value is None:
+            self.fail("Parameter error: secret_value required to create secret {0}.".format(self.secret_name))
 
         results = dict()
         changed = False
@@ -185,6 +227,74 @@ class AzureRMKeyVaultSecret(AzureRMModuleBase):
 
         return self.results
 
+    def exec_secrets(self):
+        '''
+        Reconcile the secrets in secrets, listing the secrets of the vault once.
+
+        :return: module results with one item per secret
+        '''
+        try:
+            existing = dict((KeyVaultId.parse_secret_id(item.id).name.lower(), item)
+                            for item in self.client.get_secrets(self.keyvault_uri))
+        except KeyVaultErrorException as exc:
+            self.fail("Error listing the secrets of {0} - {1}".format(self.keyvault_uri, str(exc)))
+
+        names = sorted(self.secrets)
+        items = dict((name, dict(name=name, action='unchanged')) for name in names)
+        new_tags = dict()
+        self.results['secrets'] = [items[name] for name in names]
+
+        if self.state == 'absent':
+            pending = [name for name in names if name.lower() in existing]
+            for name in pending:
+                items[name]['action'] = 'deleted'
+        else:
+            for name in names:
+                if self.secrets[name] is None:
+                    self.fail("Parameter error: missing value of secret {0}.".format(name))
+                if name.lower() not in existing:
+                    items[name]['action'] = 'created'
+
+            # only the value of existing secrets needs to be read, to compare it
+            def get_reader(name):
+                def read():
+                    return self.client.get_secret(self.keyvault_uri, name, '')
+                return read
+
+            bundles, errors = self.run_in_parallel(dict((name, get_reader(name)) for name in names if name.lower() in existing),
+                                                   max_workers=self.max_concurrency)
+            if errors:
+                self.fail("Error getting secrets {0}".format(', '.join(sorted(errors))))
+            for name, bundle in bundles.items():
+                items[name]['secret_id'] = KeyVaultId.parse_secret_id(bundle.id).id
+                update_tags, tags = self.update_tags(bundle.tags)
+                if bundle.value != to_text(self.secrets[name]) or update_tags:
+                    items[name]['action'] = 'updated'
+                    new_tags[name] = tags
+            pending = [name for name in names if items[name]['action'] != 'unchanged']
+
+        self.results['changed'] = bool(pending)
+        if self.check_mode or not pending:
+            return self.results
+
+        def get_operation(name):
+            def change():
+                if self.state == 'absent':
+                    return self.delete_secret(name)
+                return self.create_secret(name, to_text(self.secrets[name]), new_tags.get(name, self.tags))
+            return change
+
+        secret_ids, errors = self.run_in_parallel(dict((name, get_operation(name)) for name in pending),
+                                                  max_workers=self.max_concurrency)
+        for name in pending:
+            if name in errors:
+                items[name]['msg'] = errors[name]
+            else:
+                items[name]['secret_id'] = secret_ids[name]
+        if errors:
+            self.fail("Error setting secrets {0}".format(', '.join(sorted(errors))), **self.results)
+        return self.results
+
     def get_secret(self, name, version=''):
         ''' Gets an existing secret '''
         secret_bundle = self.client.get_secret(self.keyvault_uri, name, version)
@@ -204,6 +204,43 @@ options:
                 description:
                     - Configures SNAT for the VMs in the backend pool to use the publicIP address specified in the frontend of the load balancing rule.
         version_added: 2.5
+    inbound_nat_rules:
+        description:
+            - List of inbound NAT rules, typically one per virtual machine to reach it over SSH or RDP.
+            - When set, the list is authoritative and rules not listed are removed. When not set, existing inbound NAT rules are kept.
+            - If nothing else of the load balancer changed, only the added, changed or removed rules are sent, each through the
+              inbound NAT rule API, instead of the whole load balancer.
+            - Associate a rule to a virtual machine from its network interface, see M(azure_rm_networkinterface).
+        suboptions:
+            name:
+                description: Name of the inbound NAT rule.
+                required: True
+            frontend_ip_configuration:
+                description: Name of the frontend IP configuration receiving the traffic.
+                required: True
+            protocol:
+                description: IP protocol for the inbound NAT rule.
+                choices:
+                    - Tcp
+                    - Udp
+                    - All
+                default: Tcp
+            frontend_port:
+                description:
+                    - The port for the external endpoint, unique within the load balancer.
+                required: True
+            backend_port:
+                description:
+                    - The port used for the internal endpoint.
+                required: True
+            idle_timeout:
+                description:
+                    - The timeout for the TCP idle connection, in minutes.
+                default: 4
+            enable_floating_ip:
+                description:
+                    - Enable floating IP, required to configure a SQL AlwaysOn Availability Group.
+        version_added: "2.8"
     public_ip_address_name:
         description:
             - (deprecated) Name of an existing public IP address object to associate with the security group.
@@ -317,6 +354,25 @@ EXAMPLES = '''
         frontend_port: 80
         backend_port: 80
         probe: prob0
+
+- name: add SSH access to two virtual machines behind a load balancer
+  azure_rm_loadbalancer:
+    resource_group: testrg
+    name: testloadbalancer1
+    frontend_ip_configurations:
+      - name: frontendipconf0
+        public_ip_address: testpip
+    backend_address_pools:
+      - name: backendaddrpool0
+    inbound_nat_rules:
+      - name: ssh-vm0
+        frontend_ip_configuration: frontendipconf0
+        frontend_port: 50000
+        backend_port: 22
+      - name: ssh-vm1
+        frontend_ip_configuration: frontendipconf0
+        frontend_port: 50001
+        backend_port: 22
 '''
 
 RETURN = '''
@@ -471,6 +527,38 @@ load_balancing_rule_spec = dict(
 )
 
 
+inbound_nat_rule_spec = dict(
+    name=dict(
+        type='str',
+        required=True
+    ),
+    frontend_ip_configuration=dict(
+        type='str',
+        required=True
+    ),
+    protocol=dict(
+        type='str',
+        choices=['Tcp', 'Udp', 'All'],
+        default='Tcp'
+    ),
+    frontend_port=dict(
+        type='int',
+        required=True
+    ),
+    backend_port=dict(
+        type='int',
+        required=True
+    ),
+    idle_timeout=dict(
+        type='int',
+        default=4
+    ),
+    enable_floating_ip=dict(
+        type='bool'
+    )
+)
+
+
 class AzureRMLoadBalancer(AzureRMModuleBase):
     """Configuration class for an Azure RM load balancer resource"""
 
@@ -521,6 +609,11 @@ class AzureRMLoadBalancer(AzureRMModuleBase):
                 elements='dict',
                 options=load_balancing_rule_spec
             ),
+            inbound_nat_rules=dict(
+                type='list',
+                elements='dict',
+                options=inbound_nat_rule_spec
+            ),
             public_ip_address_name=dict(
                 type='str',
                 aliases=['public_ip_address', 'public_ip_name', 'public_ip']
@@ -584,6 +677,7 @@ class AzureRMLoadBalancer(AzureRMModuleBase):
         self.probes = None
         self.inbound_nat_pools = None
         self.load_balancing_rules = None
+        self.inbound_nat_rules = None
         self.public_ip_address_name = None
         self.state = None
         self.probe_port = None
@@ -615,6 +709,7 @@ class AzureRMLoadBalancer(AzureRMModuleBase):
             setattr(self, key, kwargs[key])
 
         changed = False
+        nat_rule_changes = None
 
         resource_group = self.get_resource_group(self.resource_group)
         if not self.location:
@@ -759,6 +854,33 @@ class AzureRMLoadBalancer(AzureRMModuleBase):
                     changed = False
             else:
                 changed = True
+
+            # inbound NAT rules are compared on their own, so that changing only them does not need a full update
+            if self.inbound_nat_rules is not None:
+                inbound_nat_rules_param = [self.network_models.InboundNatRule(
+                    name=item.get('name'),
+                    frontend_ip_configuration=self.network_models.SubResource(
+                        id=frontend_ip_configuration_id(
+                            self.subscription_id,
+                            self.resource_group,
+                            self.name,
+                            item.get('frontend_ip_configuration')
+                        )
+                    ),
+                    protocol=item.get('protocol'),
+                    frontend_port=item.get('frontend_port'),
+                    backend_port=item.get('backend_port'),
+                    idle_timeout_in_minutes=item.get('idle_timeout'),
+                    enable_floating_ip=item.get('enable_floating_ip')
+                ) for item in self.inbound_nat_rules]
+                nat_rule_changes = compare_children(inbound_nat_rules_param, load_balancer.get('inbound_nat_rules') if load_balancer else None)
+            elif load_balancer:
+                # keep the existing rules, a full update without them would remove them
+                inbound_nat_rules_param = [self.network_models.InboundNatRule.from_dict(item)
+                                           for item in load_balancer.get('inbound_nat_rules', [])]
+            else:
+                inbound_nat_rules_param = None
+            self.new_load_balancer.inbound_nat_rules = inbound_nat_rules_param or None
         elif self.state == 'absent' and load_balancer:
             changed = True
 
@@ -770,16 +892,36 @@ class AzureRMLoadBalancer(AzureRMModuleBase):
         else:
             if self.tags:
                 changed = True
-        self.results['changed'] = changed
+        self.results['changed'] = changed or bool(nat_rule_changes and (nat_rule_changes['update'] or nat_rule_changes['delete']))
+
+        if self.check_mode:
+            return self.results
 
         if self.state == 'present' and changed:
             self.results['state'] = self.create_or_update_load_balancer(self.new_load_balancer)
+        elif self.state == 'present' and self.results['changed']:
+            self.update_inbound_nat_rules(nat_rule_changes)
+            self.results['state'] = self.get_load_balancer()
         elif self.state == 'absent' and changed:
             self.delete_load_balancer()
             self.results['state'] = None
 
         return self.results
 
+    def update_inbound_nat_rules(self, changes):
+        """Apply inbound NAT rule changes one rule at a time, since the load balancer accepts a single update at once"""
+        try:
+            for name in changes['delete']:
+                self.log('Deleting inbound NAT rule {0}'.format(name))
+                poller = self.network_client.inbound_nat_rules.delete(self.resource_group, self.name, name)
+                self.get_poller_result(poller)
+            for rule in changes['update']:
+                self.log('Creating or updating inbound NAT rule {0}'.format(rule.name))
+                poller = self.network_client.inbound_nat_rules.create_or_update(self.resource_group, self.name, rule.name, rule)
+                self.get_poller_result(poller)
+        except CloudError as exc:
+            self.fail("Error updating inbound NAT rules of load balancer {0} - {1}".format(self.name, str(exc)))
+
     def get_public_ip_address_instance(self, id):
         """Get a reference to the public ip address resource"""
         self.log('Fetching public ip address {}'.format(id))
@@ -823,17 +965,24 @@ def default_compare(new, old, path):
     elif isinstance(new, list):
         if not isinstance(old, list) or len(new) != len(old):
             return False
+        if not new:
+            return True
         if isinstance(old[0], dict):
             key = None
             if 'id' in old[0] and 'id' in new[0]:
                 key = 'id'
             elif 'name' in old[0] and 'name' in new[0]:
                 key = 'name'
-            new = sorted(new, key=lambda x: x.get(key, None))
-            old = sorted(old, key=lambda x: x.get(key, None))
-        else:
-            new = sorted(new)
-            old = sorted(old)
+            if key is None:
+                return all(default_compare(new[i], old[i], path + '/*') for i in range(len(new)))
+            # match children by key through an index rather than sorting both lists
+            old_index = dict((x.get(key, None), x) for x in old)
+            for item in new:
+                if not default_compare(item, old_index.get(item.get(key, None)), path + '/*'):
+                    return False
+            return True
+        new = sorted(new)
+        old = sorted(old)
         for i in range(len(new)):
             if not default_compare(new[i], old[i], path + '/*'):
                 return False
@@ -842,6 +991,22 @@ def default_compare(new, old, path):
         return new == old
 
 
+def compare_children(new, old):
+    """
+    Diff child resources by name.
+
+    :param new: list of requested child models
+    :param old: list of existing child dicts
+    :return: dict with the models to create or update in 'update', and the names to remove in 'delete'
+    """
+    old_index = dict((item['name'], item) for item in old or [])
+    new_names = set(item.name for item in new)
+    return dict(
+        update=[item for item in new if not default_compare(item.as_dict(), old_index.get(item.name), '')],
+        delete=[name for name in old_index if name not in new_names]
+    )
+
+
 def frontend_ip_configuration_id(subscription_id, resource_group_name, load_balancer_name, name):
     """Generate the id for a frontend ip configuration"""
     return '/subscriptions/{}/resourceGroups/{}/providers/Microsoft.Network/loadBalancers/{}/frontendIPConfigurations/{}'.format(
@@ -79,6 +79,39 @@ options:
     tags:
         description:
             - Tags to assign to the managed disk.
+    disks:
+        description:
+            - Manage several managed disks in one task. I(name) is then only used to name the task, and the other
+              options apply to every disk unless overridden in the disk entry.
+            - The disks are created, updated or deleted concurrently, at most I(max_concurrency) at a time.
+            - All the disks are attached to I(managed_by), or detached from their virtual machine, with a single update
+              of each virtual machine involved.
+        type: list
+        version_added: "2.8"
+        suboptions:
+            name:
+                description:
+                    - Name of the managed disk.
+                required: true
+            disk_size_gb:
+                description:
+                    - Size in GB of the managed disk.
+            storage_account_type:
+                description:
+                    - Type of storage for the managed disk.
+                choices:
+                    - Standard_LRS
+                    - Premium_LRS
+            lun:
+                description:
+                    - Logical unit number of the disk when attached to I(managed_by).
+                    - Defaults to the lowest free logical unit numbers, assigned in the order of I(disks).
+    max_concurrency:
+        description:
+            - Maximum number of disks created, updated or deleted at the same time when I(disks) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -110,6 +143,21 @@ EXAMPLES = '''
         resource_group: Testing
         disk_size_gb: 4
 
+    - name: Create four data disks and attach them to a VM in one update
+      azure_rm_managed_disk:
+        name: data disks of testvm001
+        resource_group: Testing
+        disk_size_gb: 128
+        storage_account_type: Premium_LRS
+        managed_by: testvm001
+        disks:
+          - name: testvm001-data0
+          - name: testvm001-data1
+          - name: testvm001-data2
+          - name: testvm001-log
+            disk_size_gb: 64
+            lun: 8
+
     - name: Delete managed disk
       azure_rm_manage_disk:
         name: mymanageddisk
@@ -131,9 +179,46 @@ changed:
     description: Whether or not the resource has changed
     returned: always
     type: bool
+disks:
+    description: Result for each disk of I(disks).
+    returned: when I(disks) is set
+    type: complex
+    contains:
+        name:
+            description:
+                - Name of the managed disk.
+            type: str
+            sample: testvm001-data0
+        changed:
+            description:
+                - Whether the disk was created, updated, deleted, attached or detached.
+            type: bool
+            sample: true
+        state:
+            description:
+                - Current state of the managed disk.
+            type: dict
+        lun:
+            description:
+                - Logical unit number of the disk on I(managed_by).
+            returned: when attached
+            type: int
+            sample: 0
+        msg:
+            description:
+                - Error message when creating, updating or deleting the disk failed.
+            returned: on failure
+            type: str
+duration:
+    description: Time in seconds taken to process all the disks of I(disks).
+    returned: when I(disks) is set
+    type: float
+    sample: 84.5
 '''
 
+import copy
 import re
+import time
 
 
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
@@ -207,6 +292,13 @@ class AzureRMManagedDisk(AzureRMModuleBase):
             ),
             managed_by=dict(
                 type='str'
+            ),
+            disks=dict(
+                type='list'
+            ),
+            max_concurrency=dict(
+                type='int',
+                default=10
             )
         )
         required_if = [
@@ -229,6 +321,8 @@ class AzureRMManagedDisk(AzureRMModuleBase):
         self.disk_size_gb = None
         self.tags = None
         self.managed_by = None
+        self.disks = None
+        self.max_concurrency = None
         super(AzureRMManagedDisk, self).__init__(
             derived_arg_spec=self.module_arg_spec,
             required_if=required_if,
@@ -247,6 +341,9 @@ class AzureRMManagedDisk(AzureRMModuleBase):
         if not self.location:
             self.location = resource_group.location
 
+        if self.disks:
+            return self.exec_disks()
+
         disk_instance = self.get_managed_disk()
         result = disk_instance
 
@@ -302,16 +399,192 @@ class AzureRMManagedDisk(AzureRMModuleBase):
         vm.storage_profile.data_disks = leftovers
         self._update_vm(vm_name, vm)
 
-    def _update_vm(self, name, params):
+    def exec_disks(self):
+        '''
+        Reconcile every disk of self.disks concurrently, then attach or detach all of them with one update
+        per virtual machine.
+
+        :return: module results with one item per disk in disks
+        '''
+        for disk in self.disks:
+            if not isinstance(disk, dict) or not disk.get('name'):
+                self.fail("Parameter error: expecting disks to be a list of dicts, each with a name.")
+
+        # create the client once, before copies of this module share it between threads
+        self.compute_client
+
+        members = dict()
+        for disk in self.disks:
+            member = copy.copy(self)
+            member.name = disk['name']
+            member.disk_size_gb = disk.get('disk_size_gb', self.disk_size_gb)
+            member.storage_account_type = disk.get('storage_account_type', self.storage_account_type)
+            members[disk['name']] = member
+
+        start = time.time()
+        durations = dict()
+
+        def timed(name, task):
+            def run():
+                task_start = time.time()
+                try:
+                    return task()
+                finally:
+                    durations[name] = round(time.time() - task_start, 2) + durations.get(name, 0)
+            return run
+
+        found, errors = self.run_in_parallel(dict((name, member.get_managed_disk) for name, member in members.items()),
+                                             max_workers=self.max_concurrency)
+        if errors:
+            self.fail("Error getting managed disks - {0}".format('; '.join(errors[name] for name in sorted(errors))))
+
+        items = [dict(name=disk['name'], changed=False, state=found.get(disk['name'])) for disk in self.disks]
+
+        if self.state == 'present':
+            updates = dict()
+            for item in items:
+                member = members[item['name']]
+                parameter = member.generate_managed_disk_property()
+                if not item['state'] or member.is_different(item['state'], parameter):
+                    item['changed'] = True
+                    updates[item['name']] = timed(item['name'], lambda member=member, parameter=parameter:
+                                                  member.create_or_update_managed_disk(parameter))
+            if not self.check_mode:
+                results, errors = self.run_in_parallel(updates, max_workers=self.max_concurrency)
+                for item in items:
+                    if item['name'] in results:
+                        item['state'] = results[item['name']]
+                    elif item['name'] in errors:
+                        item['msg'] = errors[item['name']]
+                if errors:
+                    self.fail_disks(items, start, "Error creating or updating managed disks")
+
+        self.update_disk_attachments([item for item in items if item['state']])
+
+        if self.state == 'absent':
+            deletes = dict()
+            for item in items:
+                if item['state']:
+                    item['changed'] = True
+                    deletes[item['name']] = timed(item['name'], members[item['name']].delete_managed_disk)
+            if not self.check_mode:
+                results, errors = self.run_in_parallel(deletes, max_workers=self.max_concurrency)
+                for item in items:
+                    if item['name'] in errors:
+                        item['msg'] = errors[item['name']]
+                    elif item['name'] in deletes:
+                        item['state'] = None
+                if errors:
+                    self.fail_disks(items, start, "Error deleting managed disks")
+
+        for item in items:
+            if item['name'] in durations:
+                item['duration'] = durations[item['name']]
+
+        self.results['changed'] = any(item['changed'] for item in items)
+        self.results['disks'] = items
+        self.results['duration'] = round(time.time() - start, 2)
+        return self.results
+
+    def fail_disks(self, items, start, msg):
+        self.results['changed'] = any(item['changed'] for item in items)
+        self.results['disks'] = items
+        self.results['duration'] = round(time.time() - start, 2)
+        self.fail("{0} {1}".format(msg, ', '.join(item['name'] for item in items if item.get('msg'))), **self.results)
+
+    def update_disk_attachments(self, items):
+        '''
+        Detach the disks from the virtual machines they should leave, then attach the missing ones to
+        self.managed_by, with a single update of each virtual machine.
+
+        :param items: disk results, with the current disk dict as state
+        '''
+        target = self.managed_by if self.state == 'present' else None
+        detaches = dict()
+        attaches = []
+        for item in items:
+            vm_id = item['state'].get('managed_by')
+            vm_dict = parse_resource_id(vm_id) if vm_id else dict()
+            if vm_dict.get('name') == target and (not target or vm_dict.get('resource_group', '').lower() == self.resource_group.lower()):
+                continue
+            item['changed'] = True
+            if vm_id:
+                detaches.setdefault((vm_dict['resource_group'], vm_dict['name']), []).append(item)
+            if target:
+                attaches.append(item)
+
+        if self.check_mode:
+            return
+
+        # the virtual machines losing disks are independent from each other
+        updates = dict((key, self.get_vm_disks_updater(key[0], key[1], detach=detached)) for key, detached in detaches.items())
+        results, errors = self.run_in_parallel(updates, max_workers=self.max_concurrency)
+        if errors:
+            self.fail("Error detaching managed disks - {0}".format('; '.join(errors.values())))
+
+        if attaches:
+            self.get_vm_disks_updater(self.resource_group, target, attach=attaches)()
+
+        for item in items:
+            if item['changed']:
+                item['state']['managed_by'] = self._get_vm_id(self.resource_group, target) if target else None
+
+    def get_vm_disks_updater(self, resource_group, vm_name, attach=None, detach=None):
+        '''
+        Build a task updating the data disks of a virtual machine with a single request.
+
+        Disks to attach keep the lun of their entry in self.disks, or get the lowest free luns in order.
+
+        :param attach: disk results to attach
+        :param detach: disk results to detach
+        '''
+        def update_vm_disks():
+            vm = self._get_vm(vm_name, resource_group)
+            data_disks = vm.storage_profile.data_disks or []
+            if detach:
+                names = set(item['name'].lower() for item in detach)
+                data_disks = [d for d in data_disks if d.name.lower() not in names]
+            if attach:
+                requested_luns = dict((disk['name'], disk['lun']) for disk in self.disks if disk.get('lun') is not None)
+                used_luns = set(d.lun for d in data_disks)
+                for item in attach:
+                    lun = requested_luns.get(item['name'])
+                    if lun is not None and lun in used_luns:
+                        self.fail("Error attaching managed disk {0} to virtual machine {1} - lun {2} is already in use".format(
+                            item['name'], vm_name, lun))
+                    if lun is not None:
+                        used_luns.add(lun)
+                lun = 0
+                for item in attach:
+                    if requested_luns.get(item['name']) is not None:
+                        item['lun'] = requested_luns[item['name']]
+                    else:
+                        while lun in used_luns:
+                            lun += 1
+                        item['lun'] = lun
+                        used_luns.add(lun)
+                    params = self.compute_models.ManagedDiskParameters(id=item['state'].get('id'),
+                                                                       storage_account_type=item['state'].get('storage_account_type'))
+                    data_disks.append(self.compute_models.DataDisk(item['lun'], self.compute_models.DiskCreateOptionTypes.attach,
+                                                                   managed_disk=params))
+            vm.storage_profile.data_disks = data_disks
+            self._update_vm(vm_name, vm, resource_group)
+        return update_vm_disks
+
+    def _get_vm_id(self, resource_group, name):
+        return '/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.Compute/virtualMachines/{2}'.format(
+            self.subscription_id, resource_group, name)
+
+    def _update_vm(self, name, params, resource_group=None):
         try:
-            poller = self.compute_client.virtual_machines.create_or_update(self.resource_group, name, params)
+            poller = self.compute_client.virtual_machines.create_or_update(resource_group or self.resource_group, name, params)
             self.get_poller_result(poller)
         except Exception as exc:
             self.fail("Error updating virtual machine {0} - {1}".format(name, str(exc)))
 
-    def _get_vm(self, name):
+    def _get_vm(self, name, resource_group=None):
         try:
-            return self.compute_client.virtual_machines.get(self.resource_group, name, expand='instanceview')
+            return self.compute_client.virtual_machines.get(resource_group or self.resource_group, name, expand='instanceview')
         except Exception as exc:
             self.fail("Error getting virtual machine {0} - {1}".format(name, str(exc)))
 
@@ -134,7 +134,8 @@ class AzureRMManagedDiskFacts(AzureRMModuleBase):
         super(AzureRMManagedDiskFacts, self).__init__(
             derived_arg_spec=self.module_arg_spec,
             supports_check_mode=True,
-            supports_tags=True)
+            supports_tags=True,
+            facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
@@ -33,16 +33,38 @@ options:
     name:
         description:
             - The name of the server configuration.
-        required: True
+            - Mutually exclusive with I(configurations), one of them is required.
     parameters:
         description:
             - The required parameters for updating a server configuration.
+    configurations:
+        description:
+            - Dictionary of server configuration names to values, to set many configurations in a single task.
+            - All the configurations of the server are read at once, and only those with a different value are
+              updated, concurrently.
+            - Values are compared case insensitively. With I(state=absent), the values are ignored and the listed
+              configurations are reset to their default value.
+        type: dict
+        version_added: "2.8"
     value:
         description:
             - Value of the configuration.
     source:
         description:
             - Source of the configuration.
+    state:
+        description:
+            - Assert the state of the Configuration. Use C(absent) to reset it to its default value.
+        default: present
+        choices:
+            - absent
+            - present
+    max_concurrency:
+        description:
+            - Maximum number of configurations updated at the same time when I(configurations) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -58,7 +80,16 @@ EXAMPLES = '''
       resource_group: TestGroup
       server_name: testserver
       name: event_scheduler
-      parameters: parameters
+      value: "ON"
+
+  - name: Set many Configurations at once
+    azure_rm_mysqlconfiguration:
+      resource_group: TestGroup
+      server_name: testserver
+      configurations:
+        slow_query_log: "ON"
+        long_query_time: "2"
+        max_connections: "500"
 '''
 
 RETURN = '''
@@ -69,15 +100,49 @@ id:
     type: str
     sample: "/subscriptions/ffffffff-ffff-ffff-ffff-ffffffffffff/resourceGroups/TestGroup/providers/Microsoft.DBforMySQL/servers/testserver/configurations/ev
             ent_scheduler"
+configurations:
+    description:
+        - Result for each configuration in I(configurations).
+    returned: when I(configurations) is set
+    type: complex
+    contains:
+        name:
+            description:
+                - Name of the configuration.
+            returned: always
+            type: str
+            sample: event_scheduler
+        value:
+            description:
+                - Requested value of the configuration.
+            returned: always
+            type: str
+            sample: "ON"
+        old_value:
+            description:
+                - Value of the configuration before the change.
+            returned: always
+            type: str
+            sample: "OFF"
+        changed:
+            description:
+                - Whether the configuration was updated.
+            returned: always
+            type: bool
+            sample: true
+        msg:
+            description:
+                - Error message when the update failed.
+            returned: on failure
+            type: str
 '''
 
-import time
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
+from ansible.module_utils._text import to_text
 
 try:
     from msrestazure.azure_exceptions import CloudError
     from msrest.polling import LROPoller
-    from azure.mgmt.rdbms.mysql import MySQLManagementClient
     from msrest.serialization import Model
 except ImportError:
     # This is handled in azure_rm_common
@@ -102,12 +167,14 @@ class AzureRMConfigurations(AzureRMModuleBase):
                 required=True
             ),
             name=dict(
-                type='str',
-                required=True
+                type='str'
             ),
             parameters=dict(
                 type='dict'
             ),
+            configurations=dict(
+                type='dict'
+            ),
             value=dict(
                 type='str'
             ),
@@ -118,6 +185,10 @@ class AzureRMConfigurations(AzureRMModuleBase):
                 type='str',
                 default='present',
                 choices=['present', 'absent']
+            ),
+            max_concurrency=dict(
+                type='int',
+                default=10
             )
         )
 
@@ -126,15 +197,18 @@ class AzureRMConfigurations(AzureRMModuleBase):
         self.name = None
         self.value = None
         self.source = None
+        self.configurations = None
+        self.max_concurrency = None
 
         self.results = dict(changed=False)
-        self.mgmt_client = None
         self.state = None
         self.to_do = Actions.NoAction
 
         super(AzureRMConfigurations, self).__init__(derived_arg_spec=self.module_arg_spec,
                                                     supports_check_mode=True,
-                                                    supports_tags=False)
+                                                    supports_tags=False,
+                                                    mutually_exclusive=[['name', 'configurations']],
+                                                    required_one_of=[['name', 'configurations']])
 
     def exec_module(self, **kwargs):
         """Main module execution method"""
@@ -143,12 +217,12 @@ class AzureRMConfigurations(AzureRMModuleBase):
             if hasattr(self, key):
                 setattr(self, key, kwargs[key])
 
+        if self.configurations is not None:
+            return self.exec_configurations()
+
         old_response = None
         response = None
 
-        self.mgmt_client = self.get_mgmt_svc_client(MySQLManagementClient,
-                                                    base_url=self._cloud_environment.endpoints.resource_manager)
-
         resource_group = self.get_resource_group(self.resource_group)
 
         old_response = self.get_configuration()
@@ -162,7 +236,8 @@ class AzureRMConfigurations(AzureRMModuleBase):
         else:
             self.log("Configuration instance already exists")
             if self.state == 'absent':
-                self.to_do = Actions.Delete
+                if old_response.get('value') != old_response.get('default_value'):
+                    self.to_do = Actions.Delete
             elif self.state == 'present':
                 self.log("Need to check if Configuration instance has to be deleted or may be updated")
                 self.to_do = Actions.Update
@@ -189,10 +264,6 @@ class AzureRMConfigurations(AzureRMModuleBase):
                 return self.results
 
             self.delete_configuration()
-            # make sure instance is actually deleted, for some Azure resources, instance is hanging around
-            # for some time after deletion -- this should be really fixed in Azure
-            while self.get_configuration():
-                time.sleep(20)
         else:
             self.log("Configuration instance unchanged")
             self.results['changed'] = False
@@ -203,6 +274,68 @@ class AzureRMConfigurations(AzureRMModuleBase):
 
         return self.results
 
+    def exec_configurations(self):
+        '''
+        Apply all the configurations in configurations from a single listing of the server configurations.
+
+        :return: module results with one item per configuration in configurations
+        '''
+        try:
+            existing = dict((configuration.name, configuration) for configuration in self.mysql_client.configurations.list_by_server(
+                resource_group_name=self.resource_group,
+                server_name=self.server_name))
+        except CloudError as exc:
+            self.fail("Error listing the configurations of server {0}: {1}".format(self.server_name, str(exc)))
+
+        items = []
+        for name in sorted(self.configurations):
+            old = existing.get(name)
+            if not old:
+                self.fail("Parameter error: configuration {0} not found on server {1}".format(name, self.server_name))
+            if self.state == 'absent':
+                value = old.default_value
+            else:
+                value = self.configurations[name]
+                if isinstance(value, bool):
+                    value = 'ON' if value else 'OFF'
+                value = to_text(value)
+            items.append(dict(name=name,
+                              value=value,
+                              old_value=old.value,
+                              changed=(value or '').lower() != (old.value or '').lower()))
+
+        pending = dict((item['name'], item) for item in items if item['changed'])
+        self.results['changed'] = bool(pending)
+        self.results['configurations'] = items
+        if self.check_mode or not pending:
+            return self.results
+
+        def get_operation(item):
+            def start():
+                if self.state == 'absent':
+                    return self.mysql_client.configurations.create_or_update(
+                        resource_group_name=self.resource_group,
+                        server_name=self.server_name,
+                        configuration_name=item['name'],
+                        source='system-default')
+                return self.mysql_client.configurations.create_or_update(
+                    resource_group_name=self.resource_group,
+                    server_name=self.server_name,
+                    configuration_name=item['name'],
+                    value=item['value'],
+                    source=self.source or 'user-override')
+            return start
+
+        responses, errors = self.run_operations_in_parallel(dict((name, get_operation(item)) for name, item in pending.items()),
+                                                            max_workers=self.max_concurrency)
+
+        for item in items:
+            if item['name'] in errors:
+                item['msg'] = errors[item['name']]
+        if errors:
+            self.fail("Error updating the configurations {0}".format(', '.join(sorted(errors))), **self.results)
+        return self.results
+
     def create_update_configuration(self):
         '''
         Creates or updates Configuration with the specified configuration.
@@ -212,11 +345,11 @@ class AzureRMConfigurations(AzureRMModuleBase):
         self.log("Creating / Updating the Configuration instance {0}".format(self.name))
 
         try:
-            response = self.mgmt_client.configurations.create_or_update(resource_group_name=self.resource_group,
-                                                                        server_name=self.server_name,
-                                                                        configuration_name=self.name,
-                                                                        value=self.value,
-                                                                        source=self.source)
+            response = self.mysql_client.configurations.create_or_update(resource_group_name=self.resource_group,
+                                                                         server_name=self.server_name,
+                                                                         configuration_name=self.name,
+                                                                         value=self.value,
+                                                                         source=self.source)
             if isinstance(response, LROPoller):
                 response = self.get_poller_result(response)
 
@@ -227,13 +360,18 @@ class AzureRMConfigurations(AzureRMModuleBase):
 
     def delete_configuration(self):
         '''
-        Deletes specified Configuration instance in the specified subscription and resource group.
+        Resets specified Configuration instance to its default value.
 
         :return: True
         '''
         self.log("Deleting the Configuration instance {0}".format(self.name))
         try:
-            response = self.mgmt_client.configurations.delete()
+            response = self.mysql_client.configurations.create_or_update(resource_group_name=self.resource_group,
+                                                                         server_name=self.server_name,
+                                                                         configuration_name=self.name,
+                                                                         source='system-default')
+            if isinstance(response, LROPoller):
+                self.get_poller_result(response)
         except CloudError as e:
             self.log('Error attempting to delete the Configuration instance.')
             self.fail("Error deleting the Configuration instance: {0}".format(str(e)))
@@ -249,9 +387,9 @@ class AzureRMConfigurations(AzureRMModuleBase):
         self.log("Checking if the Configuration instance {0} is present".format(self.name))
         found = False
         try:
-            response = self.mgmt_client.configurations.get(resource_group_name=self.resource_group,
-                                                           server_name=self.server_name,
-                                                           configuration_name=self.name)
+            response = self.mysql_client.configurations.get(resource_group_name=self.resource_group,
+                                                            server_name=self.server_name,
+                                                            configuration_name=self.name)
             found = True
             self.log("Response : {0}".format(response))
             self.log("Configuration instance : {0} found".format(response.name))
@@ -141,7 +141,7 @@ class AzureRMConfigurationsFacts(AzureRMModuleBase):
         self.resource_group = None
         self.server_name = None
         self.configuration_name = None
-        super(AzureRMConfigurationsFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMConfigurationsFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
@@ -46,6 +46,43 @@ options:
         description:
             - Region of the resource.
             - Derived from C(resource_group) if not specified
+    routes:
+        description:
+            - List of routes of the route table, to manage many routes in a single task.
+            - The routes embedded in the route table are compared by name, address prefix and next hop, and only
+              the changed routes are written, one at a time.
+            - When more than a few routes changed, or the route table itself is created or updated, all the routes
+              are sent with the route table in a single request instead.
+        type: list
+        version_added: "2.8"
+        suboptions:
+            name:
+                description:
+                    - Name of the route.
+                required: true
+            address_prefix:
+                description:
+                    - The destination CIDR to which the route applies.
+            next_hop_type:
+                description:
+                    - The type of Azure hop the packet should be sent to.
+                choices:
+                    - virtual_network_gateway
+                    - vnet_local
+                    - internet
+                    - virtual_appliance
+                    - none
+                default: 'none'
+            next_hop_ip_address:
+                description:
+                    - The IP address packets should be forwarded to.
+                    - Next hop values are only allowed in routes where the next hop type is VirtualAppliance.
+    purge_routes:
+        description:
+            - Delete the routes of the route table which are not in I(routes).
+        type: bool
+        default: False
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -65,6 +102,20 @@ EXAMPLES = '''
         tags:
           purpose: testing
 
+    - name: Sync the routes of a route table
+      azure_rm_routetable:
+        name: foobar
+        resource_group: Testing
+        routes:
+          - name: onprem
+            address_prefix: 10.10.0.0/16
+            next_hop_type: virtual_appliance
+            next_hop_ip_address: 10.1.0.4
+          - name: internet
+            address_prefix: 0.0.0.0/0
+            next_hop_type: internet
+        purge_routes: yes
+
     - name: Update the subnet (idempotent)
       azure_rm_subnet:
         name: subnet
@@ -88,6 +139,30 @@ id:
     description: resource id.
     returned: success
     type: str
+routes:
+    description: Result for each route of I(routes), followed by the purged routes.
+    returned: when I(routes) is set
+    type: complex
+    contains:
+        name:
+            description: Name of the route.
+            returned: always
+            type: str
+            sample: onprem
+        action:
+            description: Change made to the route.
+            returned: always
+            type: str
+            sample: updated
+            choices:
+                - created
+                - updated
+                - deleted
+                - unchanged
+        msg:
+            description: Error message when the change failed.
+            returned: on failure
+            type: str
 '''
 
 try:
@@ -97,6 +172,24 @@ except ImportError:
     pass
 
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase, normalize_location_name
+from ansible.module_utils.common.dict_transformations import _snake_to_camel
+
+
+# beyond this many changed routes, a single route table update is sent instead of one request per route
+ROUTE_TABLE_UPDATE_THRESHOLD = 3
+
+route_spec = dict(
+    name=dict(type='str', required=True),
+    address_prefix=dict(type='str'),
+    next_hop_type=dict(type='str',
+                       choices=['virtual_network_gateway',
+                                'vnet_local',
+                                'internet',
+                                'virtual_appliance',
+                                'none'],
+                       default='none'),
+    next_hop_ip_address=dict(type='str')
+)
 
 
 class AzureRMRouteTable(AzureRMModuleBase):
@@ -108,7 +201,9 @@ class AzureRMRouteTable(AzureRMModuleBase):
             name=dict(type='str', required=True),
             state=dict(type='str', default='present', choices=['present', 'absent']),
             location=dict(type='str'),
-            disable_bgp_route_propagation=dict(type='bool', default=False)
+            disable_bgp_route_propagation=dict(type='bool', default=False),
+            routes=dict(type='list', elements='dict', options=route_spec),
+            purge_routes=dict(type='bool', default=False)
         )
 
         self.resource_group = None
@@ -117,6 +212,8 @@ class AzureRMRouteTable(AzureRMModuleBase):
         self.location = None
         self.tags = None
         self.disable_bgp_route_propagation = None
+        self.routes = None
+        self.purge_routes = None
 
         self.results = dict(
             changed=False
@@ -144,6 +241,8 @@ class AzureRMRouteTable(AzureRMModuleBase):
             if not self.check_mode:
                 self.delete_table()
         elif self.state == 'present':
+            old_routes = result.routes if result else []
+            route_models = self.compare_routes(old_routes)
             if not result:
                 changed = True  # create new route table
             else:  # check update
@@ -153,17 +252,109 @@ class AzureRMRouteTable(AzureRMModuleBase):
                 if self.disable_bgp_route_propagation != result.disable_bgp_route_propagation:
                     changed = True
 
-            if changed:
+            if changed or len(route_models) > ROUTE_TABLE_UPDATE_THRESHOLD:
+                changed = True
+                # a route table update replaces all its routes, so send the existing or requested ones with it
                 result = self.network_models.RouteTable(location=self.location,
                                                         tags=self.tags,
-                                                        disable_bgp_route_propagation=self.disable_bgp_route_propagation)
+                                                        disable_bgp_route_propagation=self.disable_bgp_route_propagation,
+                                                        routes=self.merge_routes(old_routes, route_models))
                 if not self.check_mode:
                     result = self.create_or_update_table(result)
+            elif route_models:
+                changed = True
+                if not self.check_mode:
+                    self.update_routes(route_models)
 
         self.results['id'] = result.id if result else None
         self.results['changed'] = changed
         return self.results
 
+    def compare_routes(self, old_routes):
+        '''
+        Diff routes with the routes embedded in the route table, by name, address prefix and next hop.
+
+        :param old_routes: existing Route models of the route table
+        :return: dict of lowercased route name to the Route model to write, or None to delete the route
+        '''
+        if self.routes is None:
+            return dict()
+
+        existing = dict((route.name.lower(), route) for route in old_routes or [])
+        route_models = dict()
+        items = []
+        for route in self.routes:
+            key = route['name'].lower()
+            old = existing.get(key)
+            model = self.network_models.Route(name=route['name'],
+                                              address_prefix=route['address_prefix'],
+                                              next_hop_type=_snake_to_camel(route['next_hop_type'], capitalize_first=True),
+                                              next_hop_ip_address=route['next_hop_ip_address'])
+            item = dict(name=route['name'], action='unchanged')
+            if not old:
+                item['action'] = 'created'
+            elif old.address_prefix != model.address_prefix or old.next_hop_type != model.next_hop_type or \
+                    old.next_hop_ip_address != model.next_hop_ip_address:
+                self.log('Update: route {0} from {1} {2} {3}'.format(route['name'], old.address_prefix, old.next_hop_type, old.next_hop_ip_address))
+                item['action'] = 'updated'
+            if item['action'] != 'unchanged':
+                route_models[key] = model
+            items.append(item)
+
+        if self.purge_routes:
+            requested = set(route['name'].lower() for route in self.routes)
+            for key, old in existing.items():
+                if key not in requested:
+                    route_models[key] = None
+                    items.append(dict(name=old.name, action='deleted'))
+
+        self.results['routes'] = items
+        return route_models
+
+    def merge_routes(self, old_routes, route_models):
+        '''
+        Build the routes of a route table update, existing routes with route_models applied.
+
+        :return: list of Route models
+        '''
+        route_models = dict(route_models)
+        routes = []
+        for route in old_routes or []:
+            key = route.name.lower()
+            if key not in route_models:
+                routes.append(route)
+            elif route_models[key] is not None:
+                routes.append(route_models.pop(key))
+        routes.extend(model for model in route_models.values() if model is not None)
+        return routes
+
+    def update_routes(self, route_models):
+        '''
+        Write the changed routes one at a time.
+
+        Azure applies a single write at a time to a route table, so concurrent writes of its routes fail with
+        AnotherOperationInProgress, as for the inbound NAT rules of a load balancer. Many changed routes are
+        sent with the route table in a single request instead, see ROUTE_TABLE_UPDATE_THRESHOLD.
+
+        :param route_models: dict of lowercased route name to the Route model to write, or None to delete the route
+        '''
+        for item in self.results['routes']:
+            key = item['name'].lower()
+            if key not in route_models:
+                continue
+            model = route_models[key]
+            try:
+                if model is None:
+                    self.log('Deleting route {0}'.format(item['name']))
+                    poller = self.network_client.routes.delete(self.resource_group, self.name, item['name'])
+                else:
+                    self.log('Creating or updating route {0}'.format(model.name))
+                    poller = self.network_client.routes.create_or_update(self.resource_group, self.name, model.name, model)
+                self.get_poller_result(poller)
+            except CloudError as exc:
+                item['msg'] = str(exc)
+                self.fail("Error updating route {0} of route table {1} - {2}".format(item['name'], self.name, str(exc)), **self.results)
+
     def create_or_update_table(self, param):
         try:
             poller = self.network_client.route_tables.create_or_update(self.resource_group, self.name, param)
@@ -337,6 +337,29 @@ state:
         },
         "type": "Microsoft.Network/networkSecurityGroups"
     }
+rules_diff:
+    description:
+        - Differences between the existing and the requested rules.
+        - Rules updated on their own when that sends fewer bytes than an update of the whole security group.
+    returned: when the security group exists and I(state=present)
+    type: complex
+    contains:
+        added:
+            description: Names of the rules added.
+            type: list
+            sample: ["AllowHTTPS"]
+        changed:
+            description: Name and differing fields of each changed rule.
+            type: list
+            sample: [{"name": "AllowSSH", "fields": ["source_address_prefix"]}]
+        removed:
+            description: Names of the rules removed, with I(purge_rules=yes).
+            type: list
+            sample: ["DenySSH"]
+default_rules_diff:
+    description: Differences between the existing and the requested default rules, like I(rules_diff).
+    returned: when the security group exists and I(state=present)
+    type: complex
 '''  # NOQA
 
 try:
@@ -346,11 +369,23 @@ except ImportError:
     # This is handled in azure_rm_common
     pass
 
+import json
+
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
 from ansible.module_utils.six import integer_types
 from ansible.module_utils._text import to_native
 
 
+RULE_FIELDS = ['description', 'protocol', 'access', 'priority', 'direction']
+
+RULE_STRING_FIELDS = ['source_port_range', 'destination_port_range', 'source_address_prefix', 'destination_address_prefix']
+
+RULE_LIST_FIELDS = ['source_address_prefixes', 'destination_address_prefixes', 'source_port_ranges', 'destination_port_ranges']
+
+# estimated size of the headers and polling of one extra request, when comparing a full update with per-rule updates
+RULE_REQUEST_OVERHEAD = 2048
+
+
 def validate_rule(self, rule, rule_type=None):
     '''
     Apply defaults to a rule dictionary and check that all values are valid.
@@ -375,57 +410,65 @@ def validate_rule(self, rule, rule_type=None):
 
 
 def compare_rules_change(old_list, new_list, purge_list):
+    '''
+    Reconcile the existing rules with the requested ones, matching them by name.
+
+    :param old_list: existing rule dicts
+    :param new_list: requested rule dicts, extended in place with the existing rules to keep
+    :param purge_list: remove the existing rules which are not requested
+    :return: tuple (changed, new_list, diff) where diff lists the names of added and removed rules,
+             and the name and differing fields of each changed rule
+    '''
     old_list = old_list or []
     new_list = new_list or []
-    changed = False
+    new_index = dict((x['name'], x) for x in new_list)
+    old_names = set()
+    diff = dict(added=[], changed=[], removed=[])
 
     for old_rule in old_list:
-        matched = next((x for x in new_list if x['name'] == old_rule['name']), [])
+        old_names.add(to_native(old_rule['name']))
+        matched = new_index.get(old_rule['name'])
         if matched:  # if the new one is in the old list, check whether it is updated
-            changed = changed or compare_rules(old_rule, matched)
+            fields = compare_rules(old_rule, matched)
+            if fields:
+                diff['changed'].append(dict(name=old_rule['name'], fields=fields))
         elif not purge_list:  # keep this rule
             new_list.append(old_rule)
         else:  # one rule is removed
-            changed = True
-    # Compare new list and old list is the same? here only compare names
-    if not changed:
-        new_names = [to_native(x['name']) for x in new_list]
-        old_names = [to_native(x['name']) for x in old_list]
-        changed = (set(new_names) != set(old_names))
-    return changed, new_list
+            diff['removed'].append(old_rule['name'])
+    diff['added'] = [x['name'] for x in new_list if to_native(x['name']) not in old_names]
+    changed = bool(diff['added'] or diff['changed'] or diff['removed'])
+    return changed, new_list, diff
 
 
 def compare_rules(old_rule, rule):
-    changed = False
-    if old_rule['name'] != rule['name']:
-        changed = True
-    if rule.get('description', None) != old_rule['description']:
-        changed = True
-    if rule['protocol'] != old_rule['protocol']:
-        changed = True
-    if str(rule['source_port_range']) != str(old_rule['source_port_range']):
-        changed = True
-    if str(rule['destination_port_range']) != str(old_rule['destination_port_range']):
-        changed = True
-    if rule['access'] != old_rule['access']:
-        changed = True
-    if rule['priority'] != old_rule['priority']:
-        changed = True
-    if rule['direction'] != old_rule['direction']:
-        changed = True
-    if str(rule['source_address_prefix']) != str(old_rule['source_address_prefix']):
-        changed = True
-    if str(rule['destination_address_prefix']) != str(old_rule['destination_address_prefix']):
-        changed = True
-    if set(rule.get('source_address_prefixes') or []) != set(old_rule.get('source_address_prefixes') or []):
-        changed = True
-    if set(rule.get('destination_address_prefixes') or []) != set(old_rule.get('destination_address_prefixes') or []):
-        changed = True
-    if set(rule.get('source_port_ranges') or []) != set(old_rule.get('source_port_ranges') or []):
-        changed = True
-    if set(rule.get('destination_port_ranges') or []) != set(old_rule.get('destination_port_ranges') or []):
-        changed = True
-    return changed
+    '''
+    Compare two rules with the same name.
+
+    :return: list of the names of the differing fields
+    '''
+    fields = [field for field in RULE_FIELDS if rule.get(field) != old_rule.get(field)]
+    # ports may be given as integers
+    fields.extend(field for field in RULE_STRING_FIELDS if str(rule.get(field)) != str(old_rule.get(field)))
+    fields.extend(field for field in RULE_LIST_FIELDS if set(rule.get(field) or []) != set(old_rule.get(field) or []))
+    return fields
+
+
+def find_priority_collisions(rules):
+    '''
+    Find the rules sharing a direction and a priority, which Azure rejects.
+
+    :return: list of tuples (first rule name, second rule name, priority, direction)
+    '''
+    slots = dict()
+    collisions = []
+    for rule in rules or []:
+        slot = (rule.get('direction'), rule.get('priority'))
+        if slot in slots:
+            collisions.append((slots[slot], rule['name'], slot[1], slot[0]))
+        else:
+            slots[slot] = rule['name']
+    return collisions
 
 
 def create_rule_instance(self, rule):
@@ -617,19 +660,27 @@ class AzureRMSecurityGroup(AzureRMModuleBase):
             if update_tags:
                 changed = True
 
-            rule_changed, new_rule = compare_rules_change(results['rules'], self.rules, self.purge_rules)
+            old_rules = results['rules']
+            rule_changed, new_rule, self.results['rules_diff'] = compare_rules_change(results['rules'], self.rules, self.purge_rules)
             if rule_changed:
                 changed = True
                 results['rules'] = new_rule
-            rule_changed, new_rule = compare_rules_change(results['default_rules'], self.default_rules, self.purge_default_rules)
-            if rule_changed:
+            default_rule_changed, new_rule, self.results['default_rules_diff'] = \
+                compare_rules_change(results['default_rules'], self.default_rules, self.purge_default_rules)
+            if default_rule_changed:
                 changed = True
                 results['default_rules'] = new_rule
 
+            self.check_priority_collisions(results['rules'])
+
             self.results['changed'] = changed
             self.results['state'] = results
             if not self.check_mode and changed:
-                self.results['state'] = self.create_or_update(results)
+                if not update_tags and not default_rule_changed and \
+                   self.rule_updates_are_smaller(old_rules, results['rules'], self.results['rules_diff']):
+                    self.results['state'] = self.update_rules(results['rules'], self.results['rules_diff'])
+                else:
+                    self.results['state'] = self.create_or_update(results)
 
         elif self.state == 'present' and changed:
             # create the security group
@@ -651,6 +702,8 @@ class AzureRMSecurityGroup(AzureRMModuleBase):
             if self.tags:
                 results['tags'] = self.tags
 
+            self.check_priority_collisions(results['rules'])
+
             self.results['changed'] = changed
             self.results['state'] = results
             if not self.check_mode:
@@ -690,6 +743,60 @@ class AzureRMSecurityGroup(AzureRMModuleBase):
             self.fail("Error creating/updating security group {0} - {1}".format(self.name, str(exc)))
         return create_network_security_group_dict(result)
 
+    def check_priority_collisions(self, rules):
+        collisions = find_priority_collisions(rules)
+        if collisions:
+            self.fail("Error validating rules - {0}".format('; '.join(
+                "rules {0} and {1} both have priority {2} for {3} traffic".format(*collision) for collision in collisions)))
+
+    def rule_updates_are_smaller(self, old_rules, rules, diff):
+        '''
+        Check whether updating the changed rules one by one sends fewer bytes than updating the whole
+        security group, and can be done without two rules transiently sharing a priority.
+
+        :param old_rules: existing rule dicts
+        :param rules: requested rule dicts, as sent by a full update
+        :param diff: rules diff from compare_rules_change
+        :return: boolean
+        '''
+        touched = set(diff['added']) | set(item['name'] for item in diff['changed'])
+        removed = set(diff['removed'])
+
+        # rules are updated one at a time, so no rule may take the priority of another rule still in place
+        slots = dict(((rule.get('direction'), rule.get('priority')), rule['name']) for rule in old_rules if rule['name'] not in removed)
+        for rule in rules:
+            if rule['name'] in touched and slots.get((rule.get('direction'), rule.get('priority')), rule['name']) != rule['name']:
+                return False
+
+        full_size = sum(len(json.dumps(rule, default=str)) for rule in rules)
+        rules_size = sum(len(json.dumps(rule, default=str)) + RULE_REQUEST_OVERHEAD for rule in rules if rule['name'] in touched)
+        return rules_size + len(removed) * RULE_REQUEST_OVERHEAD < full_size
+
+    def update_rules(self, rules, diff):
+        '''
+        Delete, create or update individual security rules instead of the whole security group.
+
+        :param rules: requested rule dicts
+        :param diff: rules diff from compare_rules_change
+        :return: dict of the updated security group
+        '''
+        touched = set(diff['added']) | set(item['name'] for item in diff['changed'])
+        try:
+            for name in diff['removed']:
+                self.log("Delete security rule {0}".format(name))
+                poller = self.network_client.security_rules.delete(self.resource_group, self.name, name)
+                self.get_poller_result(poller)
+            for rule in rules:
+                if rule['name'] in touched:
+                    self.log("Create or update security rule {0}".format(rule['name']))
+                    poller = self.network_client.security_rules.create_or_update(self.resource_group, self.name, rule['name'],
+                                                                                 create_rule_instance(self, rule))
+                    self.get_poller_result(poller)
+            nsg = self.network_client.network_security_groups.get(self.resource_group, self.name)
+        except CloudError as exc:
+            self.fail("Error updating rules of security group {0} - {1}".format(self.name, str(exc)))
+        return create_network_security_group_dict(nsg)
+
     def delete(self):
         try:
             poller = self.network_client.network_security_groups.delete(resource_group_name=self.resource_group, network_security_group_name=self.name)
@@ -199,7 +199,7 @@ class AzureRMDatabasesFacts(AzureRMModuleBase):
         self.filter = None
         self.elastic_pool_name = None
         self.recommended_elastic_pool_name = None
-        super(AzureRMDatabasesFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMDatabasesFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
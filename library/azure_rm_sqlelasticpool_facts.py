@@ -153,7 +153,7 @@ class AzureRMElasticPoolsFacts(AzureRMModuleBase):
         self.resource_group = None
         self.server_name = None
         self.elastic_pool_name = None
-        super(AzureRMElasticPoolsFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMElasticPoolsFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
@@ -33,7 +33,7 @@ options:
     name:
         description:
             - The name of the firewall rule.
-        required: True
+            - Required unless I(rules) is set.
     start_ip_address:
         description:
             - The start IP address of the firewall rule. Must be IPv4 format. Use value C(0.0.0.0) to represent all Azure-internal IP addresses.
@@ -41,6 +41,37 @@ options:
         description:
             - "The end IP address of the firewall rule. Must be IPv4 format. Must be greater than or equal to startIpAddress. Use value C(0.0.0.0) to represe
                nt all Azure-internal IP addresses."
+    rules:
+        description:
+            - Manage the whole set of firewall rules of the server from one task, instead of I(name).
+            - The rules of the server are listed once, and the rules to create, update or delete are sent by a pool of
+              at most I(max_concurrency) workers.
+            - With I(state=absent), the listed rules are deleted.
+        type: list
+        version_added: "2.8"
+        suboptions:
+            name:
+                description:
+                    - The name of the firewall rule.
+                required: True
+            start_ip_address:
+                description:
+                    - The start IP address of the firewall rule.
+            end_ip_address:
+                description:
+                    - The end IP address of the firewall rule.
+    purge_rules:
+        description:
+            - With I(rules) and I(state=present), delete the rules of the server which are not listed.
+        type: bool
+        default: no
+        version_added: "2.8"
+    max_concurrency:
+        description:
+            - Maximum number of rules created, updated or deleted at the same time when I(rules) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
     state:
       description:
         - Assert the state of the SQL Database. Use 'present' to create or update an SQL Database and 'absent' to delete it.
@@ -65,6 +96,18 @@ EXAMPLES = '''
       name: firewallrulecrudtest-5370
       start_ip_address: 172.28.10.136
       end_ip_address: 172.28.10.138
+  - name: Allow the office and CI addresses, and nothing else
+    azure_rm_sqlfirewallrule:
+      resource_group: TestGroup
+      server_name: testserver
+      purge_rules: yes
+      rules:
+        - name: office
+          start_ip_address: 172.28.10.0
+          end_ip_address: 172.28.10.255
+        - name: ci
+          start_ip_address: 172.28.20.7
+          end_ip_address: 172.28.20.7
 '''
 
 RETURN = '''
@@ -75,6 +118,31 @@ id:
     type: str
     sample: "/subscriptions/00000000-1111-2222-3333-444444444444/resourceGroups/firewallrulecrudtest-12/providers/Microsoft.Sql/servers/firewallrulecrudtest-628
              5/firewallRules/firewallrulecrudtest-5370"
+rules:
+    description: Result for each rule of I(rules), and each rule removed by I(purge_rules).
+    returned: when I(rules) is set
+    type: complex
+    contains:
+        name:
+            description:
+                - Name of the firewall rule.
+            type: str
+            sample: office
+        action:
+            description:
+                - Change made to the rule.
+            type: str
+            sample: created
+            choices:
+                - created
+                - updated
+                - deleted
+                - unchanged
+        msg:
+            description:
+                - Error message when the change failed.
+            returned: on failure
+            type: str
 '''
 
 import time
@@ -94,6 +162,13 @@ class Actions:
     NoAction, Create, Update, Delete = range(4)
 
 
+rule_spec = dict(
+    name=dict(type='str', required=True),
+    start_ip_address=dict(type='str'),
+    end_ip_address=dict(type='str')
+)
+
+
 class AzureRMFirewallRules(AzureRMModuleBase):
     """Configuration class for an Azure RM Firewall Rule resource"""
 
@@ -108,8 +183,7 @@ class AzureRMFirewallRules(AzureRMModuleBase):
                 required=True
             ),
             name=dict(
-                type='str',
-                required=True
+                type='str'
             ),
             start_ip_address=dict(
                 type='str'
@@ -121,6 +195,19 @@ class AzureRMFirewallRules(AzureRMModuleBase):
                 type='str',
                 default='present',
                 choices=['present', 'absent']
+            ),
+            rules=dict(
+                type='list',
+                elements='dict',
+                options=rule_spec
+            ),
+            purge_rules=dict(
+                type='bool',
+                default=False
+            ),
+            max_concurrency=dict(
+                type='int',
+                default=10
             )
         )
 
@@ -129,6 +216,9 @@ class AzureRMFirewallRules(AzureRMModuleBase):
         self.name = None
         self.start_ip_address = None
         self.end_ip_address = None
+        self.rules = None
+        self.purge_rules = None
+        self.max_concurrency = None
 
         self.results = dict(changed=False)
         self.state = None
@@ -136,7 +226,9 @@ class AzureRMFirewallRules(AzureRMModuleBase):
 
         super(AzureRMFirewallRules, self).__init__(derived_arg_spec=self.module_arg_spec,
                                                    supports_check_mode=True,
-                                                   supports_tags=False)
+                                                   supports_tags=False,
+                                                   mutually_exclusive=[['name', 'rules']],
+                                                   required_one_of=[['name', 'rules']])
 
     def exec_module(self, **kwargs):
         """Main module execution method"""
@@ -145,6 +237,9 @@ class AzureRMFirewallRules(AzureRMModuleBase):
             if hasattr(self, key):
                 setattr(self, key, kwargs[key])
 
+        if self.rules is not None:
+            return self.exec_rules()
+
         old_response = self.get_firewallrule()
         response = None
 
@@ -189,8 +284,10 @@ class AzureRMFirewallRules(AzureRMModuleBase):
             self.delete_firewallrule()
             # make sure instance is actually deleted, for some Azure resources, instance is hanging around
             # for some time after deletion -- this should be really fixed in Azure
+            delay = 5
             while self.get_firewallrule():
-                time.sleep(20)
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
         else:
             self.log("Firewall Rule instance unchanged")
             self.results['changed'] = False
@@ -201,6 +298,82 @@ class AzureRMFirewallRules(AzureRMModuleBase):
 
         return self.results
 
+    def exec_rules(self):
+        '''
+        Reconcile the set of firewall rules of the server from a single listing.
+
+        :return: module results with one item per rule in rules
+        '''
+        try:
+            # rule names are case insensitive
+            existing = dict((rule.name.lower(), rule.as_dict()) for rule in self.sql_client.firewall_rules.list_by_server(
+                resource_group_name=self.resource_group,
+                server_name=self.server_name))
+        except CloudError as exc:
+            self.fail("Error listing the firewall rules of server {0}: {1}".format(self.server_name, str(exc)))
+
+        items = []
+        for rule in self.rules:
+            old = existing.get(rule['name'].lower())
+            item = dict(name=rule['name'],
+                        start_ip_address=rule['start_ip_address'],
+                        end_ip_address=rule['end_ip_address'],
+                        action='unchanged')
+            if self.state == 'absent':
+                if old:
+                    item['action'] = 'deleted'
+            elif not old:
+                if not rule['start_ip_address'] or not rule['end_ip_address']:
+                    self.fail("Parameter error: start_ip_address and end_ip_address required to create rule {0}".format(rule['name']))
+                item['action'] = 'created'
+            else:
+                item['start_ip_address'] = rule['start_ip_address'] or old['start_ip_address']
+                item['end_ip_address'] = rule['end_ip_address'] or old['end_ip_address']
+                if item['start_ip_address'] != old['start_ip_address'] or item['end_ip_address'] != old['end_ip_address']:
+                    item['action'] = 'updated'
+            items.append(item)
+
+        if self.purge_rules and self.state == 'present':
+            requested = set(rule['name'].lower() for rule in self.rules)
+            for key in sorted(existing):
+                if key not in requested:
+                    items.append(dict(name=existing[key]['name'],
+                                      start_ip_address=existing[key]['start_ip_address'],
+                                      end_ip_address=existing[key]['end_ip_address'],
+                                      action='deleted'))
+
+        pending = dict((item['name'].lower(), item) for item in items if item['action'] != 'unchanged')
+        self.results['changed'] = bool(pending)
+        self.results['rules'] = items
+        if self.check_mode or not pending:
+            return self.results
+
+        def get_operation(item):
+            def start():
+                if item['action'] == 'deleted':
+                    return self.sql_client.firewall_rules.delete(
+                        resource_group_name=self.resource_group,
+                        server_name=self.server_name,
+                        firewall_rule_name=item['name'])
+                return self.sql_client.firewall_rules.create_or_update(
+                    resource_group_name=self.resource_group,
+                    server_name=self.server_name,
+                    firewall_rule_name=item['name'],
+                    start_ip_address=item['start_ip_address'],
+                    end_ip_address=item['end_ip_address'])
+            return start
+
+        responses, errors = self.run_operations_in_parallel(dict((key, get_operation(item)) for key, item in pending.items()),
+                                                            max_workers=self.max_concurrency)
+
+        for item in items:
+            if item['name'].lower() in errors:
+                item['msg'] = errors[item['name'].lower()]
+        if errors:
+            failed = sorted(item['name'] for item in items if item.get('msg'))
+            self.fail("Error updating the firewall rules {0}".format(', '.join(failed)), **self.results)
+        return self.results
+
     def create_update_firewallrule(self):
         '''
         Creates or updates Firewall Rule with the specified configuration.
@@ -234,6 +407,8 @@ class AzureRMFirewallRules(AzureRMModuleBase):
             response = self.sql_client.firewall_rules.delete(resource_group_name=self.resource_group,
                                                              server_name=self.server_name,
                                                              firewall_rule_name=self.name)
+            if isinstance(response, LROPoller):
+                self.get_poller_result(response)
         except CloudError as e:
             self.log('Error attempting to delete the Firewall Rule instance.')
             self.fail("Error deleting the Firewall Rule instance: {0}".format(str(e)))
@@ -140,7 +140,7 @@ class AzureRMServersFacts(AzureRMModuleBase):
         )
         self.resource_group = None
         self.server_name = None
-        super(AzureRMServersFacts, self).__init__(self.module_arg_spec)
+        super(AzureRMServersFacts, self).__init__(self.module_arg_spec, facts_module=True)
 
     def exec_module(self, **kwargs):
         for key in self.module_arg_spec:
@@ -28,8 +28,8 @@ options:
     name:
         description:
             - The name of the endpoint.
+            - Mutually exclusive with I(endpoints), one of them is required.
         type: str
-        required: true
     profile_name:
         description: Name of Traffic Manager profile where this endpoints attaches to.
         type: str
@@ -37,7 +37,7 @@ options:
     type:
         description:
             - The type of the endpoint.
-        required: true
+            - Required with I(name). With I(endpoints), the default type of the listed endpoints.
         choices:
             - azure_endpoints
             - external_endpoints
@@ -88,6 +88,29 @@ options:
         choices:
             - absent
             - present
+    endpoints:
+        description:
+            - List of endpoints of the profile, to manage many endpoints in a single task.
+            - The profile is read once with its endpoints, and only the endpoints with a different status, weight,
+              priority or target are sent, concurrently.
+            - When more endpoints changed than I(max_concurrency), or when a new priority is still held by another
+              endpoint, all the changes are sent instead as a single update of the profile.
+            - Each endpoint accepts the I(name), I(type), I(target_resource_id), I(target), I(enabled), I(weight),
+              I(priority), I(location), I(min_child_endpoints) and I(geo_mapping) options of a single endpoint.
+        type: list
+        version_added: "2.8"
+    purge_endpoints:
+        description:
+            - Delete the endpoints of the profile which are not in I(endpoints).
+        type: bool
+        default: no
+        version_added: "2.8"
+    max_concurrency:
+        description:
+            - Maximum number of endpoints updated at the same time when I(endpoints) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -109,6 +132,22 @@ EXAMPLES = '''
         priority: 2
         weight: 1
         target: 1.2.3.4
+
+  - name: set the weights of all the endpoints of a profile
+    azure_rm_trafficmanagerendpoint:
+        resource_group: testresourcegroup
+        profile_name: myprofilename
+        type: external_endpoints
+        endpoints:
+          - name: westus
+            target: 1.2.3.4
+            location: westus
+            weight: 100
+          - name: eastus
+            target: 4.3.2.1
+            location: eastus
+            weight: 50
+        purge_endpoints: yes
 '''
 
 RETURN = '''
@@ -118,7 +157,43 @@ id:
   type: str
   example:
     "/subscriptions/<subsid>/resourceGroups/testRg/providers/Microsoft.Network/trafficManagerProfiles/testProfile/externalEndpoints/testendpoint"
+endpoints:
+  description: Result for each endpoint of I(endpoints), followed by the purged endpoints.
+  returned: when I(endpoints) is set
+  type: complex
+  contains:
+    name:
+      description: Name of the endpoint.
+      returned: always
+      type: str
+      example: westus
+    type:
+      description: Type of the endpoint.
+      returned: always
+      type: str
+      example: externalEndpoints
+    action:
+      description: Change made to the endpoint.
+      returned: always
+      type: str
+      example: updated
+      choices:
+        - created
+        - updated
+        - deleted
+        - unchanged
+    msg:
+      description: Error message when the change failed.
+      returned: on failure
+      type: str
+single_update:
+  description: Whether the changed endpoints were sent as a single update of the profile.
+  returned: when I(endpoints) is set
+  type: bool
+  example: false
 '''
+import copy
+
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase, normalize_location_name
 from ansible.module_utils.common.dict_transformations import _snake_to_camel
 
@@ -132,6 +207,22 @@ except ImportError:
     pass
 
 
+endpoint_spec = dict(
+    name=dict(type='str', required=True),
+    type=dict(type='str', choices=['azure_endpoints', 'external_endpoints', 'nested_endpoints']),
+    target=dict(type='str'),
+    target_resource_id=dict(type='str'),
+    enabled=dict(type='bool', default=True),
+    weight=dict(type='int'),
+    priority=dict(type='int'),
+    location=dict(type='str'),
+    min_child_endpoints=dict(type='int'),
+    geo_mapping=dict(type='list', elements='str')
+)
+
+ENDPOINT_TYPE_PREFIX = 'Microsoft.Network/trafficManagerProfiles/'
+
+
 def traffic_manager_endpoint_to_dict(endpoint):
     return dict(
         id=endpoint.id,
@@ -162,8 +253,7 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
                 required=True
             ),
             name=dict(
-                type='str',
-                required=True
+                type='str'
             ),
             profile_name=dict(
                 type='str',
@@ -171,8 +261,7 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
             ),
             type=dict(
                 type='str',
-                choices=['azure_endpoints', 'external_endpoints', 'nested_endpoints'],
-                required=True
+                choices=['azure_endpoints', 'external_endpoints', 'nested_endpoints']
             ),
             target=dict(type='str'),
             target_resource_id=dict(type='str'),
@@ -187,6 +276,9 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
                 default='present',
                 choices=['present', 'absent']
             ),
+            endpoints=dict(type='list', elements='dict', options=endpoint_spec),
+            purge_endpoints=dict(type='bool', default=False),
+            max_concurrency=dict(type='int', default=10)
         )
 
         self.resource_group = None
@@ -203,6 +295,9 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
         self.min_child_endpoints = None
         self.geo_mapping = None
         self.endpoint_status = 'Enabled'
+        self.endpoints = None
+        self.purge_endpoints = None
+        self.max_concurrency = None
 
         self.action = Actions.NoAction
 
@@ -212,15 +307,21 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
 
         super(AzureRMTrafficManagerEndpoint, self).__init__(derived_arg_spec=self.module_arg_spec,
                                                             supports_check_mode=True,
-                                                            supports_tags=False)
+                                                            supports_tags=False,
+                                                            mutually_exclusive=[['name', 'endpoints']],
+                                                            required_one_of=[['name', 'endpoints']])
 
     def exec_module(self, **kwargs):
 
         for key in list(self.module_arg_spec.keys()):
             setattr(self, key, kwargs[key])
 
-        if self.type:
-            self.type = _snake_to_camel(self.type)
+        if self.endpoints is not None:
+            return self.exec_endpoints()
+
+        if not self.type:
+            self.fail("Parameter error: type required with name.")
+        self.type = _snake_to_camel(self.type)
 
         to_be_updated = False
 
@@ -268,6 +369,138 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
 
         return self.results
 
+    def exec_endpoints(self):
+        '''
+        Reconcile the endpoints in endpoints from a single read of the profile and its embedded endpoints.
+
+        :return: module results with one item per endpoint
+        '''
+        try:
+            profile = self.traffic_manager_management_client.profiles.get(self.resource_group, self.profile_name)
+        except CloudError as exc:
+            self.fail("Error getting the Traffic Manager profile {0} - {1}".format(self.profile_name, str(exc)))
+
+        existing = dict((endpoint.name.lower(), endpoint) for endpoint in profile.endpoints or [])
+        location = None
+
+        members = dict()
+        items = []
+        for endpoint in self.endpoints:
+            old = existing.get(endpoint['name'].lower())
+            member = copy.copy(self)
+            for key in ('name', 'target', 'target_resource_id', 'weight', 'priority', 'location', 'min_child_endpoints', 'geo_mapping'):
+                setattr(member, key, endpoint[key])
+            if endpoint['type'] or self.type:
+                member.type = _snake_to_camel(endpoint['type'] or self.type)
+            elif old:
+                member.type = old.type.split('/')[-1]
+            else:
+                self.fail("Parameter error: type required to create endpoint {0}.".format(endpoint['name']))
+            member.endpoint_status = 'Disabled' if endpoint['enabled'] is False else 'Enabled'
+            if not member.location:
+                if not location:
+                    location = self.get_resource_group(self.resource_group).location
+                member.location = location
+            members[member.name] = member
+
+            item = dict(name=member.name, type=member.type, action='unchanged')
+            if self.state == 'absent':
+                if old:
+                    item['type'] = member.type = old.type.split('/')[-1]
+                    item['action'] = 'deleted'
+            elif not old:
+                item['action'] = 'created'
+            elif member.check_update(traffic_manager_endpoint_to_dict(old)):
+                item['action'] = 'updated'
+            items.append(item)
+
+        if self.purge_endpoints and self.state == 'present':
+            requested = set(name.lower() for name in members)
+            for key, old in existing.items():
+                if key not in requested:
+                    member = copy.copy(self)
+                    member.name = old.name
+                    member.type = old.type.split('/')[-1]
+                    members[member.name] = member
+                    items.append(dict(name=member.name, type=member.type, action='deleted'))
+
+        pending = dict((item['name'], item) for item in items if item['action'] != 'unchanged')
+        self.results['changed'] = bool(pending)
+        self.results['endpoints'] = items
+        self.results['single_update'] = len(pending) > self.max_concurrency or \
+            self.has_priority_collisions(existing, members, pending)
+        if self.check_mode or not pending:
+            return self.results
+
+        if self.results['single_update']:
+            self.update_profile_endpoints(profile, members, items)
+            return self.results
+
+        def get_operation(item):
+            member = members[item['name']]
+            if item['action'] == 'deleted':
+                return member.delete_traffic_manager_endpoint
+            return member.create_update_traffic_manager_endpoint
+
+        results, errors = self.run_in_parallel(dict((name, get_operation(item)) for name, item in pending.items()),
+                                               max_workers=self.max_concurrency)
+        for item in items:
+            if item['name'] in errors:
+                item['msg'] = errors[item['name']]
+        if errors:
+            self.fail("Error updating the Traffic Manager endpoints {0}".format(', '.join(sorted(errors))), **self.results)
+        return self.results
+
+    def has_priority_collisions(self, existing, members, pending):
+        '''
+        Check whether a created or updated endpoint asks for a priority another endpoint holds until it is updated,
+        which Azure rejects when the endpoints are sent one by one.
+
+        :return: boolean
+        '''
+        for name, item in pending.items():
+            priority = members[name].priority
+            if item['action'] == 'deleted' or not priority:
+                continue
+            for key, endpoint in existing.items():
+                if key != name.lower() and endpoint.priority == priority:
+                    return True
+        return False
+
+    def update_profile_endpoints(self, profile, members, items):
+        '''
+        Send all the changed endpoints with a single update of the profile.
+
+        :return: True
+        '''
+        endpoints = list(profile.endpoints or [])
+        for item in items:
+            index = next((i for i, endpoint in enumerate(endpoints) if endpoint.name.lower() == item['name'].lower()), None)
+            if item['action'] == 'deleted':
+                endpoints.pop(index)
+            elif item['action'] in ('created', 'updated'):
+                member = members[item['name']]
+                parameters = member.get_endpoint_parameters()
+                parameters.name = member.name
+                parameters.type = ENDPOINT_TYPE_PREFIX + member.type
+                if index is None:
+                    endpoints.append(parameters)
+                else:
+                    parameters.id = endpoints[index].id
+                    endpoints[index] = parameters
+        profile.endpoints = endpoints
+
+        self.log("Updating the endpoints of the Traffic Manager profile {0}".format(self.profile_name))
+        try:
+            self.traffic_manager_management_client.profiles.create_or_update(self.resource_group, self.profile_name, profile)
+        except CloudError as exc:
+            request_id = exc.request_id if exc.request_id else ''
+            self.fail("Error updating the endpoints of the Traffic Manager profile {0}, request id {1} - {2}".format(self.profile_name,
+                                                                                                                     request_id,
+                                                                                                                     str(exc)),
+                      **self.results)
+        return True
+
     def get_traffic_manager_endpoint(self):
         '''
         Gets the properties of the specified Traffic Manager endpoint
@@ -306,14 +539,7 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
         '''
         self.log("Creating / Updating the Traffic Manager endpoint {0}".format(self.name))
 
-        parameters = Endpoint(target_resource_id=self.target_resource_id,
-                              target=self.target,
-                              endpoint_status=self.endpoint_status,
-                              weight=self.weight,
-                              priority=self.priority,
-                              endpoint_location=self.location,
-                              min_child_endpoints=self.min_child_endpoints,
-                              geo_mapping=self.geo_mapping)
+        parameters = self.get_endpoint_parameters()
 
         try:
             response = self.traffic_manager_management_client.endpoints.create_or_update(self.resource_group,
@@ -326,6 +552,16 @@ class AzureRMTrafficManagerEndpoint(AzureRMModuleBase):
             request_id = exc.request_id if exc.request_id else ''
             self.fail("Error creating the Traffic Manager endpoint {0}, request id {1} - {2}".format(self.name, request_id, str(exc)))
 
+    def get_endpoint_parameters(self):
+        return Endpoint(target_resource_id=self.target_resource_id,
+                        target=self.target,
+                        endpoint_status=self.endpoint_status,
+                        weight=self.weight,
+                        priority=self.priority,
+                        endpoint_location=self.location,
+                        min_child_endpoints=self.min_child_endpoints,
+                        geo_mapping=self.geo_mapping)
+
     def check_update(self, response):
         if self.endpoint_status is not None and response['status'].lower() != self.endpoint_status.lower():
             self.log("Status Diff - Origin {0} / Update {1}".format(response['status'], self.endpoint_status))
@@ -299,6 +299,30 @@ options:
         type: bool
         default: false
         version_added: "2.7"
+    count:
+        description:
+            - Manage a fleet of identical virtual machines in one task. The machines are named I(name) followed by
+              an index starting at 1, for example C(web1), C(web2).
+            - Size and image lookups are done once for the whole fleet, and the machines are created, updated or
+              deleted concurrently, at most I(max_concurrency) at a time.
+            - Cannot be used with I(network_interface_names), I(os_disk_name), I(storage_blob_name) or I(short_hostname),
+              which must differ between machines.
+            - C(0) manages an empty fleet, which changes nothing.
+        type: int
+        version_added: "2.8"
+    instances:
+        description:
+            - Like I(count), but with an explicit list of virtual machine names. I(name) is then only used to name
+              the task.
+        type: list
+        version_added: "2.8"
+    max_concurrency:
+        description:
+            - Maximum number of virtual machines created, updated or deleted at the same time when I(count) or
+              I(instances) is set.
+        type: int
+        default: 10
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -484,6 +508,25 @@ EXAMPLES = '''
     name: testvm002
     restarted: yes
 
+- name: Create a fleet of 50 identical VMs, 20 at a time
+  azure_rm_virtualmachine:
+    resource_group: Testing
+    name: web
+    count: 50
+    max_concurrency: 20
+    vm_size: Standard_DS1_v2
+    managed_disk_type: Standard_LRS
+    admin_username: adminUser
+    ssh_password_enabled: false
+    ssh_public_keys:
+      - path: /home/adminUser/.ssh/authorized_keys
+        key_data: < insert yor ssh public key here... >
+    image:
+      offer: CentOS
+      publisher: OpenLogic
+      sku: '7.1'
+      version: latest
+
 - name: remove vm and all resources except public ips
   azure_rm_virtualmachine:
     resource_group: Testing
@@ -515,6 +558,18 @@ deleted_public_ips:
     returned: 'on delete'
     type: list
     example: ["testvm1001"]
+vms:
+    description:
+        - Result of each virtual machine of the fleet, in the order of I(instances) or of the index.
+        - Each item contains C(name), C(changed), C(duration) in seconds, C(azure_vm) facts on success and C(msg) on failure.
+    returned: when count or instances is set
+    type: list
+    example: [{"name": "web1", "changed": true, "duration": 187.42, "azure_vm": {}}]
+duration:
+    description: Time in seconds taken to reconcile the whole fleet.
+    returned: when count or instances is set
+    type: float
+    example: 243.17
 azure_vm:
     description: Facts about the current state of the object. Note that facts are not part of the registered output but available directly.
     returned: always
@@ -660,8 +715,10 @@ azure_vm:
 '''  # NOQA
 
 import base64
+import copy
 import random
 import re
+import time
 
 try:
     from msrestazure.azure_exceptions import CloudError
@@ -729,7 +786,10 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
             started=dict(type='bool', default=True),
             data_disks=dict(type='list'),
             plan=dict(type='dict'),
-            accept_terms=dict(type='bool', default=False)
+            accept_terms=dict(type='bool', default=False),
+            count=dict(type='int'),
+            instances=dict(type='list'),
+            max_concurrency=dict(type='int', default=10)
         )
 
         self.resource_group = None
@@ -769,6 +829,9 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         self.data_disks = None
         self.plan = None
         self.accept_terms = None
+        self.count = None
+        self.instances = None
+        self.max_concurrency = None
 
         self.results = dict(
             changed=False,
@@ -777,7 +840,12 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
             ansible_facts=dict(azure_vm=None)
         )
 
+        mutually_exclusive = [('count', 'instances')] + \
+            [(fleet_option, vm_option) for fleet_option in ('count', 'instances')
+             for vm_option in ('network_interface_names', 'os_disk_name', 'storage_blob_name', 'short_hostname')]
+
         super(AzureRMVirtualMachine, self).__init__(derived_arg_spec=self.module_arg_spec,
+                                                    mutually_exclusive=mutually_exclusive,
                                                     supports_check_mode=True)
 
     def exec_module(self, **kwargs):
@@ -788,17 +856,9 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         # make sure options are lower case
         self.remove_on_absent = set([resource.lower() for resource in self.remove_on_absent])
 
-        changed = False
-        powerstate_change = None
-        results = dict()
-        vm = None
-        network_interfaces = []
-        requested_vhd_uri = None
-        data_disk_requested_vhd_uri = None
-        disable_ssh_password = None
-        vm_dict = None
         image_reference = None
         custom_image = False
+        storage_account = None
 
         resource_group = self.get_resource_group(self.resource_group)
         if not self.location:
@@ -810,16 +870,6 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         if self.state == 'present':
             # Verify parameters and resolve any defaults
 
-            if self.vm_size and not self.vm_size_is_valid():
-                self.fail("Parameter error: vm_size {0} is not valid for your subscription and location.".format(
-                    self.vm_size
-                ))
-
-            if self.network_interface_names:
-                for nic_name in self.network_interface_names:
-                    nic = self.parse_network_interface(nic_name)
-                    network_interfaces.append(nic)
-
             if self.ssh_public_keys:
                 msg = "Parameter error: expecting ssh_public_keys to be a list of type dict where " \
                     "each dict contains keys: path, key_data."
@@ -829,29 +879,23 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
                     if not key.get('path') or not key.get('key_data'):
                         self.fail(msg)
 
+            # The size, image and storage account lookups are independent, run them side by side
+            lookups = dict()
+            if self.vm_size:
+                lookups['vm_size'] = self.vm_size_is_valid
+
             if self.image and isinstance(self.image, dict):
                 if all(key in self.image for key in ('publisher', 'offer', 'sku', 'version')):
-                    marketplace_image = self.get_marketplace_image_version()
-                    if self.image['version'] == 'latest':
-                        self.image['version'] = marketplace_image.name
-                        self.log("Using image version {0}".format(self.image['version']))
-
-                    image_reference = self.compute_models.ImageReference(
-                        publisher=self.image['publisher'],
-                        offer=self.image['offer'],
-                        sku=self.image['sku'],
-                        version=self.image['version']
-                    )
+                    lookups['image'] = self.get_marketplace_image_version
                 elif self.image.get('name'):
                     custom_image = True
-                    image_reference = self.get_custom_image_reference(
-                        self.image.get('name'),
-                        self.image.get('resource_group'))
+                    lookups['image'] = lambda: self.get_custom_image_reference(self.image.get('name'),
+                                                                               self.image.get('resource_group'))
                 else:
                     self.fail("parameter error: expecting image to contain [publisher, offer, sku, version] or [name, resource_group]")
             elif self.image and isinstance(self.image, str):
                 custom_image = True
-                image_reference = self.get_custom_image_reference(self.image)
+                lookups['image'] = lambda: self.get_custom_image_reference(self.image)
             elif self.image:
                 self.fail("parameter error: expecting image to be a string or dict not {0}".format(type(self.image).__name__))
 
@@ -859,15 +903,137 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
                 if not self.plan.get('name') or not self.plan.get('product') or not self.plan.get('publisher'):
                     self.fail("parameter error: plan must include name, product, and publisher")
 
+            if self.storage_account_name and not self.managed_disk_type:
+                lookups['storage_account'] = lambda: self.get_storage_account(self.storage_account_name)
+
+            prerequisites = self.run_prerequisites(lookups)
+
+            if self.vm_size and not prerequisites['vm_size']:
+                self.fail("Parameter error: vm_size {0} is not valid for your subscription and location.".format(
+                    self.vm_size
+                ))
+
+            if custom_image:
+                image_reference = prerequisites['image']
+            elif 'image' in prerequisites:
+                if self.image['version'] == 'latest':
+                    self.image['version'] = prerequisites['image'].name
+                    self.log("Using image version {0}".format(self.image['version']))
+
+                image_reference = self.compute_models.ImageReference(
+                    publisher=self.image['publisher'],
+                    offer=self.image['offer'],
+                    sku=self.image['sku'],
+                    version=self.image['version']
+                )
+
+            storage_account = prerequisites.get('storage_account')
+
+        # an empty fleet is still a fleet, never fall back to the single virtual machine named name
+        if self.count is not None or self.instances is not None:
+            return self.exec_fleet(image_reference, custom_image, storage_account)
+
+        return self.reconcile_vm(image_reference, custom_image, storage_account)
+
+    def exec_fleet(self, image_reference, custom_image, storage_account):
+        '''
+        Reconcile every virtual machine of the fleet concurrently, sharing this module's clients and the
+        size and image lookups already done.
+
+        :return: module results with one item per virtual machine in vms
+        '''
+        if self.count is not None and self.count < 0:
+            self.fail("Parameter error: count must not be negative.")
+        if self.instances is not None:
+            names = self.instances
+        else:
+            names = ['{0}{1}'.format(self.name, index) for index in range(1, self.count + 1)]
+
+        # create the clients once, before copies of this module share them between threads
+        self.compute_client
+        self.network_client
+
+        members = dict()
+        for name in names:
+            member = copy.copy(self)
+            member.name = name
+            member.data_disks = copy.deepcopy(self.data_disks)
+            member.results = dict(
+                changed=False,
+                actions=[],
+                powerstate_change=None,
+                ansible_facts=dict(azure_vm=None)
+            )
+            members[name] = member
+
+        durations = dict()
+
+        def reconcile(member):
+            def run():
+                start = time.time()
+                try:
+                    return member.reconcile_vm(image_reference, custom_image, storage_account)
+                finally:
+                    durations[member.name] = round(time.time() - start, 2)
+            return run
+
+        start = time.time()
+        results, errors = self.run_in_parallel(dict((name, reconcile(member)) for name, member in members.items()),
+                                               max_workers=self.max_concurrency)
+
+        vms = []
+        for name in names:
+            item = dict(name=name, duration=durations.get(name))
+            if name in errors:
+                item['changed'] = False
+                item['msg'] = errors[name]
+            else:
+                item['changed'] = results[name]['changed']
+                item['azure_vm'] = results[name]['ansible_facts']['azure_vm']
+            vms.append(item)
+
+        self.results['changed'] = any(item['changed'] for item in vms)
+        self.results['vms'] = vms
+        self.results['duration'] = round(time.time() - start, 2)
+        del self.results['actions']
+
+        if errors:
+            self.fail("Error reconciling virtual machines {0}".format(', '.join(name for name in names if name in errors)),
+                      **self.results)
+        return self.results
+
+    def reconcile_vm(self, image_reference, custom_image, storage_account):
+        '''
+        Bring the virtual machine self.name to the requested state.
+
+        :param image_reference: resolved ImageReference, when state is present
+        :param custom_image: whether image_reference points to a custom image
+        :param storage_account: properties of the storage account holding the OS disk VHD, if any
+        :return: module results
+        '''
+        changed = False
+        powerstate_change = None
+        results = dict()
+        vm = None
+        network_interfaces = []
+        requested_vhd_uri = None
+        data_disk_requested_vhd_uri = None
+        disable_ssh_password = None
+        vm_dict = None
+
+        if self.state == 'present':
+            if self.network_interface_names:
+                for nic_name in self.network_interface_names:
+                    nic = self.parse_network_interface(nic_name)
+                    network_interfaces.append(nic)
+
             if not self.storage_blob_name and not self.managed_disk_type:
                 self.storage_blob_name = self.name + '.vhd'
             elif self.managed_disk_type:
                 self.storage_blob_name = self.name
 
-            if self.storage_account_name and not self.managed_disk_type:
-                properties = self.get_storage_account(self.storage_account_name)
-
-                requested_vhd_uri = '{0}{1}/{2}'.format(properties.primary_endpoints.blob,
+            if storage_account:
+                requested_vhd_uri = '{0}{1}/{2}'.format(storage_account.primary_endpoints.blob,
                                                         self.storage_container_name,
                                                         self.storage_blob_name)
 
@@ -994,23 +1160,35 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
                     if not image_reference:
                         self.fail("Parameter error: an image is required when creating a virtual machine.")
 
-                    availability_set_resource = None
+                    # The availability set, default NIC (with its public IP and security group) and default
+                    # storage account do not depend on each other, provision them concurrently
+                    prerequisite_tasks = dict()
                     if self.availability_set:
                         parsed_availability_set = parse_resource_id(self.availability_set)
-                        availability_set = self.get_availability_set(parsed_availability_set.get('resource_group', self.resource_group),
-                                                                     parsed_availability_set.get('name'))
-                        availability_set_resource = self.compute_models.SubResource(availability_set.id)
+                        prerequisite_tasks['availability_set'] = lambda: self.get_availability_set(
+                            parsed_availability_set.get('resource_group', self.resource_group),
+                            parsed_availability_set.get('name'))
+                    if not self.network_interface_names:
+                        prerequisite_tasks['nic'] = self.create_default_nic
+                    if not self.storage_account_name and not self.managed_disk_type:
+                        prerequisite_tasks['storage_account'] = self.create_default_storage_account
+
+                    prerequisites = self.run_prerequisites(prerequisite_tasks)
+
+                    availability_set_resource = None
+                    if self.availability_set:
+                        availability_set_resource = self.compute_models.SubResource(prerequisites['availability_set'].id)
 
                     # Get defaults
                     if not self.network_interface_names:
-                        default_nic = self.create_default_nic()
+                        default_nic = prerequisites['nic']
                         self.log("network interface:")
                         self.log(self.serialize_obj(default_nic, 'NetworkInterface'), pretty_print=True)
                         network_interfaces = [default_nic.id]
 
                     # os disk
                     if not self.storage_account_name and not self.managed_disk_type:
-                        storage_account = self.create_default_storage_account()
+                        storage_account = prerequisites['storage_account']
                         self.log("storage account:")
                         self.log(self.serialize_obj(storage_account, 'StorageAccount'), pretty_print=True)
                         requested_vhd_uri = 'https://{0}.blob.{1}/{2}/{3}'.format(
@@ -1378,8 +1556,7 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         self.log("Powered off virtual machine {0}".format(self.name))
         self.results['actions'].append("Powered off virtual machine {0}".format(self.name))
         try:
-            poller = self.compute_client.virtual_machines.power_off(self.resource_group, self.name)
-            self.get_poller_result(poller)
+            self.change_vm_power_state(self.resource_group, self.name, 'stopped')
         except Exception as exc:
             self.fail("Error powering off virtual machine {0} - {1}".format(self.name, str(exc)))
         return True
@@ -1388,8 +1565,7 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         self.results['actions'].append("Powered on virtual machine {0}".format(self.name))
         self.log("Power on virtual machine {0}".format(self.name))
         try:
-            poller = self.compute_client.virtual_machines.start(self.resource_group, self.name)
-            self.get_poller_result(poller)
+            self.change_vm_power_state(self.resource_group, self.name, 'running')
         except Exception as exc:
             self.fail("Error powering on virtual machine {0} - {1}".format(self.name, str(exc)))
         return True
@@ -1398,8 +1574,7 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         self.results['actions'].append("Restarted virtual machine {0}".format(self.name))
         self.log("Restart virtual machine {0}".format(self.name))
         try:
-            poller = self.compute_client.virtual_machines.restart(self.resource_group, self.name)
-            self.get_poller_result(poller)
+            self.change_vm_power_state(self.resource_group, self.name, 'restarted')
         except Exception as exc:
             self.fail("Error restarting virtual machine {0} - {1}".format(self.name, str(exc)))
         return True
@@ -1408,8 +1583,7 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         self.results['actions'].append("Deallocated virtual machine {0}".format(self.name))
         self.log("Deallocate virtual machine {0}".format(self.name))
         try:
-            poller = self.compute_client.virtual_machines.deallocate(self.resource_group, self.name)
-            self.get_poller_result(poller)
+            self.change_vm_power_state(self.resource_group, self.name, 'deallocated')
         except Exception as exc:
             self.fail("Error deallocating virtual machine {0} - {1}".format(self.name, str(exc)))
         return True
@@ -1537,12 +1711,12 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
             container_name = blob_parts['containername']
             blob_name = blob_parts['blobname']
 
-            blob_client = self.get_blob_client(self.resource_group, storage_account_name)
-
             self.log("Delete blob {0}:{1}".format(container_name, blob_name))
             self.results['actions'].append("Deleted blob {0}:{1}".format(container_name, blob_name))
             try:
-                blob_client.delete_blob(container_name, blob_name)
+                # the blob client and key of the account are cached, so VHDs sharing an account list its keys once
+                self.call_blob_client(self.resource_group, storage_account_name,
+                                      lambda blob_client: blob_client.delete_blob(container_name, blob_name))
             except Exception as exc:
                 self.fail("Error deleting blob {0}:{1} - {2}".format(container_name, blob_name, str(exc)))
 
@@ -1601,6 +1775,18 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
         except Exception as exc:
             self.fail("Error fetching storage account {0} - {1}".format(name, str(exc)))
 
+    def run_prerequisites(self, tasks):
+        '''
+        Run independent lookups or provisioning steps concurrently, failing if any of them failed.
+
+        :param tasks: dict of name to callable
+        :return: dict of name to result
+        '''
+        results, errors = self.run_in_parallel(tasks)
+        if errors:
+            self.fail('; '.join(errors[key] for key in sorted(errors)))
+        return results
+
     def create_or_update_vm(self, params):
         try:
             poller = self.compute_client.virtual_machines.create_or_update(self.resource_group, self.name, params)
@@ -1704,6 +1890,59 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
 
         self.log("NIC {0} does not exist.".format(network_interface_name))
 
+        # The subnet lookup, public IP and security group are independent of each other
+        tasks = dict(subnet_id=self.get_default_subnet_id)
+        if self.public_ip_allocation_method != 'Disabled':
+            self.results['actions'].append('Created default public IP {0}'.format(self.name + '01'))
+            tasks['pip'] = lambda: self.create_default_pip(self.resource_group, self.location, self.name + '01',
+                                                           self.public_ip_allocation_method)
+
+        self.results['actions'].append('Created default security group {0}'.format(self.name + '01'))
+        tasks['group'] = lambda: self.create_default_securitygroup(self.resource_group, self.location, self.name + '01',
+                                                                   self.os_type, self.open_ports)
+        prerequisites = self.run_prerequisites(tasks)
+
+        subnet_id = prerequisites['subnet_id']
+        group = prerequisites['group']
+        pip = None
+        if prerequisites.get('pip'):
+            pip_info = prerequisites['pip']
+            pip = self.network_models.PublicIPAddress(id=pip_info.id, location=pip_info.location, resource_guid=pip_info.resource_guid)
+
+        parameters = self.network_models.NetworkInterface(
+            location=self.location,
+            ip_configurations=[
+                self.network_models.NetworkInterfaceIPConfiguration(
+                    private_ip_allocation_method='Dynamic',
+                )
+            ]
+        )
+        parameters.ip_configurations[0].subnet = self.network_models.Subnet(id=subnet_id)
+        parameters.ip_configurations[0].name = 'default'
+        parameters.network_security_group = self.network_models.NetworkSecurityGroup(id=group.id,
+                                                                                     location=group.location,
+                                                                                     resource_guid=group.resource_guid)
+        parameters.ip_configurations[0].public_ip_address = pip
+
+        self.log("Creating NIC {0}".format(network_interface_name))
+        self.log(self.serialize_obj(parameters, 'NetworkInterface'), pretty_print=True)
+        self.results['actions'].append("Created NIC {0}".format(network_interface_name))
+        try:
+            poller = self.network_client.network_interfaces.create_or_update(self.resource_group,
+                                                                             network_interface_name,
+                                                                             parameters)
+            new_nic = self.get_poller_result(poller)
+        except Exception as exc:
+            self.fail("Error creating network interface {0} - {1}".format(network_interface_name, str(exc)))
+        return new_nic
+
+    def get_default_subnet_id(self):
+        '''
+        Find the subnet for a default NIC, either the requested one or the first subnet of the first
+        virtual network in the resource group.
+
+        :return: subnet ID
+        '''
         virtual_network_resource_group = None
         if self.virtual_network_resource_group:
             virtual_network_resource_group = self.virtual_network_resource_group
@@ -1763,42 +2002,7 @@ class AzureRMVirtualMachine(AzureRMModuleBase):
             if not subnet_id:
                 self.fail(no_subnets_msg)
 
-        pip = None
-        if self.public_ip_allocation_method != 'Disabled':
-            self.results['actions'].append('Created default public IP {0}'.format(self.name + '01'))
-            pip_info = self.create_default_pip(self.resource_group, self.location, self.name + '01', self.public_ip_allocation_method)
-            pip = self.network_models.PublicIPAddress(id=pip_info.id, location=pip_info.location, resource_guid=pip_info.resource_guid)
-
-        self.results['actions'].append('Created default security group {0}'.format(self.name + '01'))
-        group = self.create_default_securitygroup(self.resource_group, self.location, self.name + '01', self.os_type,
-                                                  self.open_ports)
-
-        parameters = self.network_models.NetworkInterface(
-            location=self.location,
-            ip_configurations=[
-                self.network_models.NetworkInterfaceIPConfiguration(
-                    private_ip_allocation_method='Dynamic',
-                )
-            ]
-        )
-        parameters.ip_configurations[0].subnet = self.network_models.Subnet(id=subnet_id)
-        parameters.ip_configurations[0].name = 'default'
-        parameters.network_security_group = self.network_models.NetworkSecurityGroup(id=group.id,
-                                                                                     location=group.location,
-                                                                                     resource_guid=group.resource_guid)
-        parameters.ip_configurations[0].public_ip_address = pip
-
-        self.log("Creating NIC {0}".format(network_interface_name))
-        self.log(self.serialize_obj(parameters, 'NetworkInterface'), pretty_print=True)
-        self.results['actions'].append("Created NIC {0}".format(network_interface_name))
-        try:
-            poller = self.network_client.network_interfaces.create_or_update(self.resource_group,
-                                                                             network_interface_name,
-                                                                             parameters)
-            new_nic = self.get_poller_result(poller)
-        except Exception as exc:
-            self.fail("Error creating network interface {0} - {1}".format(network_interface_name, str(exc)))
-        return new_nic
+        return subnet_id
 
     def parse_network_interface(self, nic):
         nic = self.parse_resource_to_dict(nic)
@@ -0,0 +1,333 @@
+#!/usr/bin/python
+#
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+
+DOCUMENTATION = '''
+---
+module: azure_rm_virtualmachine_power
+
+version_added: "2.8"
+
+short_description: Change the power state of many virtual machines at once.
+
+description:
+    - Start, stop, deallocate or restart a set of virtual machines selected by name, resource group and tags.
+    - The virtual machines are processed concurrently from a single task, at most I(max_concurrency) at a time, and
+      machines already in the requested power state are left alone.
+
+options:
+    resource_group:
+        description:
+            - Name of the resource group containing the virtual machines.
+            - Required when I(names) contains plain names. When I(names) is not set, all virtual machines of the
+              resource group are selected, or all virtual machines of the subscription if omitted.
+    names:
+        description:
+            - List of virtual machines to select, as names or resource IDs.
+        type: list
+    tags:
+        description:
+            - Only select virtual machines having these tags. Format tags as 'key' or 'key:value'.
+        type: list
+    power_state:
+        description:
+            - Requested power state of the selected virtual machines.
+            - C(restarted) restarts the machines that are running.
+        required: true
+        choices:
+            - running
+            - stopped
+            - deallocated
+            - restarted
+    max_concurrency:
+        description:
+            - Maximum number of virtual machines inspected, or power operations requested, at the same time.
+            - The operations are not counted once requested, all of them run on Azure together.
+        type: int
+        default: 10
+    wait:
+        description:
+            - Wait for every power operation to complete.
+            - When C(no), the module returns as soon as Azure accepted all the operations, which is usually enough
+              for jobs like nightly deallocation.
+        type: bool
+        default: yes
+
+extends_documentation_fragment:
+    - azure
+
+author:
+    - "Ansible Project"
+'''
+
+EXAMPLES = '''
+- name: Deallocate all development VMs of the subscription
+  azure_rm_virtualmachine_power:
+    tags:
+      - environment:dev
+    power_state: deallocated
+    max_concurrency: 50
+    wait: no
+
+- name: Start the web servers
+  azure_rm_virtualmachine_power:
+    resource_group: Testing
+    names:
+      - web1
+      - web2
+      - web3
+    power_state: running
+'''
+
+RETURN = '''
+vms:
+    description: Result for each selected virtual machine.
+    returned: always
+    type: complex
+    contains:
+        id:
+            description:
+                - Resource ID of the virtual machine.
+            returned: always
+            type: str
+            sample: /subscriptions/xxxx/resourceGroups/Testing/providers/Microsoft.Compute/virtualMachines/web1
+        name:
+            description:
+                - Name of the virtual machine.
+            returned: always
+            type: str
+            sample: web1
+        resource_group:
+            description:
+                - Resource group of the virtual machine.
+            returned: always
+            type: str
+            sample: Testing
+        tags:
+            description:
+                - Tags of the virtual machine.
+            returned: always
+            type: dict
+            sample: { "environment": "dev" }
+        power_state:
+            description:
+                - Power state of the virtual machine before the operation.
+            returned: always
+            type: str
+            sample: running
+        changed:
+            description:
+                - Whether an operation was started on the virtual machine.
+            returned: always
+            type: bool
+            sample: true
+        duration:
+            description:
+                - Time in seconds taken by the operation, or to request it when I(wait=no).
+            returned: when changed
+            type: float
+            sample: 62.37
+        msg:
+            description:
+                - Error message when the operation failed.
+            returned: on failure
+            type: str
+duration:
+    description: Time in seconds taken to process all the virtual machines.
+    returned: always
+    type: float
+    sample: 95.12
+'''
+
+import time
+
+try:
+    from msrestazure.azure_exceptions import CloudError
+    from msrestazure.tools import parse_resource_id, is_valid_resource_id
+except ImportError:
+    # This is handled in azure_rm_common
+    pass
+
+from ansible.module_utils.azure_rm_common import AzureRMModuleBase
+
+
+# Power states from which each requested state needs no operation
+AZURE_VM_SETTLED_POWER_STATES = dict(
+    running=['starting', 'running'],
+    stopped=['stopping', 'stopped', 'deallocating', 'deallocated'],
+    deallocated=['deallocating', 'deallocated']
+)
+
+
+class AzureRMVirtualMachinePower(AzureRMModuleBase):
+
+    def __init__(self):
+
+        self.module_arg_spec = dict(
+            resource_group=dict(type='str'),
+            names=dict(type='list'),
+            tags=dict(type='list'),
+            power_state=dict(type='str', required=True, choices=['running', 'stopped', 'deallocated', 'restarted']),
+            max_concurrency=dict(type='int', default=10),
+            wait=dict(type='bool', default=True)
+        )
+
+        self.resource_group = None
+        self.names = None
+        self.tags = None
+        self.power_state = None
+        self.max_concurrency = None
+        self.wait = None
+
+        self.results = dict(
+            changed=False,
+            vms=[]
+        )
+
+        super(AzureRMVirtualMachinePower, self).__init__(self.module_arg_spec,
+                                                         supports_check_mode=True,
+                                                         supports_tags=False)
+
+    def exec_module(self, **kwargs):
+
+        for key in self.module_arg_spec:
+            setattr(self, key, kwargs[key])
+
+        start = time.time()
+
+        # create the client once, before the workers share it between threads
+        self.compute_client
+
+        # look up the current power state of every candidate concurrently
+        candidates = self.select_vms()
+        vms, errors = self.run_in_parallel(dict((vm_id, self.get_vm_getter(vm_id)) for vm_id in candidates),
+                                           max_workers=self.max_concurrency)
+        if errors:
+            self.fail("Error getting virtual machines - {0}".format('; '.join(errors[key] for key in sorted(errors))))
+
+        selected = [vms[vm_id] for vm_id in candidates if vms.get(vm_id) and self.has_tags(vms[vm_id]['tags'], self.tags)]
+        for vm in selected:
+            vm['changed'] = self.needs_change(vm['power_state'])
+
+        self.results['vms'] = selected
+        self.results['changed'] = any(vm['changed'] for vm in selected)
+
+        if not self.check_mode:
+            starts = dict()
+            changes = dict((vm['id'], self.get_power_operation(vm, starts)) for vm in selected if vm['changed'])
+            if self.wait:
+                by_id = dict((vm['id'], vm) for vm in selected)
+
+                def record_duration(vm_id):
+                    by_id[vm_id]['duration'] = round(time.time() - starts[vm_id], 2)
+
+                results, errors = self.run_operations_in_parallel(changes, max_workers=self.max_concurrency, done=record_duration)
+            else:
+                results, errors = self.run_in_parallel(changes, max_workers=self.max_concurrency)
+            for vm in selected:
+                if vm['id'] in errors:
+                    vm['msg'] = errors[vm['id']]
+
+            if errors:
+                self.results['duration'] = round(time.time() - start, 2)
+                self.fail("Error changing power state of virtual machines {0}".format(
+                    ', '.join(vm['name'] for vm in selected if vm.get('msg'))), **self.results)
+
+        self.results['duration'] = round(time.time() - start, 2)
+        return self.results
+
+    def validate_tags(self, tags):
+        # tags filters the selected virtual machines here, it is not a dict of tags to set
+        pass
+
+    def select_vms(self):
+        '''
+        Resolve the candidate virtual machines, without their power state.
+
+        :return: list of virtual machine resource IDs
+        '''
+        if self.names:
+            vm_ids = []
+            for name in self.names:
+                if is_valid_resource_id(name):
+                    vm_ids.append(name)
+                elif not self.resource_group:
+                    self.fail("Parameter error: resource_group required when selecting virtual machine {0} by name.".format(name))
+                else:
+                    vm_ids.append('/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.Compute/virtualMachines/{2}'.format(
+                        self.subscription_id, self.resource_group, name))
+            return vm_ids
+
+        try:
+            if self.resource_group:
+                items = self.compute_client.virtual_machines.list(self.resource_group)
+            else:
+                items = self.compute_client.virtual_machines.list_all()
+            # filter on tags here already, to skip the instance view of machines which will not be selected
+            return [item.id for item in items if self.has_tags(item.tags, self.tags)]
+        except CloudError as exc:
+            self.fail("Failed to list virtual machines - {0}".format(str(exc)))
+
+    def get_vm_getter(self, vm_id):
+        def get_vm():
+            vm_dict = parse_resource_id(vm_id)
+            try:
+                vm = self.compute_client.virtual_machines.get(vm_dict['resource_group'], vm_dict['name'], expand='instanceview')
+            except CloudError as exc:
+                if exc.status_code == 404:
+                    self.module.warn("Virtual machine {0} not found".format(vm_dict['name']))
+                    return None
+                raise
+            power_state = None
+            if vm.instance_view:
+                power_state = next((status.code.replace('PowerState/', '') for status in vm.instance_view.statuses
+                                    if status.code.startswith('PowerState')), None)
+            return dict(
+                id=vm.id,
+                name=vm.name,
+                resource_group=vm_dict['resource_group'],
+                tags=vm.tags,
+                power_state=power_state
+            )
+        return get_vm
+
+    def needs_change(self, power_state):
+        if self.power_state == 'restarted':
+            return power_state == 'running'
+        return power_state not in AZURE_VM_SETTLED_POWER_STATES[self.power_state]
+
+    def get_power_operation(self, vm, starts):
+        '''
+        Request the power operation of a virtual machine, without waiting for it.
+
+        :param starts: dict of virtual machine ID to the time its operation was requested, filled in
+        :return: callable returning the poller of the operation
+        '''
+        def change_power_state():
+            starts[vm['id']] = time.time()
+            try:
+                return self.change_vm_power_state(vm['resource_group'], vm['name'], self.power_state, wait=False)
+            except Exception as exc:
+                self.fail("Error changing power state of virtual machine {0} - {1}".format(vm['name'], str(exc)))
+            finally:
+                if not self.wait:
+                    vm['duration'] = round(time.time() - starts[vm['id']], 2)
+        return change_power_state
+
+
+def main():
+    AzureRMVirtualMachinePower()
+
+
+if __name__ == '__main__':
+    main()
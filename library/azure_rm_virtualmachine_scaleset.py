@@ -197,6 +197,29 @@ options:
         version_added: "2.7"
         aliases:
             - security_group_name
+    update_instances:
+        description:
+            - Roll the scale set model out to the instances which are not running the latest model yet.
+            - Use it with I(upgrade_policy=Manual) to control how a change to the model reaches the instances.
+            - Instances are upgraded in batches of I(upgrade_batch_size), in order of instance ID. The next batch is
+              only started once every instance of the current batch passed the health check.
+        type: bool
+        default: no
+        version_added: "2.8"
+    upgrade_batch_size:
+        description:
+            - Number of instances upgraded at once when I(update_instances=yes).
+        type: int
+        default: 1
+        version_added: "2.8"
+    upgrade_health_timeout:
+        description:
+            - Time in seconds to wait for the instances of a batch to be healthy before stopping the rollout.
+            - An instance is healthy when its provisioning succeeded, and it is running again if it was running before the upgrade.
+            - Set to C(0) to skip the health check between batches.
+        type: int
+        default: 300
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -260,6 +283,17 @@ EXAMPLES = '''
     image:
       name: customimage001
       resource_group: Testing
+
+- name: Change the image of a VMSS and upgrade its instances two at a time
+  azure_rm_virtualmachine_scaleset:
+    resource_group: Testing
+    name: testvmss
+    vm_size: Standard_DS1_v2
+    capacity: 6
+    upgrade_policy: Manual
+    image: customimage002
+    update_instances: yes
+    upgrade_batch_size: 2
 '''
 
 RETURN = '''
@@ -352,10 +386,33 @@ azure_vmss:
         "tags": null,
         "type": "Microsoft.Compute/virtualMachineScaleSets"
     }
+upgrade_batches:
+    description: Instances upgraded by each batch, when I(update_instances=yes).
+    returned: when instances were upgraded
+    type: complex
+    contains:
+        instance_ids:
+            description:
+                - Instance IDs of the batch.
+            type: list
+            sample: ["0", "1"]
+        duration:
+            description:
+                - Time in seconds taken to upgrade the batch and check its health.
+            type: float
+            sample: 153.08
+        healthy:
+            description:
+                - Whether every instance of the batch passed the health check.
+            type: bool
+            sample: true
 '''  # NOQA
 
 import random
 import re
+import time
+
+from collections import OrderedDict
 
 try:
     from msrestazure.azure_exceptions import CloudError
@@ -403,7 +460,10 @@ class AzureRMVirtualMachineScaleSet(AzureRMModuleBase):
             virtual_network_name=dict(type='str', aliases=['virtual_network']),
             remove_on_absent=dict(type='list', default=['all']),
             enable_accelerated_networking=dict(type='bool'),
-            security_group=dict(type='raw', aliases=['security_group_name'])
+            security_group=dict(type='raw', aliases=['security_group_name']),
+            update_instances=dict(type='bool', default=False),
+            upgrade_batch_size=dict(type='int', default=1),
+            upgrade_health_timeout=dict(type='int', default=300)
         )
 
         self.resource_group = None
@@ -432,6 +492,9 @@ class AzureRMVirtualMachineScaleSet(AzureRMModuleBase):
         self.load_balancer = None
         self.enable_accelerated_networking = None
         self.security_group = None
+        self.update_instances = None
+        self.upgrade_batch_size = None
+        self.upgrade_health_timeout = None
 
         self.results = dict(
             changed=False,
@@ -565,6 +628,10 @@ class AzureRMVirtualMachineScaleSet(AzureRMModuleBase):
 
                 self.differences = differences
 
+                if self.update_instances and not differences and self.get_outdated_instances():
+                    self.log('CHANGED: virtual machine scale set {0} - instances not on the latest model'.format(self.name))
+                    changed = True
+
             elif self.state == 'absent':
                 self.log("CHANGED: virtual machine scale set {0} exists and requested state is 'absent'".format(self.name))
                 results = dict()
@@ -741,6 +808,9 @@ class AzureRMVirtualMachineScaleSet(AzureRMModuleBase):
                     self.log("Update virtual machine with parameters:")
                     self.create_or_update_vmss(vmss_resource)
 
+                if vmss and self.update_instances:
+                    self.upgrade_instances()
+
                 self.results['ansible_facts']['azure_vmss'] = self.serialize_vmss(self.get_vmss())
 
             elif self.state == 'absent':
@@ -866,6 +936,102 @@ class AzureRMVirtualMachineScaleSet(AzureRMModuleBase):
         except CloudError as exc:
             self.fail("Error creating or updating virtual machine {0} - {1}".format(self.name, str(exc)))
 
+    def get_outdated_instances(self):
+        '''
+        List the instances not running the latest scale set model.
+
+        :return: dict of instance ID to power state, ordered by instance ID
+        '''
+        try:
+            instances = self.compute_client.virtual_machine_scale_set_vms.list(self.resource_group, self.name, expand='instanceView')
+            outdated = [(instance.instance_id, self.get_instance_power_state(instance.instance_view))
+                        for instance in instances if not instance.latest_model_applied]
+        except CloudError as exc:
+            self.fail("Error listing instances of virtual machine scale set {0} - {1}".format(self.name, str(exc)))
+        return OrderedDict(sorted(outdated, key=lambda item: int(item[0])))
+
+    def get_instance_power_state(self, instance_view):
+        if not instance_view or not instance_view.statuses:
+            return None
+        return next((status.code.replace('PowerState/', '') for status in instance_view.statuses
+                     if status.code.startswith('PowerState/')), None)
+
+    def upgrade_instances(self):
+        '''
+        Upgrade the outdated instances batch by batch. While a batch is being upgraded, the state of the
+        remaining instances is refreshed so the next batch skips instances removed or upgraded meanwhile.
+        '''
+        outdated = self.get_outdated_instances()
+        batch = list(outdated.keys())[:self.upgrade_batch_size]
+        self.results['upgrade_batches'] = []
+
+        while batch:
+            self.log("Upgrading instances {0} of virtual machine scale set {1}".format(', '.join(batch), self.name))
+            self.results['actions'].append("Upgraded instances {0} of VMSS {1}".format(', '.join(batch), self.name))
+            start = time.time()
+            try:
+                poller = self.compute_client.virtual_machine_scale_sets.update_instances(self.resource_group, self.name, batch)
+            except CloudError as exc:
+                self.fail("Error upgrading instances of virtual machine scale set {0} - {1}".format(self.name, str(exc)), **self.results)
+
+            # the poller runs in its own thread, prepare the next batch meanwhile
+            remaining = self.get_outdated_instances()
+            for instance_id in batch:
+                remaining.pop(instance_id, None)
+            next_batch = list(remaining.keys())[:self.upgrade_batch_size]
+
+            try:
+                self.get_poller_result(poller)
+            except CloudError as exc:
+                self.fail("Error upgrading instances of virtual machine scale set {0} - {1}".format(self.name, str(exc)), **self.results)
+
+            running = [instance_id for instance_id in batch if outdated.get(instance_id) == 'running']
+            healthy = self.wait_for_healthy_instances(batch, running)
+            self.results['upgrade_batches'].append(dict(
+                instance_ids=batch,
+                duration=round(time.time() - start, 2),
+                healthy=healthy
+            ))
+            if not healthy:
+                self.fail("Instances {0} of virtual machine scale set {1} are not healthy after upgrade, "
+                          "stopping the rollout".format(', '.join(batch), self.name), **self.results)
+
+            outdated.update(remaining)
+            batch = next_batch
+
+    def wait_for_healthy_instances(self, instance_ids, running):
+        '''
+        Wait until every instance succeeded provisioning and the ones in running are running again.
+
+        :param instance_ids: list of instance IDs to check
+        :param running: instance IDs which were running before the upgrade
+        :return: boolean
+        '''
+        if not self.upgrade_health_timeout:
+            return True
+
+        def get_instance_view_getter(instance_id):
+            return lambda: self.compute_client.virtual_machine_scale_set_vms.get_instance_view(self.resource_group, self.name, instance_id)
+
+        deadline = time.time() + self.upgrade_health_timeout
+        pending = list(instance_ids)
+        while True:
+            views, errors = self.run_in_parallel(dict((instance_id, get_instance_view_getter(instance_id)) for instance_id in pending))
+            for instance_id, view in views.items():
+                codes = [status.code for status in view.statuses or []]
+                if 'ProvisioningState/succeeded' not in codes:
+                    continue
+                if instance_id in running and 'PowerState/running' not in codes:
+                    continue
+                pending.remove(instance_id)
+            if not pending:
+                return True
+            if time.time() >= deadline:
+                self.log("Instances {0} of virtual machine scale set {1} not healthy - {2}".format(
+                    ', '.join(pending), self.name, '; '.join(errors.values())))
+                return False
+            time.sleep(10)
+
     def vm_size_is_valid(self):
         '''
         Validate self.vm_size against the list of virtual machine sizes available for the account and location.
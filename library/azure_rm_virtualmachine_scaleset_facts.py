@@ -44,6 +44,14 @@ options:
             - 'curated'
             - 'raw'
         version_added: "2.6"
+    include_instances:
+        description:
+            - Also return the instances of each virtual machine scale set, with their power state, whether they run the
+              latest model, and their private IP addresses.
+            - The instances and the network interfaces of a scale set are each listed with a single paged request.
+        type: bool
+        default: no
+        version_added: "2.8"
 
 extends_documentation_fragment:
     - azure
@@ -68,6 +76,12 @@ EXAMPLES = '''
         resource_group: Testing
         tags:
           - testing
+
+    - name: Get the instances of a virtual machine scale set
+      azure_rm_virtualmachine_scaleset_facts:
+        resource_group: Testing
+        name: testvmss001
+        include_instances: yes
 '''
 
 RETURN = '''
@@ -228,13 +242,59 @@ vmss:
             description: Tags assigned to the resource. Dictionary of string:string pairs.
             type: dict
             sample: { "tag1": "abc" }
+        instances:
+            description:
+                - Instances of the virtual machine scale set.
+            returned: when I(include_instances=yes)
+            type: complex
+            contains:
+                instance_id:
+                    description:
+                        - Instance ID.
+                    type: str
+                    sample: "0"
+                id:
+                    description:
+                        - Resource ID of the instance.
+                    type: str
+                    sample: /subscriptions/xxxx/resourceGroups/testrg/providers/Microsoft.Compute/virtualMachineScaleSets/myvmss/virtualMachines/0
+                name:
+                    description:
+                        - Name of the instance.
+                    type: str
+                    sample: myvmss_0
+                computer_name:
+                    description:
+                        - Host name of the instance.
+                    type: str
+                    sample: myvmss000000
+                power_state:
+                    description:
+                        - Power state of the instance.
+                    type: str
+                    sample: running
+                provisioning_state:
+                    description:
+                        - Provisioning state of the instance.
+                    type: str
+                    sample: Succeeded
+                latest_model_applied:
+                    description:
+                        - Whether the instance runs the latest model of the scale set.
+                    type: bool
+                    sample: true
+                private_ip_addresses:
+                    description:
+                        - Private IP addresses of the instance.
+                    type: list
+                    sample: ["10.0.0.4"]
 '''  # NOQA
 
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
-import re
 
 try:
     from msrestazure.azure_exceptions import CloudError
+    from msrestazure.tools import parse_resource_id
 except:
     # handled in azure_rm_common
     pass
@@ -258,7 +318,8 @@ class AzureRMVirtualMachineScaleSetFacts(AzureRMModuleBase):
                 choices=['curated',
                          'raw'],
                 default='raw'
-            )
+            ),
+            include_instances=dict(type='bool', default=False)
         )
 
         self.results = dict(
@@ -272,6 +333,7 @@ class AzureRMVirtualMachineScaleSetFacts(AzureRMModuleBase):
         self.resource_group = None
         self.format = None
         self.tags = None
+        self.include_instances = None
 
         super(AzureRMVirtualMachineScaleSetFacts, self).__init__(
             derived_arg_spec=self.module_args,
@@ -291,6 +353,9 @@ class AzureRMVirtualMachineScaleSetFacts(AzureRMModuleBase):
         else:
             self.results['ansible_facts']['azure_vmss'] = self.list_items()
 
+        if self.include_instances:
+            self.add_instances(self.results['ansible_facts']['azure_vmss'])
+
         if self.format == 'curated':
             for index in range(len(self.results['ansible_facts']['azure_vmss'])):
                 vmss = self.results['ansible_facts']['azure_vmss'][index]
@@ -302,15 +367,16 @@ class AzureRMVirtualMachineScaleSetFacts(AzureRMModuleBase):
                 try:
                     subnet_id = (vmss['properties']['virtualMachineProfile']['networkProfile']['networkInterfaceConfigurations'][0]
                                  ['properties']['ipConfigurations'][0]['properties']['subnet']['id'])
-                    subnet_name = re.sub('.*subnets\\/', '', subnet_id)
+                    subnet_dict = parse_resource_id(subnet_id)
+                    subnet_name = subnet_dict.get('child_name_1')
                 except:
                     self.log('Could not extract subnet name')
 
                 try:
                     backend_address_pool_id = (vmss['properties']['virtualMachineProfile']['networkProfile']['networkInterfaceConfigurations'][0]
                                                ['properties']['ipConfigurations'][0]['properties']['loadBalancerBackendAddressPools'][0]['id'])
-                    load_balancer_name = re.sub('\\/backendAddressPools.*', '', re.sub('.*loadBalancers\\/', '', backend_address_pool_id))
-                    virtual_network_name = re.sub('.*virtualNetworks\\/', '', re.sub('\\/subnets.*', '', subnet_id))
+                    load_balancer_name = parse_resource_id(backend_address_pool_id).get('name')
+                    virtual_network_name = subnet_dict.get('name')
                 except:
                     self.log('Could not extract load balancer / virtual network name')
 
@@ -355,6 +421,8 @@ class AzureRMVirtualMachineScaleSetFacts(AzureRMModuleBase):
                     'load_balancer': load_balancer_name,
                     'tags': vmss.get('tags')
                 }
+                if self.include_instances:
+                    updated['instances'] = vmss['instances']
 
                 self.results['ansible_facts']['azure_vmss'][index] = updated
 
@@ -399,6 +467,59 @@ class AzureRMVirtualMachineScaleSetFacts(AzureRMModuleBase):
 
         return results
 
+    def add_instances(self, items):
+        """Add the instances of each virtual machine scale set, listing instances and network interfaces concurrently"""
+
+        tasks = dict()
+        for item in items:
+            resource_group = parse_resource_id(item['id'])['resource_group']
+            tasks[(item['id'], 'instances')] = self.get_instances_lister(resource_group, item['name'])
+            tasks[(item['id'], 'ips')] = self.get_private_ips_lister(resource_group, item['name'])
+
+        results, errors = self.run_in_parallel(tasks)
+        if errors:
+            self.fail('Failed to list instances - {0}'.format('; '.join(set(errors.values()))))
+
+        for item in items:
+            private_ips = results[(item['id'], 'ips')]
+            instances = results[(item['id'], 'instances')]
+            for instance in instances:
+                instance['private_ip_addresses'] = private_ips.get(instance['id'].lower(), [])
+            item['instances'] = instances
+
+    def get_instances_lister(self, resource_group, name):
+        def list_instances():
+            instances = []
+            # the paged response fetches the next page only once the current one is consumed
+            for vm in self.compute_client.virtual_machine_scale_set_vms.list(resource_group, name, expand='instanceView'):
+                power_state = None
+                if vm.instance_view and vm.instance_view.statuses:
+                    power_state = next((status.code.replace('PowerState/', '') for status in vm.instance_view.statuses
+                                        if status.code.startswith('PowerState/')), None)
+                instances.append(dict(
+                    instance_id=vm.instance_id,
+                    id=vm.id,
+                    name=vm.name,
+                    computer_name=vm.os_profile.computer_name if vm.os_profile else None,
+                    power_state=power_state,
+                    provisioning_state=vm.provisioning_state,
+                    latest_model_applied=vm.latest_model_applied
+                ))
+            return instances
+        return list_instances
+
+    def get_private_ips_lister(self, resource_group, name):
+        def list_private_ips():
+            private_ips = dict()
+            nics = self.network_client.network_interfaces.list_virtual_machine_scale_set_network_interfaces(resource_group, name)
+            for nic in nics:
+                if not nic.virtual_machine:
+                    continue
+                ips = private_ips.setdefault(nic.virtual_machine.id.lower(), [])
+                ips.extend(config.private_ip_address for config in nic.ip_configurations or [] if config.private_ip_address)
+            return private_ips
+        return list_private_ips
+
 
 def main():
     """Main module execution code path"""
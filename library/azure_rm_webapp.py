@@ -28,9 +28,15 @@ options:
         required: True
     name:
         description:
-            - Unique name of the app to create or update. To create or update a deployment slot, use the {slot} parameter.
+            - Unique name of the app to create or update. To create or update a deployment slot, use the I(slot) parameter.
         required: True
 
+    slot:
+        description:
+            - Name of a deployment slot of the web app I(name) to create, update or delete instead of the web app itself.
+            - A new slot uses the app service plan of the web app unless I(plan) is set.
+        version_added: "2.8"
+
     location:
         description:
             - Resource location. If not set, location from the resource group will be used as default.
@@ -152,6 +158,7 @@ options:
     app_settings:
         description:
             - Configure web app application settings. Suboptions are in key value pair format.
+            - When only the application settings of an existing web app change, they are sent alone instead of updating the whole web app.
 
     purge_app_settings:
         description:
@@ -168,6 +175,44 @@ options:
             - restarted
         default: started
 
+    package:
+        description:
+            - Local path of a zip package to deploy to the web app, or to the deployment slot I(slot), with zip deploy.
+            - The package is streamed to the SCM site with the publishing credentials of the web app, retrying transient
+              failures, and the module waits for the deployment to complete.
+            - The package is not deployed again while it is the latest successful deployment.
+        type: path
+        version_added: "2.8"
+
+    package_timeout:
+        description:
+            - Time in seconds to wait for the deployment of I(package), upload included.
+        type: int
+        default: 900
+        version_added: "2.8"
+
+    swap:
+        description:
+            - Swap the deployment slot I(slot) with another slot of the web app once the slot is up to date.
+            - This releases a warmed-up slot without restarting production.
+            - The swap only runs when the slot was created or updated, or its I(package) deployed, by the task, unless I(force) is set.
+        type: dict
+        version_added: "2.8"
+        suboptions:
+            target_slot:
+                description:
+                    - Name of the slot to swap with. Defaults to production.
+            preserve_vnet:
+                description:
+                    - Preserve the virtual network of the target slot during the swap.
+                type: bool
+                default: True
+            force:
+                description:
+                    - Swap the slots on every execution of the task, even when the slot is unchanged.
+                type: bool
+                default: False
+
     state:
       description:
         - Assert the state of the Web App.
@@ -269,6 +314,23 @@ EXAMPLES = '''
             settings:
               java_container: "Tomcat"
               java_container_version: "8.5"
+
+    - name: Update the staging slot of a web app and swap it with production
+      azure_rm_webapp:
+        resource_group: myresourcegroup
+        name: mywinwebapp
+        slot: staging
+        app_settings:
+          release: "2.1"
+        swap:
+          preserve_vnet: yes
+
+    - name: Deploy a release package to the staging slot of a web app
+      azure_rm_webapp:
+        resource_group: myresourcegroup
+        name: mywinwebapp
+        slot: staging
+        package: /tmp/release.zip
 '''
 
 RETURN = '''
@@ -279,10 +341,32 @@ azure_webapp:
     sample: {
         "id": "/subscriptions/<subscription_id>/resourceGroups/ansiblewebapp1/providers/Microsoft.Web/sites/ansiblewindowsaaa"
     }
+deployment:
+    description: Zip deployment of I(package).
+    returned: when I(package) is set
+    type: complex
+    contains:
+        id:
+            description: ID of the deployment.
+            returned: when deployed
+            type: str
+            sample: 5e4d7a1f0a9b4f6c9a8e8d1f2c3b4a59
+        message:
+            description: Message of the deployment, recording the sha256 digest of the package.
+            returned: always
+            type: str
+            sample: "Ansible zip deployment sha256:bb056b9b7eb0b06bf860c0f7570b012e7cde43ec3c887eca693d2e12f67f8fcf"
+        duration:
+            description: Time in seconds taken to upload and deploy the package.
+            returned: when deployed
+            type: float
+            sample: 42.17
 '''
 
+import functools
 import time
 from ansible.module_utils.azure_rm_common import AzureRMModuleBase
+from ansible.module_utils._text import to_text
 
 try:
     from msrestazure.azure_exceptions import CloudError
@@ -303,6 +387,12 @@ container_settings_spec = dict(
     registry_server_password=dict(type='str', no_log=True)
 )
 
+swap_spec = dict(
+    target_slot=dict(type='str'),
+    preserve_vnet=dict(type='bool', default=True),
+    force=dict(type='bool', default=False)
+)
+
 deployment_source_spec = dict(
     url=dict(type='str'),
     branch=dict(type='str')
@@ -404,6 +494,9 @@ class AzureRMWebApps(AzureRMModuleBase):
                 type='str',
                 required=True
             ),
+            slot=dict(
+                type='str'
+            ),
             location=dict(
                 type='str'
             ),
@@ -457,6 +550,17 @@ class AzureRMWebApps(AzureRMModuleBase):
                 choices=['started', 'stopped', 'restarted'],
                 default='started'
             ),
+            package=dict(
+                type='path'
+            ),
+            package_timeout=dict(
+                type='int',
+                default=900
+            ),
+            swap=dict(
+                type='dict',
+                options=swap_spec
+            ),
             state=dict(
                 type='str',
                 default='present',
@@ -468,6 +572,7 @@ class AzureRMWebApps(AzureRMModuleBase):
 
         self.resource_group = None
         self.name = None
+        self.slot = None
         self.location = None
 
         # update in create_or_update as parameters
@@ -498,6 +603,9 @@ class AzureRMWebApps(AzureRMModuleBase):
 
         self.purge_app_settings = False
         self.app_state = 'started'
+        self.package = None
+        self.package_timeout = None
+        self.swap = None
 
         self.results = dict(
             changed=False,
@@ -543,30 +651,59 @@ class AzureRMWebApps(AzureRMModuleBase):
         old_response = None
         response = None
         to_be_updated = False
+        app_settings_changed = False
+
+        if self.swap and not self.slot:
+            self.fail("Parameter error: slot required with swap.")
+
+        if self.plan:
+            self.plan = self.parse_resource_to_dict(self.plan)
+
+        # create the client once, before the reads share it between threads
+        self.web_client
+
+        # the web app, its configuration, application settings and plan are read concurrently
+        reads = dict(webapp=self.get_webapp)
+        if not self.location:
+            reads['resource_group'] = functools.partial(self.get_resource_group, self.resource_group)
+        if self.state == 'present':
+            reads['config'] = self.get_webapp_configuration
+            reads['app_settings'] = self.list_app_settings
+            if self.plan:
+                reads['plan'] = self.get_app_service_plan
+        responses, errors = self.run_in_parallel(reads, max_workers=len(reads))
+        if errors:
+            self.fail("Error reading the Web App instance {0}: {1}".format(self.name, '; '.join(errors[key] for key in sorted(errors))))
 
         # set location
-        resource_group = self.get_resource_group(self.resource_group)
         if not self.location:
-            self.location = resource_group.location
+            self.location = responses['resource_group'].location
 
         # get existing web app
-        old_response = self.get_webapp()
+        old_response = responses['webapp']
 
         if old_response:
             self.results['id'] = old_response['id']
 
         if self.state == 'present':
-            if not self.plan and not old_response:
-                self.fail("Please specify plan for newly created web app.")
-
             if not self.plan:
-                self.plan = old_response['server_farm_id']
+                if old_response:
+                    self.plan = old_response['server_farm_id']
+                elif self.slot:
+                    # a new deployment slot runs on the plan of its web app
+                    parent = self.get_webapp(parent=True)
+                    if not parent:
+                        self.fail("Web app {0} not exists.".format(self.name))
+                    self.plan = parent['server_farm_id']
+                else:
+                    self.fail("Please specify plan for newly created web app.")
 
-            self.plan = self.parse_resource_to_dict(self.plan)
+                self.plan = self.parse_resource_to_dict(self.plan)
+                responses['plan'] = self.get_app_service_plan()
 
             # get app service plan
             is_linux = False
-            old_plan = self.get_app_service_plan()
+            old_plan = responses['plan']
             if old_plan:
                 is_linux = old_plan['reserved']
             else:
@@ -684,6 +821,7 @@ class AzureRMWebApps(AzureRMModuleBase):
 
                 if update_tags:
                     to_be_updated = True
+                    self.to_do = Actions.CreateOrUpdate
 
                 # check if root level property changed
                 if self.is_updatable_property_changed(old_response):
@@ -691,7 +829,7 @@ class AzureRMWebApps(AzureRMModuleBase):
                     self.to_do = Actions.CreateOrUpdate
 
                 # check if site_config changed
-                old_config = self.get_webapp_configuration()
+                old_config = responses['config']
 
                 if self.is_site_config_changed(old_config):
                     to_be_updated = True
@@ -702,21 +840,18 @@ class AzureRMWebApps(AzureRMModuleBase):
                     to_be_updated = True
                     self.to_do = Actions.CreateOrUpdate
 
-                self.app_settings_strDic = self.list_app_settings()
+                self.app_settings_strDic = responses['app_settings']
+                if not self.app_settings_strDic:
+                    self.fail("Failed to list application settings for web app {0} in resource group {1}".format(self.name, self.resource_group))
 
-                # purge existing app_settings:
-                if self.purge_app_settings:
+                # check if app settings changed, they are updated on their own
+                app_settings = self.get_expected_app_settings(self.app_settings_strDic.properties or dict())
+                if app_settings != (self.app_settings_strDic.properties or dict()):
                     to_be_updated = True
-                    self.app_settings_strDic.properties = dict()
-
-                # check if app settings changed
-                if self.purge_app_settings or self.is_app_settings_changed():
-                    to_be_updated = True
-                    self.to_do = Actions.CreateOrUpdate
-
-                    if self.app_settings:
-                        for key in self.app_settings.keys():
-                            self.app_settings_strDic.properties[key] = self.app_settings[key]
+                    app_settings_changed = True
+                    self.app_settings_strDic.properties = app_settings
+                    if self.to_do == Actions.NoAction:
+                        self.to_do = Actions.UpdateAppSettings
 
         elif self.state == 'absent':
             if old_response:
@@ -745,6 +880,17 @@ class AzureRMWebApps(AzureRMModuleBase):
 
                 self.results['id'] = response['id']
 
+            if app_settings_changed:
+                self.update_app_settings()
+
+        if self.package and self.state == 'present':
+            changed, self.results['deployment'] = self.deploy_zip_package(self.resource_group, self.name, self.package,
+                                                                          slot=self.slot, timeout=self.package_timeout)
+            self.results['changed'] = self.results['changed'] or changed
+            to_be_updated = to_be_updated or changed
+            if changed and self.check_mode:
+                return self.results
+
         webapp = None
         if old_response:
             webapp = old_response
@@ -762,6 +908,14 @@ class AzureRMWebApps(AzureRMModuleBase):
 
                 self.set_webapp_state(self.app_state)
 
+        # swapping an unchanged slot again would swap the previous release back
+        if self.swap and self.state == 'present' and (to_be_updated or self.swap['force']):
+            self.results['changed'] = True
+            if self.check_mode:
+                return self.results
+
+            self.swap_slot()
+
         return self.results
 
     # compare existing web app with input, determine weather it's update operation
@@ -782,18 +936,18 @@ class AzureRMWebApps(AzureRMModuleBase):
 
         return False
 
-    # comparing existing app setting with input, determine whether it's changed
-    def is_app_settings_changed(self):
-        if self.app_settings:
-            if len(self.app_settings_strDic.properties) != len(self.app_settings):
-                return True
+    # merge input app settings into existing ones, or replace them when purging
+    def get_expected_app_settings(self, existing_app_settings):
+        app_settings = dict() if self.purge_app_settings else dict(existing_app_settings)
+        for key, value in self.app_settings.items():
+            app_settings[key] = to_text(value)
+        return app_settings
 
-            elif self.app_settings_strDic.properties and len(self.app_settings_strDic.properties) > 0:
-                for key in self.app_settings.keys():
-                    if not self.app_settings_strDic.properties.get(key) \
-                            or self.app_settings[key] != self.app_settings_strDic.properties[key]:
-                        return True
-        return False
+    # web_apps operation acting on the web app, or on its deployment slot
+    def get_webapp_operation(self, operation):
+        if self.slot:
+            return functools.partial(getattr(self.web_client.web_apps, operation + '_slot'), slot=self.slot)
+        return getattr(self.web_client.web_apps, operation)
 
     # comparing deployment source with input, determine wheather it's changed
     def is_deployment_source_changed(self, existing_webapp):
@@ -821,13 +975,14 @@ class AzureRMWebApps(AzureRMModuleBase):
             skip_dns_registration = self.dns_registration
             force_dns_registration = None if self.dns_registration is None else not self.dns_registration
 
-            response = self.web_client.web_apps.create_or_update(resource_group_name=self.resource_group,
-                                                                 name=self.name,
-                                                                 site_envelope=self.site,
-                                                                 skip_dns_registration=skip_dns_registration,
-                                                                 skip_custom_domain_verification=self.skip_custom_domain_verification,
-                                                                 force_dns_registration=force_dns_registration,
-                                                                 ttl_in_seconds=self.ttl_in_seconds)
+            create_or_update = self.get_webapp_operation('create_or_update')
+            response = create_or_update(resource_group_name=self.resource_group,
+                                        name=self.name,
+                                        site_envelope=self.site,
+                                        skip_dns_registration=skip_dns_registration,
+                                        skip_custom_domain_verification=self.skip_custom_domain_verification,
+                                        force_dns_registration=force_dns_registration,
+                                        ttl_in_seconds=self.ttl_in_seconds)
             if isinstance(response, AzureOperationPoller):
                 response = self.get_poller_result(response)
 
@@ -845,8 +1000,8 @@ class AzureRMWebApps(AzureRMModuleBase):
         '''
         self.log("Deleting the Web App instance {0}".format(self.name))
         try:
-            response = self.web_client.web_apps.delete(resource_group_name=self.resource_group,
-                                                       name=self.name)
+            response = self.get_webapp_operation('delete')(resource_group_name=self.resource_group,
+                                                           name=self.name)
         except CloudError as e:
             self.log('Error attempting to delete the Web App instance.')
             self.fail(
@@ -854,9 +1009,11 @@ class AzureRMWebApps(AzureRMModuleBase):
 
         return True
 
-    def get_webapp(self):
+    def get_webapp(self, parent=False):
         '''
-        Gets the properties of the specified Web App.
+        Gets the properties of the specified Web App, or of its deployment slot.
+
+        :param parent: get the web app even when slot is set
 
         :return: deserialized Web App instance state dictionary
         '''
@@ -866,8 +1023,9 @@ class AzureRMWebApps(AzureRMModuleBase):
         response = None
 
         try:
-            response = self.web_client.web_apps.get(resource_group_name=self.resource_group,
-                                                    name=self.name)
+            get = self.web_client.web_apps.get if parent else self.get_webapp_operation('get')
+            response = get(resource_group_name=self.resource_group,
+                           name=self.name)
 
             self.log("Response : {0}".format(response))
             self.log("Web App instance : {0} found".format(response.name))
@@ -937,7 +1095,7 @@ class AzureRMWebApps(AzureRMModuleBase):
 
         try:
 
-            response = self.web_client.web_apps.list_application_settings(
+            response = self.get_webapp_operation('list_application_settings')(
                 resource_group_name=self.resource_group, name=self.name)
             self.log("Response : {0}".format(response))
 
@@ -956,16 +1114,14 @@ class AzureRMWebApps(AzureRMModuleBase):
         self.log("Update application setting")
 
         try:
-            response = self.web_client.web_apps.update_application_settings(
+            response = self.get_webapp_operation('update_application_settings')(
                 resource_group_name=self.resource_group, name=self.name, app_settings=self.app_settings_strDic)
             self.log("Response : {0}".format(response))
 
             return response.as_dict()
         except CloudError as ex:
-            self.log("Failed to update application settings for web app {0} in resource group {1}".format(
-                self.name, self.resource_group))
-
-        return False
+            self.fail("Failed to update application settings for web app {0} in resource group {1}: {2}".format(
+                self.name, self.resource_group, str(ex)))
 
     def create_or_update_source_control(self):
         '''
@@ -999,7 +1155,7 @@ class AzureRMWebApps(AzureRMModuleBase):
 
         try:
 
-            response = self.web_client.web_apps.get_configuration(
+            response = self.get_webapp_operation('get_configuration')(
                 resource_group_name=self.resource_group, name=self.name)
             self.log("Response : {0}".format(response))
 
@@ -1017,11 +1173,11 @@ class AzureRMWebApps(AzureRMModuleBase):
         '''
         try:
             if appstate == 'started':
-                response = self.web_client.web_apps.start(resource_group_name=self.resource_group, name=self.name)
+                response = self.get_webapp_operation('start')(resource_group_name=self.resource_group, name=self.name)
             elif appstate == 'stopped':
-                response = self.web_client.web_apps.stop(resource_group_name=self.resource_group, name=self.name)
+                response = self.get_webapp_operation('stop')(resource_group_name=self.resource_group, name=self.name)
             elif appstate == 'restarted':
-                response = self.web_client.web_apps.restart(resource_group_name=self.resource_group, name=self.name)
+                response = self.get_webapp_operation('restart')(resource_group_name=self.resource_group, name=self.name)
             else:
                 self.fail("Invalid web app state {0}".format(appstate))
 
@@ -1033,6 +1189,35 @@ class AzureRMWebApps(AzureRMModuleBase):
             self.log("Failed to {0} web app {1} in resource group {2}, request_id {3} - {4}".format(
                 appstate, self.name, self.resource_group, request_id, str(ex)))
 
+    def swap_slot(self):
+        '''
+        Swaps the deployment slot with the target slot, or with production.
+
+        :return: True
+        '''
+        target_slot = self.swap.get('target_slot')
+        self.log("Swapping slot {0} of web app {1} with {2}".format(self.slot, self.name, target_slot or 'production'))
+
+        try:
+            if target_slot:
+                poller = self.web_client.web_apps.swap_slot_slot(resource_group_name=self.resource_group,
+                                                                 name=self.name,
+                                                                 slot=self.slot,
+                                                                 target_slot=target_slot,
+                                                                 preserve_vnet=self.swap['preserve_vnet'])
+            else:
+                poller = self.web_client.web_apps.swap_slot_with_production(resource_group_name=self.resource_group,
+                                                                            name=self.name,
+                                                                            target_slot=self.slot,
+                                                                            preserve_vnet=self.swap['preserve_vnet'])
+            if isinstance(poller, AzureOperationPoller):
+                self.get_poller_result(poller)
+        except CloudError as ex:
+            self.fail("Failed to swap slot {0} of web app {1} in resource group {2}: {3}".format(
+                self.slot, self.name, self.resource_group, str(ex)))
+
+        return True
+
 
 def main():
     """Main execution"""
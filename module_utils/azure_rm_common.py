@@ -10,6 +10,8 @@ import copy
 import inspect
 import traceback
 import json
+import time
+import threading
 
 from os.path import expanduser
 
@@ -17,6 +19,9 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.ansible_release import __version__ as ANSIBLE_VERSION
 from ansible.module_utils.six.moves import configparser
 import ansible.module_utils.six.moves.urllib.parse as urlparse
+from ansible.module_utils.azure_rm_common_cache import AzureRMResponseCache
+from ansible.module_utils.azure_rm_common_zipdeploy import (AzureRMZipDeploy, AzureRMZipDeployError,
+                                                            HAS_REQUESTS, AZURE_ZIPDEPLOY_DEFAULT_TIMEOUT)
 
 AZURE_COMMON_ARGS = dict(
     auth_source=dict(
@@ -96,6 +101,27 @@ CIDR_PATTERN = re.compile(r"(([0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.)
 AZURE_SUCCESS_STATE = "Succeeded"
 AZURE_FAILED_STATE = "Failed"
 
+AZURE_DEFAULT_MAX_CONCURRENCY = 10
+
+# Virtual machine operation reaching each requested power state
+AZURE_VM_POWER_OPERATIONS = dict(
+    running='start',
+    stopped='power_off',
+    deallocated='deallocate',
+    restarted='restart'
+)
+
+# Marks threads started by AzureRMModuleBase.run_in_parallel, so fail() raises instead of exiting
+_AZURE_WORKER_STATE = threading.local()
+
+# Seconds before its expiry a cached Key Vault token is acquired again
+AZURE_KEYVAULT_TOKEN_REFRESH_MARGIN = 300
+
+# Storage account keys and blob service clients of the process, keyed by account name and endpoint suffix
+_AZURE_STORAGE_KEYS = dict()
+_AZURE_BLOB_CLIENTS = dict()
+_AZURE_STORAGE_CACHE_LOCK = threading.Lock()
+
 HAS_AZURE = True
 HAS_AZURE_EXC = None
 HAS_AZURE_CLI_CORE = True
@@ -131,6 +157,8 @@ try:
     from msrestazure.azure_active_directory import AADTokenCredentials
     from msrestazure.azure_exceptions import CloudError
     from msrestazure.azure_active_directory import MSIAuthentication
+    from msrestazure.azure_operation import AzureOperationPoller
+    from msrest.polling import LROPoller
     from msrestazure.tools import parse_resource_id, resource_id, is_valid_resource_id
     from msrestazure import azure_cloud
     from azure.common.credentials import ServicePrincipalCredentials, UserPassCredentials
@@ -196,6 +224,11 @@ def normalize_location_name(name):
     return name.replace(' ', '').lower()
 
 
+def is_storage_auth_error(exc):
+    # the storage service answers 403 AuthenticationFailed to a request signed with a rotated key
+    return getattr(exc, 'status_code', None) == 403 or 'AuthenticationFailed' in str(exc)
+
+
 # FUTURE: either get this from the requirements file (if we can be sure it's always available at runtime)
 # or generate the requirements files from this so we only have one source of truth to maintain...
 AZURE_PKG_VERSIONS = {
@@ -237,6 +270,10 @@ AZURE_PKG_VERSIONS = {
 AZURE_MIN_RELEASE = '2.0.0'
 
 
+class AzureRMWorkerFailure(Exception):
+    pass
+
+
 class AzureRMModuleBase(object):
     def __init__(self, derived_arg_spec, bypass_checks=False, no_log=False,
                  check_invalid_arguments=None, mutually_exclusive=None, required_together=None,
@@ -294,6 +331,7 @@ class AzureRMModuleBase(object):
         self._traffic_manager_management_client = None
         self._monitor_client = None
         self._resource = None
+        self._response_cache = AzureRMResponseCache.from_environment(warn=self.module.warn)
 
         self.check_mode = self.module.check_mode
         self.api_profile = self.module.params.get('api_profile')
@@ -341,6 +379,8 @@ class AzureRMModuleBase(object):
         :param kwargs: Any key=value pairs
         :return: None
         '''
+        if getattr(_AZURE_WORKER_STATE, 'active', False):
+            raise AzureRMWorkerFailure(msg)
         self.module.fail_json(msg=msg, **kwargs)
 
     def deprecate(self, msg, version=None):
@@ -487,6 +527,93 @@ class AzureRMModuleBase(object):
             self.log(str(exc))
             raise
 
+    def run_in_parallel(self, tasks, max_workers=AZURE_DEFAULT_MAX_CONCURRENCY):
+        '''
+        Run independent tasks on a bounded pool of threads and wait for all of them to finish.
+        A task calling fail() does not exit the module; its message is collected in errors instead.
+
+        :param tasks: dict of task key to a callable taking no arguments
+        :param max_workers: maximum number of tasks in flight at once
+        :return: tuple of dicts (results, errors), keyed like tasks
+        '''
+        results = dict()
+        errors = dict()
+        keys = iter(list(tasks.keys()))
+        keys_lock = threading.Lock()
+
+        def worker():
+            _AZURE_WORKER_STATE.active = True
+            while True:
+                with keys_lock:
+                    key = next(keys, None)
+                if key is None:
+                    return
+                try:
+                    results[key] = tasks[key]()
+                except Exception as exc:
+                    self.log("Task {0} failed - {1}".format(key, str(exc)))
+                    errors[key] = str(exc)
+
+        threads = [threading.Thread(target=worker) for i in range(max(1, min(max_workers, len(tasks))))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def run_operations_in_parallel(self, tasks, max_workers=AZURE_DEFAULT_MAX_CONCURRENCY, done=None, wait=5):
+        '''
+        Start independent long running operations on a bounded pool of threads, then wait for all of them.
+        The workers only send the requests, so no thread is held while Azure completes an operation, and the
+        pollers are checked together so that each operation is seen complete as soon as it is.
+
+        :param tasks: dict of task key to a callable taking no arguments, returning a poller or a plain result
+        :param max_workers: maximum number of requests in flight at once
+        :param done: optional callable taking a task key, called as each operation completes or fails
+        :param wait: seconds between checks of the pending pollers
+        :return: tuple of dicts (results, errors), keyed like tasks
+        '''
+        responses, errors = self.run_in_parallel(tasks, max_workers=max_workers)
+        results = dict()
+        pending = dict()
+        for key, response in responses.items():
+            if isinstance(response, (LROPoller, AzureOperationPoller)):
+                pending[key] = response
+            else:
+                results[key] = response
+                if done:
+                    done(key)
+        while pending:
+            for key in [key for key, poller in pending.items() if poller.done()]:
+                try:
+                    results[key] = pending.pop(key).result()
+                except Exception as exc:
+                    self.log(str(exc))
+                    errors[key] = str(exc)
+                if done:
+                    done(key)
+            if pending:
+                self.log("Waiting {0} sec for {1} operations".format(wait, len(pending)))
+                time.sleep(wait)
+        return results, errors
+
+    def change_vm_power_state(self, resource_group, name, power_state, wait=True):
+        '''
+        Start, power off, deallocate or restart a virtual machine.
+
+        :param resource_group: name of the resource group containing the virtual machine
+        :param name: name of the virtual machine
+        :param power_state: one of 'running', 'stopped', 'deallocated' or 'restarted'
+        :param wait: wait for the operation to complete, otherwise return as soon as Azure accepted it
+        :return: result of the operation, or its poller when not waiting
+        '''
+        operation = getattr(self.compute_client.virtual_machines, AZURE_VM_POWER_OPERATIONS[power_state])
+        poller = operation(resource_group, name)
+        if not wait:
+            return poller
+        return self.get_poller_result(poller)
+
     def check_provisioning_state(self, azure_object, requested_state='present'):
         '''
         Check an Azure object's provisioning state. If something did not complete the provisioning
@@ -522,8 +649,50 @@ class AzureRMModuleBase(object):
                 self.fail("Error {0} has a provisioning state of {1}. Expecting state to be {2}.".format(
                     azure_object.name, azure_object.provisioning_state, AZURE_SUCCESS_STATE))
 
-    def get_blob_client(self, resource_group_name, storage_account_name, storage_blob_type='block'):
-        keys = dict()
+    def get_keyvault_auth_callback(self):
+        '''
+        Build the auth callback of a KeyVaultAuthentication. The service principal token is acquired once and
+        reused by every request of the client, until it is about to expire.
+
+        :return: callable taking server, resource and scope, returning the token type and access token
+        '''
+        token_cache = dict()
+        token_lock = threading.Lock()
+
+        def auth_callback(server, resource, scope):
+            if self.credentials['client_id'] is None or self.credentials['secret'] is None:
+                self.fail('Please specify client_id, secret and tenant to access azure Key Vault.')
+
+            with token_lock:
+                token = token_cache.get('token')
+                if not token or float(token.get('expires_on') or 0) - time.time() < AZURE_KEYVAULT_TOKEN_REFRESH_MARGIN:
+                    authcredential = ServicePrincipalCredentials(
+                        client_id=self.credentials['client_id'],
+                        secret=self.credentials['secret'],
+                        tenant=self.credentials.get('tenant') or "common",
+                        resource="https://vault.azure.net")
+                    token = token_cache['token'] = authcredential.token
+            return token['token_type'], token['access_token']
+
+        return auth_callback
+
+    def _get_storage_cache_key(self, storage_account_name):
+        return (storage_account_name.lower(), self._cloud_environment.suffixes.storage_endpoint)
+
+    def get_storage_account_key(self, resource_group_name, storage_account_name):
+        '''
+        Get the first key of a storage account. The keys of an account are listed once per process.
+
+        :param resource_group_name: resource group of the storage account
+        :param storage_account_name: name of the storage account
+        :return: account key
+        '''
+        cache_key = self._get_storage_cache_key(storage_account_name)
+        with _AZURE_STORAGE_CACHE_LOCK:
+            account_key = _AZURE_STORAGE_KEYS.get(cache_key)
+        if account_key:
+            return account_key
+
         try:
             # Get keys from the storage account
             self.log('Getting keys')
@@ -531,22 +700,122 @@ class AzureRMModuleBase(object):
         except Exception as exc:
             self.fail("Error getting keys for account {0} - {1}".format(storage_account_name, str(exc)))
 
+        account_key = account_keys.keys[0].value
+        with _AZURE_STORAGE_CACHE_LOCK:
+            _AZURE_STORAGE_KEYS[cache_key] = account_key
+        return account_key
+
+    def invalidate_storage_account_key(self, storage_account_name):
+        '''
+        Forget the cached key and blob service clients of a storage account, after its keys were rotated.
+
+        :param storage_account_name: name of the storage account
+        '''
+        cache_key = self._get_storage_cache_key(storage_account_name)
+        with _AZURE_STORAGE_CACHE_LOCK:
+            _AZURE_STORAGE_KEYS.pop(cache_key, None)
+            for key in list(_AZURE_BLOB_CLIENTS.keys()):
+                if key[:2] == cache_key:
+                    del _AZURE_BLOB_CLIENTS[key]
+
+    def get_blob_client(self, resource_group_name, storage_account_name, storage_blob_type='block'):
+        cache_key = self._get_storage_cache_key(storage_account_name) + (storage_blob_type,)
+        with _AZURE_STORAGE_CACHE_LOCK:
+            blob_client = _AZURE_BLOB_CLIENTS.get(cache_key)
+        if blob_client:
+            return blob_client
+
+        account_key = self.get_storage_account_key(resource_group_name, storage_account_name)
+
         try:
             self.log('Create blob service')
             if storage_blob_type == 'page':
-                return PageBlobService(endpoint_suffix=self._cloud_environment.suffixes.storage_endpoint,
-                                       account_name=storage_account_name,
-                                       account_key=account_keys.keys[0].value)
+                blob_client = PageBlobService(endpoint_suffix=self._cloud_environment.suffixes.storage_endpoint,
+                                              account_name=storage_account_name,
+                                              account_key=account_key)
             elif storage_blob_type == 'block':
-                return BlockBlobService(endpoint_suffix=self._cloud_environment.suffixes.storage_endpoint,
-                                        account_name=storage_account_name,
-                                        account_key=account_keys.keys[0].value)
+                blob_client = BlockBlobService(endpoint_suffix=self._cloud_environment.suffixes.storage_endpoint,
+                                               account_name=storage_account_name,
+                                               account_key=account_key)
             else:
                 raise Exception("Invalid storage blob type defined.")
         except Exception as exc:
             self.fail("Error creating blob service client for storage account {0} - {1}".format(storage_account_name,
                                                                                                 str(exc)))
 
+        with _AZURE_STORAGE_CACHE_LOCK:
+            _AZURE_BLOB_CLIENTS[cache_key] = blob_client
+        return blob_client
+
+    def call_blob_client(self, resource_group_name, storage_account_name, operation, storage_blob_type='block'):
+        '''
+        Call operation with the cached blob service client of a storage account. When the storage service
+        rejects the cached key, the key is listed again and the call retried once.
+
+        :param resource_group_name: resource group of the storage account
+        :param storage_account_name: name of the storage account
+        :param operation: callable taking the blob service client
+        :param storage_blob_type: 'block' or 'page'
+        :return: result of operation
+        '''
+        blob_client = self.get_blob_client(resource_group_name, storage_account_name, storage_blob_type)
+        try:
+            return operation(blob_client)
+        except Exception as exc:
+            if not is_storage_auth_error(exc):
+                raise
+            self.log('Storage account {0} rejected the cached key, getting keys again'.format(storage_account_name))
+            self.invalidate_storage_account_key(storage_account_name)
+            blob_client = self.get_blob_client(resource_group_name, storage_account_name, storage_blob_type)
+            return operation(blob_client)
+
+    def deploy_zip_package(self, resource_group_name, name, package, slot=None, timeout=AZURE_ZIPDEPLOY_DEFAULT_TIMEOUT):
+        '''
+        Deploy a local zip package to a web app or function app with zip deploy, unless it already is the
+        latest successful deployment. Nothing is uploaded in check mode.
+
+        :param resource_group_name: resource group of the web app
+        :param name: name of the web app
+        :param package: local path of the zip package
+        :param slot: deployment slot of the web app to deploy to
+        :param timeout: seconds to wait for the deployment
+        :return: tuple (changed, deployment dict)
+        '''
+        if not HAS_REQUESTS:
+            self.fail("Deploying a package requires the requests Python package.")
+        if not os.path.isfile(package):
+            self.fail("Package {0} not found.".format(package))
+
+        self.log("Getting publishing credentials of web app {0}".format(name))
+        try:
+            if slot:
+                poller = self.web_client.web_apps.list_publishing_credentials_slot(resource_group_name, name, slot)
+            else:
+                poller = self.web_client.web_apps.list_publishing_credentials(resource_group_name, name)
+            credentials = self.get_poller_result(poller)
+        except CloudError as exc:
+            self.fail("Error getting publishing credentials of web app {0} - {1}".format(name, str(exc)))
+
+        # the SCM URI embeds the credentials, which are given to the session instead
+        scm_uri = urlparse.urlparse(credentials.scm_uri)
+        scm_url = '{0}://{1}'.format(scm_uri.scheme, scm_uri.hostname)
+        deployer = AzureRMZipDeploy(scm_url, credentials.publishing_user_name, credentials.publishing_password, log=self.log)
+
+        start = time.time()
+        try:
+            digest = deployer.package_digest(package)
+            if deployer.is_deployed(digest):
+                return False, dict(message=deployer.deployment_message(digest))
+            if self.check_mode:
+                return True, dict(message=deployer.deployment_message(digest))
+            deployment = deployer.deploy(package, digest, timeout=timeout)
+        except (AzureRMZipDeployError, IOError, OSError) as exc:
+            self.fail("Error deploying {0} to web app {1} - {2}".format(package, name, str(exc)))
+        return True, dict(id=deployment.get('id'),
+                          message=deployment.get('message'),
+                          status_text=deployment.get('status_text'),
+                          duration=round(time.time() - start, 2))
+
     def create_default_pip(self, resource_group, location, public_ip_name, allocation_method='Dynamic'):
         '''
         Create a default public IP address <public_ip_name> to associate with a network interface.
@@ -763,6 +1032,10 @@ class AzureRMModuleBase(object):
         if self.azure_auth._cert_validation_mode == 'ignore':
             client.config.session_configuration_callback = self._validation_ignore_callback
 
+        # Share GET responses with other forks of the same run when ANSIBLE_AZURE_CACHE_DIR is set
+        if self._response_cache:
+            self._response_cache.install(client, client_type.__name__, read_through=self.facts_module)
+
         return client
 
     # passthru methods to AzureAuth instance for backcompat
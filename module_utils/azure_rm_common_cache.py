@@ -0,0 +1,162 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import os
+import time
+import json
+import base64
+import hashlib
+import tempfile
+
+import ansible.module_utils.six.moves.urllib.parse as urlparse
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+try:
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+except ImportError:
+    # This is handled in azure_rm_common
+    Response = None
+
+AZURE_CACHE_DIR_ENV = 'ANSIBLE_AZURE_CACHE_DIR'
+AZURE_CACHE_TTL_ENV = 'ANSIBLE_AZURE_CACHE_TTL'
+AZURE_CACHE_DEFAULT_TTL = 300
+
+
+class AzureRMResponseCache(object):
+    '''
+    File-backed read-through cache of ARM GET responses, shared by every module process
+    pointing at the same directory. Enabled by setting ANSIBLE_AZURE_CACHE_DIR, typically
+    to a directory created once per playbook run.
+
+    Facts modules read through the cache. Any other module purges it as soon as it sends
+    a non-GET request, so facts gathered after a change are never stale.
+    '''
+
+    def __init__(self, path, ttl=AZURE_CACHE_DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path, 0o700)
+            except OSError:
+                # another fork may have created it first
+                if not os.path.isdir(self.path):
+                    raise
+
+    @classmethod
+    def from_environment(cls, warn=None):
+        '''
+        Build a cache from ANSIBLE_AZURE_CACHE_DIR and ANSIBLE_AZURE_CACHE_TTL.
+
+        :param warn: callable reporting why an invalid configuration disables the cache
+        :return: AzureRMResponseCache, or None when caching is disabled, misconfigured or unsupported.
+        '''
+        path = os.environ.get(AZURE_CACHE_DIR_ENV)
+        if not path or not HAS_FCNTL or Response is None:
+            return None
+        if not os.path.isabs(path):
+            path = os.path.join(tempfile.gettempdir(), path)
+        try:
+            ttl = int(os.environ.get(AZURE_CACHE_TTL_ENV, AZURE_CACHE_DEFAULT_TTL))
+        except ValueError:
+            if warn:
+                warn("Response cache disabled, {0} must be a number of seconds, got '{1}'".format(
+                    AZURE_CACHE_TTL_ENV, os.environ[AZURE_CACHE_TTL_ENV]))
+            return None
+        return cls(path, ttl)
+
+    def install(self, client, client_type_name, read_through=False):
+        '''
+        Hook the send method of an SDK or generic REST client.
+
+        :param client: client exposing a msrest ServiceClient as _client
+        :param client_type_name: name of the client class, part of the cache key
+        :param read_through: serve GET requests from the cache, otherwise only purge on writes
+        '''
+        service_client = getattr(client, '_client', None)
+        if service_client is None:
+            return
+        send = service_client.send
+
+        def cached_send(request, *args, **kwargs):
+            if request.method != 'GET':
+                self.purge()
+                return send(request, *args, **kwargs)
+            if not read_through:
+                return send(request, *args, **kwargs)
+            return self.fetch(self.key(client_type_name, request.url), lambda: send(request, *args, **kwargs))
+
+        service_client.send = cached_send
+
+    @staticmethod
+    def key(client_type_name, url):
+        query = urlparse.parse_qs(urlparse.urlparse(url).query)
+        api_version = query.get('api-version', [''])[0]
+        raw = u'{0}\n{1}\n{2}'.format(client_type_name, url, api_version)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def fetch(self, key, send):
+        '''
+        Return the cached response for key, or call send while holding the key lock so
+        concurrent forks asking for the same URL wait for a single ARM request.
+        '''
+        entry_path = os.path.join(self.path, key + '.json')
+        lock = open(entry_path + '.lock', 'a')
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            response = self._read(entry_path)
+            if response is None:
+                response = send()
+                if response.status_code == 200:
+                    self._write(entry_path, response)
+            return response
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+            lock.close()
+
+    def purge(self):
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass
+
+    def _read(self, entry_path):
+        try:
+            with open(entry_path, 'r') as entry_file:
+                entry = json.load(entry_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if time.time() - entry['timestamp'] > self.ttl:
+            return None
+        response = Response()
+        response.status_code = entry['status_code']
+        response.reason = entry['reason']
+        response.url = entry['url']
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = base64.b64decode(entry['content'])
+        response._content_consumed = True
+        return response
+
+    def _write(self, entry_path, response):
+        entry = dict(
+            timestamp=time.time(),
+            status_code=response.status_code,
+            reason=response.reason,
+            url=response.url,
+            encoding=response.encoding,
+            headers=dict(response.headers),
+            content=base64.b64encode(response.content).decode('ascii')
+        )
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(fd, 'w') as entry_file:
+            json.dump(entry, entry_file)
+        os.rename(temp_path, entry_path)
@@ -0,0 +1,153 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import os
+import time
+import hashlib
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    # This is handled in azure_rm_common
+    HAS_REQUESTS = False
+
+AZURE_ZIPDEPLOY_CHUNK_SIZE = 1024 * 1024
+AZURE_ZIPDEPLOY_RETRIES = 5
+AZURE_ZIPDEPLOY_REQUEST_TIMEOUT = (30, 300)
+AZURE_ZIPDEPLOY_DEFAULT_TIMEOUT = 900
+# answers worth retrying: timeout, deployment already in progress, throttling and server side errors
+AZURE_ZIPDEPLOY_RETRY_STATUS = [408, 409, 429, 500, 502, 503, 504]
+AZURE_ZIPDEPLOY_STATUS_FAILED = 3
+AZURE_ZIPDEPLOY_STATUS_SUCCESS = 4
+
+
+class AzureRMZipDeployError(Exception):
+    pass
+
+
+class AzureRMZipDeploy(object):
+    '''
+    Push a zip package to the zipdeploy endpoint of the Kudu (SCM) site of a web app or function app.
+
+    The package is streamed with chunked transfer encoding over a pooled session authenticated with
+    the publishing credentials. Transient failures are retried, and the asynchronous deployment is
+    polled until it completes. Any HTTP server answering the same endpoints can stand in for Kudu.
+    '''
+
+    def __init__(self, scm_url, username, password, log=None, retries=AZURE_ZIPDEPLOY_RETRIES,
+                 chunk_size=AZURE_ZIPDEPLOY_CHUNK_SIZE, poll_interval=2):
+        self.scm_url = scm_url.rstrip('/')
+        self.log = log or (lambda msg: None)
+        self.retries = retries
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.session = requests.Session()
+        self.session.auth = (username, password)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @staticmethod
+    def package_digest(path, chunk_size=AZURE_ZIPDEPLOY_CHUNK_SIZE):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as package:
+            for chunk in iter(lambda: package.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def deployment_message(digest):
+        return 'Ansible zip deployment sha256:{0}'.format(digest)
+
+    def is_deployed(self, digest):
+        '''
+        Whether the latest successful deployment is the package with this digest.
+        '''
+        response = self.request('GET', '/api/deployments/latest')
+        if response.status_code == 404:
+            return False
+        self.check_response(response, 'get the latest deployment')
+        deployment = response.json()
+        return deployment.get('status') == AZURE_ZIPDEPLOY_STATUS_SUCCESS and \
+            self.deployment_message(digest) == deployment.get('message')
+
+    def deploy(self, path, digest, timeout=AZURE_ZIPDEPLOY_DEFAULT_TIMEOUT):
+        '''
+        Upload the package and wait for its deployment to complete.
+
+        :param path: local path of the zip package
+        :param digest: sha256 digest of the package, recorded in the deployment message
+        :param timeout: seconds to wait for the deployment, upload included
+        :return: deployment status dict
+        '''
+        deadline = time.time() + timeout
+        response = self.request('POST', '/api/zipdeploy',
+                                params=dict(isAsync='true', message=self.deployment_message(digest)),
+                                headers={'Content-Type': 'application/zip'},
+                                data=lambda: self.read_chunks(path))
+        self.check_response(response, 'upload {0}'.format(path))
+
+        # an asynchronous deployment answers 202 with the URL of its status
+        status_url = response.headers.get('Location') or '/api/deployments/latest'
+        delay = self.poll_interval
+        while True:
+            response = self.request('GET', status_url)
+            self.check_response(response, 'get the deployment status')
+            deployment = response.json()
+            if deployment.get('complete') or deployment.get('status') in (AZURE_ZIPDEPLOY_STATUS_FAILED, AZURE_ZIPDEPLOY_STATUS_SUCCESS):
+                break
+            if time.time() > deadline:
+                raise AzureRMZipDeployError('Timed out waiting for deployment {0} of {1}'.format(deployment.get('id'), path))
+            self.log('Waiting {0} sec for deployment {1}: {2}'.format(delay, deployment.get('id'), deployment.get('progress')))
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+        if deployment.get('status') != AZURE_ZIPDEPLOY_STATUS_SUCCESS:
+            raise AzureRMZipDeployError('Deployment {0} of {1} failed - {2}'.format(
+                deployment.get('id'), path, deployment.get('status_text') or deployment.get('log_url')))
+        return deployment
+
+    def read_chunks(self, path):
+        size = os.path.getsize(path)
+        sent = 0
+        reported = 0
+        with open(path, 'rb') as package:
+            for chunk in iter(lambda: package.read(self.chunk_size), b''):
+                sent += len(chunk)
+                # report every tenth of the package
+                if size and (sent * 10) // size > reported:
+                    reported = (sent * 10) // size
+                    self.log('Uploaded {0} of {1} bytes of {2}'.format(sent, size, path))
+                yield chunk
+
+    def request(self, method, url, data=None, **kwargs):
+        '''
+        Send a request to the SCM site, retrying on connection errors and transient answers.
+
+        :param data: callable returning the body, called again for each attempt
+        :return: requests Response
+        '''
+        if not url.startswith('http'):
+            url = self.scm_url + url
+        delay = 1
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.request(method, url, data=data() if data else None,
+                                                timeout=AZURE_ZIPDEPLOY_REQUEST_TIMEOUT, **kwargs)
+                if response.status_code not in AZURE_ZIPDEPLOY_RETRY_STATUS:
+                    return response
+                error = 'HTTP {0} {1}'.format(response.status_code, response.reason)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = str(exc)
+            if attempt < self.retries:
+                self.log('{0} {1} failed - {2}, retrying in {3} sec'.format(method, url, error, delay))
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+        raise AzureRMZipDeployError('{0} {1} failed after {2} attempts - {3}'.format(method, url, self.retries + 1, error))
+
+    @staticmethod
+    def check_response(response, action):
+        if response.status_code not in (200, 202):
+            raise AzureRMZipDeployError('Failed to {0} - HTTP {1} {2}'.format(action, response.status_code, response.text))
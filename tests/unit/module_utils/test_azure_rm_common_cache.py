@@ -0,0 +1,99 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import os
+import importlib.util
+
+import pytest
+
+pytest.importorskip('ansible')
+requests = pytest.importorskip('requests')
+
+spec = importlib.util.spec_from_file_location(
+    'azure_rm_common_cache', os.path.join(os.path.dirname(__file__), '..', '..', '..', 'module_utils', 'azure_rm_common_cache.py'))
+cache_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cache_module)
+
+URL = 'https://management.azure.com/subscriptions/xxxx/resourceGroups/Testing?api-version=2017-05-10'
+
+
+class Request(object):
+    def __init__(self, method, url=URL):
+        self.method = method
+        self.url = url
+
+
+class ServiceClient(object):
+    '''Records the requests reaching the wire and answers each with its sequence number.'''
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, request):
+        self.sent.append(request.method)
+        response = requests.models.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = request.url
+        response.encoding = 'utf-8'
+        response.headers = requests.structures.CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response._content = '{{"sequence": {0}}}'.format(len(self.sent)).encode('utf-8')
+        return response
+
+
+class Client(object):
+    def __init__(self):
+        self._client = ServiceClient()
+
+
+@pytest.fixture
+def client(tmpdir):
+    client = Client()
+    cache = cache_module.AzureRMResponseCache(str(tmpdir), ttl=60)
+    cache.install(client, 'ResourceManagementClient', read_through=True)
+    return client
+
+
+def test_get_is_served_from_cache(client):
+    first = client._client.send(Request('GET'))
+    second = client._client.send(Request('GET'))
+    assert client._client.sent == ['GET']
+    assert second.json() == first.json() == {'sequence': 1}
+    assert second.headers['content-type'] == 'application/json'
+
+
+def test_expired_entry_is_refreshed(client, monkeypatch):
+    client._client.send(Request('GET'))
+    now = cache_module.time.time()
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now + 61)
+    assert client._client.send(Request('GET')).json() == {'sequence': 2}
+    assert client._client.sent == ['GET', 'GET']
+
+
+def test_write_purges_cache(client):
+    client._client.send(Request('GET'))
+    client._client.send(Request('PUT'))
+    assert client._client.send(Request('GET')).json() == {'sequence': 3}
+    assert client._client.sent == ['GET', 'PUT', 'GET']
+
+
+def test_no_read_through_outside_facts_modules(tmpdir):
+    client = Client()
+    cache_module.AzureRMResponseCache(str(tmpdir)).install(client, 'ResourceManagementClient')
+    client._client.send(Request('GET'))
+    client._client.send(Request('GET'))
+    assert client._client.sent == ['GET', 'GET']
+
+
+def test_invalid_ttl_disables_cache(tmpdir, monkeypatch):
+    warnings = []
+    monkeypatch.setenv(cache_module.AZURE_CACHE_DIR_ENV, str(tmpdir))
+    monkeypatch.setenv(cache_module.AZURE_CACHE_TTL_ENV, '5m')
+    assert cache_module.AzureRMResponseCache.from_environment(warn=warnings.append) is None
+    assert len(warnings) == 1 and '5m' in warnings[0]
+
+
+def test_ttl_from_environment(tmpdir, monkeypatch):
+    monkeypatch.setenv(cache_module.AZURE_CACHE_DIR_ENV, str(tmpdir))
+    monkeypatch.setenv(cache_module.AZURE_CACHE_TTL_ENV, '120')
+    assert cache_module.AzureRMResponseCache.from_environment().ttl == 120
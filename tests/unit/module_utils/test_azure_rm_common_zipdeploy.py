@@ -0,0 +1,219 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import os
+import json
+import threading
+import importlib.util
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+pytest.importorskip('requests')
+
+spec = importlib.util.spec_from_file_location(
+    'azure_rm_common_zipdeploy', os.path.join(os.path.dirname(__file__), '..', '..', '..', 'module_utils', 'azure_rm_common_zipdeploy.py'))
+zipdeploy = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(zipdeploy)
+
+PACKAGE = b'PK\x03\x04' + bytes(range(256)) * 4
+
+
+class KuduServer(ThreadingMixIn, HTTPServer):
+    '''Stands in for the Kudu (SCM) site, answering each path from a script and recording the requests.'''
+
+    daemon_threads = True
+
+    def __init__(self, script):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), KuduHandler)
+        self.script = script
+        self.received = []
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{0}'.format(self.server_address[1])
+
+    def answer(self, method, path):
+        answers = self.script[(method, path)]
+        # the last answer repeats
+        return answers.pop(0) if len(answers) > 1 else answers[0]
+
+    def requests_to(self, method, path):
+        return [request for request in self.received if request['method'] == method and request['path'] == path]
+
+
+class KuduHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def handle_request(self, method):
+        url = urlsplit(self.path)
+        chunked = self.headers.get('Transfer-Encoding') == 'chunked'
+        body = self.read_chunked() if chunked else self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.server.received.append(dict(method=method, path=url.path, query=parse_qs(url.query), chunked=chunked,
+                                         body=body, authorization=self.headers.get('Authorization')))
+        status, headers, content = self.server.answer(method, url.path)
+        payload = json.dumps(content).encode('utf-8') if content is not None else b''
+        self.send_response(status)
+        for key, value in (headers or dict()).items():
+            self.send_header(key, value.format(url=self.server.url))
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_chunked(self):
+        body = b''
+        while True:
+            size = int(self.rfile.readline().split(b';')[0], 16)
+            if not size:
+                self.rfile.readline()
+                return body
+            body += self.rfile.read(size)
+            self.rfile.readline()
+
+    def log_message(self, *args):
+        pass
+
+
+class Clock(object):
+    '''Replaces the time module of zipdeploy, so that waiting only advances the clock.'''
+
+    def __init__(self):
+        self.now = 0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(zipdeploy, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def package(tmp_path):
+    path = tmp_path / 'package.zip'
+    path.write_bytes(PACKAGE)
+    return str(path)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(script):
+        server = KuduServer(script)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def deployment(status, complete, **kwargs):
+    kwargs.update(id='abc', status=status, complete=complete)
+    return kwargs
+
+
+def test_deploy_retries_and_uploads_the_whole_package_again(clock, package, serve):
+    server = serve({
+        ('POST', '/api/zipdeploy'): [(503, None, None), (409, None, None), (429, None, None), (408, None, None),
+                                     (202, {'Location': '{url}/api/deployments/abc'}, None)],
+        ('GET', '/api/deployments/abc'): [(200, None, deployment(1, False)), (200, None, deployment(4, True))],
+    })
+    logs = []
+    client = zipdeploy.AzureRMZipDeploy(server.url + '/', 'user', 'secret', log=logs.append, chunk_size=100)
+    digest = client.package_digest(package)
+
+    result = client.deploy(package, digest)
+
+    assert result['status'] == zipdeploy.AZURE_ZIPDEPLOY_STATUS_SUCCESS
+    uploads = server.requests_to('POST', '/api/zipdeploy')
+    assert len(uploads) == 5
+    for upload in uploads:
+        assert upload['chunked']
+        assert upload['body'] == PACKAGE
+        assert upload['authorization'].startswith('Basic ')
+        assert upload['query'] == dict(isAsync=['true'], message=[client.deployment_message(digest)])
+    assert len(server.requests_to('GET', '/api/deployments/abc')) == 2
+    # backoff of the retries, then of the status polls
+    assert clock.slept == [1, 2, 4, 8, 2]
+    assert any(log.startswith('Uploaded {0} of {0} bytes'.format(len(PACKAGE))) for log in logs)
+
+
+def test_deploy_fails_after_the_retries(clock, package, serve):
+    server = serve({('POST', '/api/zipdeploy'): [(500, None, None)]})
+    client = zipdeploy.AzureRMZipDeploy(server.url, 'user', 'secret', retries=2)
+
+    with pytest.raises(zipdeploy.AzureRMZipDeployError, match='failed after 3 attempts - HTTP 500'):
+        client.deploy(package, 'digest')
+    assert len(server.requests_to('POST', '/api/zipdeploy')) == 3
+    assert clock.slept == [1, 2]
+
+
+def test_deploy_polls_the_latest_deployment_without_location(clock, package, serve):
+    server = serve({
+        ('POST', '/api/zipdeploy'): [(200, None, None)],
+        ('GET', '/api/deployments/latest'): [(200, None, deployment(4, True))],
+    })
+    client = zipdeploy.AzureRMZipDeploy(server.url, 'user', 'secret')
+
+    assert client.deploy(package, 'digest')['id'] == 'abc'
+    assert len(server.requests_to('GET', '/api/deployments/latest')) == 1
+    assert clock.slept == []
+
+
+def test_deploy_times_out(clock, package, serve):
+    server = serve({
+        ('POST', '/api/zipdeploy'): [(202, {'Location': '{url}/api/deployments/abc'}, None)],
+        ('GET', '/api/deployments/abc'): [(200, None, deployment(1, False))],
+    })
+    client = zipdeploy.AzureRMZipDeploy(server.url, 'user', 'secret')
+
+    with pytest.raises(zipdeploy.AzureRMZipDeployError, match='Timed out waiting for deployment abc'):
+        client.deploy(package, 'digest', timeout=10)
+    assert clock.slept == [2, 4, 8]
+
+
+def test_deploy_fails(clock, package, serve):
+    server = serve({
+        ('POST', '/api/zipdeploy'): [(202, {'Location': '{url}/api/deployments/abc'}, None)],
+        ('GET', '/api/deployments/abc'): [(200, None, deployment(3, True, status_text='Build failed'))],
+    })
+    client = zipdeploy.AzureRMZipDeploy(server.url, 'user', 'secret')
+
+    with pytest.raises(zipdeploy.AzureRMZipDeployError, match='Deployment abc of .* failed - Build failed'):
+        client.deploy(package, 'digest')
+
+
+def test_is_deployed(clock, package, serve):
+    digest = zipdeploy.AzureRMZipDeploy.package_digest(package)
+    message = zipdeploy.AzureRMZipDeploy.deployment_message(digest)
+    server = serve({
+        ('GET', '/api/deployments/latest'): [(404, None, None),
+                                             (200, None, deployment(4, True, message=message)),
+                                             (200, None, deployment(3, True, message=message)),
+                                             (200, None, deployment(4, True, message=message.replace(digest, 'other')))],
+    })
+    client = zipdeploy.AzureRMZipDeploy(server.url, 'user', 'secret')
+
+    assert [client.is_deployed(digest) for dummy in range(4)] == [False, True, False, False]
+    assert server.requests_to('POST', '/api/zipdeploy') == []